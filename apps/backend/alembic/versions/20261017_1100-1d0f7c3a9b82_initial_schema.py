@@ -0,0 +1,169 @@
+"""Initial schema: users, plans, tasks, biometrics, daily_metrics
+
+Revision ID: 1d0f7c3a9b82
+Revises:
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1d0f7c3a9b82'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+gender = sa.Enum("MALE", "FEMALE", "OTHER", name="gender")
+activity_level = sa.Enum("SEDENTARY", "LIGHT", "MODERATE", "ACTIVE", "VERY_ACTIVE", name="activitylevel")
+task_status = sa.Enum("PENDING", "IN_PROGRESS", "COMPLETED", "CANCELLED", "SKIPPED", name="taskstatus")
+task_priority = sa.Enum("LOW", "MEDIUM", "HIGH", name="taskpriority")
+time_of_day = sa.Enum("MORNING", "AFTERNOON", "EVENING", "ANYTIME", name="timeofday")
+biometric_type = sa.Enum(
+    "WEIGHT",
+    "BODY_FAT",
+    "MUSCLE_MASS",
+    "BMI",
+    "BLOOD_PRESSURE_SYSTOLIC",
+    "BLOOD_PRESSURE_DIASTOLIC",
+    "HEART_RATE",
+    "SLEEP_HOURS",
+    "STEPS",
+    "WATER_INTAKE",
+    "CALORIES_CONSUMED",
+    "CALORIES_BURNED",
+    name="biometrictype",
+)
+
+
+def _timestamps() -> list:
+    return [
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    # Databases created before migrations existed (create_all or
+    # migrations/add_daily_metrics.sql) already have some of these tables;
+    # only the missing ones are created
+    existing_tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "users" not in existing_tables:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("email", sa.String(length=255), nullable=False),
+            sa.Column("hashed_password", sa.String(length=255), nullable=False),
+            sa.Column("full_name", sa.String(length=255), nullable=True),
+            sa.Column("age", sa.Integer(), nullable=True),
+            sa.Column("gender", gender, nullable=True),
+            sa.Column("height", sa.Float(), nullable=True),
+            sa.Column("date_of_birth", sa.Date(), nullable=True),
+            sa.Column("current_weight", sa.Float(), nullable=True),
+            sa.Column("goal_weight", sa.Float(), nullable=True),
+            sa.Column("activity_level", activity_level, nullable=True),
+            sa.Column("goals", sa.String(length=500), nullable=True),
+            sa.Column("is_active", sa.Boolean(), nullable=False),
+            sa.Column("is_verified", sa.Boolean(), nullable=False),
+            *_timestamps(),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if "plans" not in existing_tables:
+        op.create_table(
+            "plans",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("title", sa.String(length=255), nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("roadmap", sa.JSON(), nullable=True),
+            sa.Column("current_phase", sa.Integer(), nullable=False),
+            sa.Column("completion_percentage", sa.Float(), nullable=False),
+            sa.Column("is_active", sa.Boolean(), nullable=False),
+            *_timestamps(),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_plans_id", "plans", ["id"])
+        op.create_index("ix_plans_user_id", "plans", ["user_id"])
+
+    if "tasks" not in existing_tables:
+        op.create_table(
+            "tasks",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("plan_id", sa.Integer(), nullable=False),
+            sa.Column("title", sa.String(length=255), nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("status", task_status, nullable=False),
+            sa.Column("priority", task_priority, nullable=False),
+            sa.Column("scheduled_date", sa.Date(), nullable=True),
+            sa.Column("time_of_day", time_of_day, nullable=True),
+            sa.Column("duration_minutes", sa.Integer(), nullable=True),
+            sa.Column("completed_at", sa.Date(), nullable=True),
+            sa.Column("notes", sa.Text(), nullable=True),
+            *_timestamps(),
+            sa.ForeignKeyConstraint(["plan_id"], ["plans.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_tasks_id", "tasks", ["id"])
+        op.create_index("ix_tasks_plan_id", "tasks", ["plan_id"])
+        op.create_index("ix_tasks_scheduled_date", "tasks", ["scheduled_date"])
+
+    if "biometrics" not in existing_tables:
+        op.create_table(
+            "biometrics",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("metric_type", biometric_type, nullable=False),
+            sa.Column("value", sa.Float(), nullable=False),
+            sa.Column("unit", sa.String(), nullable=True),
+            sa.Column("measurement_date", sa.Date(), nullable=False),
+            sa.Column("notes", sa.String(), nullable=True),
+            *_timestamps(),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_biometrics_id", "biometrics", ["id"])
+        op.create_index("ix_biometrics_user_id", "biometrics", ["user_id"])
+        op.create_index("ix_biometrics_metric_type", "biometrics", ["metric_type"])
+        op.create_index("ix_biometrics_measurement_date", "biometrics", ["measurement_date"])
+
+    if "daily_metrics" not in existing_tables:
+        op.create_table(
+            "daily_metrics",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("date", sa.Date(), nullable=False),
+            sa.Column("energy_level", sa.Integer(), nullable=True),
+            sa.Column("hours_slept", sa.Float(), nullable=True),
+            sa.Column("sleep_quality", sa.Integer(), nullable=True),
+            sa.Column("mood", sa.Integer(), nullable=True),
+            sa.Column("stress_level", sa.Integer(), nullable=True),
+            sa.Column("weight", sa.Float(), nullable=True),
+            sa.Column("tasks_completed", sa.Integer(), nullable=True),
+            sa.Column("exercise_minutes", sa.Integer(), nullable=True),
+            sa.Column("notes", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_daily_metrics_id", "daily_metrics", ["id"])
+        op.create_index("ix_daily_metrics_date", "daily_metrics", ["date"])
+
+
+def downgrade() -> None:
+    op.drop_table("daily_metrics")
+    op.drop_table("biometrics")
+    op.drop_table("tasks")
+    op.drop_table("plans")
+    op.drop_table("users")
+    for enum_type in (biometric_type, time_of_day, task_priority, task_status, activity_level, gender):
+        enum_type.drop(op.get_bind(), checkfirst=True)
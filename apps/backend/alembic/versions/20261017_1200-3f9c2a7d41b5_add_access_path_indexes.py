@@ -0,0 +1,112 @@
+"""Add composite, unique and partial indexes for hot access paths
+
+Revision ID: 3f9c2a7d41b5
+Revises: 1d0f7c3a9b82
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d41b5'
+down_revision: Union[str, None] = '1d0f7c3a9b82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, extra create_index kwargs)
+INDEXES = [
+    ("uq_daily_metrics_user_date", "daily_metrics", ["user_id", "date"], {"unique": True}),
+    ("ix_tasks_plan_scheduled_date", "tasks", ["plan_id", "scheduled_date"], {}),
+    ("ix_tasks_plan_status_completed_at", "tasks", ["plan_id", "status", "completed_at"], {}),
+    ("ix_plans_user_id_is_active", "plans", ["user_id", "is_active"], {}),
+    (
+        "uq_plans_one_active_per_user",
+        "plans",
+        ["user_id"],
+        {"unique": True, "postgresql_where": sa.text("is_active")},
+    ),
+    ("ix_biometrics_user_type_date", "biometrics", ["user_id", "metric_type", "measurement_date"], {}),
+]
+
+
+def upgrade() -> None:
+    # Unique indexes would fail on existing duplicates, so clean them up first.
+    # daily_metrics: duplicates come from concurrent first writes of the day,
+    # each holding part of the day's activity. Keep the most recently updated
+    # row (ties: highest id), add the others' counters into it, then delete them
+    op.execute(
+        """
+        WITH ranked AS (
+            SELECT
+                id,
+                ROW_NUMBER() OVER (
+                    PARTITION BY user_id, date ORDER BY updated_at DESC NULLS LAST, id DESC
+                ) AS rank,
+                COUNT(*) OVER day AS copies,
+                SUM(COALESCE(tasks_completed, 0)) OVER day AS total_tasks_completed,
+                SUM(COALESCE(exercise_minutes, 0)) OVER day AS total_exercise_minutes
+            FROM daily_metrics
+            WINDOW day AS (PARTITION BY user_id, date)
+        )
+        UPDATE daily_metrics dm
+        SET tasks_completed = ranked.total_tasks_completed,
+            exercise_minutes = ranked.total_exercise_minutes
+        FROM ranked
+        WHERE dm.id = ranked.id
+          AND ranked.rank = 1
+          AND ranked.copies > 1
+        """
+    )
+    op.execute(
+        """
+        WITH ranked AS (
+            SELECT
+                id,
+                ROW_NUMBER() OVER (
+                    PARTITION BY user_id, date ORDER BY updated_at DESC NULLS LAST, id DESC
+                ) AS rank
+            FROM daily_metrics
+        )
+        DELETE FROM daily_metrics dm
+        USING ranked
+        WHERE dm.id = ranked.id
+          AND ranked.rank > 1
+        """
+    )
+    # plans: keep only the newest active plan per user
+    op.execute(
+        """
+        UPDATE plans p
+        SET is_active = false
+        WHERE p.is_active
+          AND EXISTS (
+              SELECT 1 FROM plans newer
+              WHERE newer.user_id = p.user_id
+                AND newer.is_active
+                AND (newer.created_at, newer.id) > (p.created_at, p.id)
+          )
+        """
+    )
+
+    # Build indexes without blocking writes (CONCURRENTLY cannot run in a transaction)
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,67 @@
+"""Add user_streaks table with maintained streak state
+
+Revision ID: 8b1e5c0f92d4
+Revises: 3f9c2a7d41b5
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1e5c0f92d4'
+down_revision: Union[str, None] = '3f9c2a7d41b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_streaks",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("current_streak", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("longest_streak", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("streak_anchor_date", sa.Date(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+    # Backfill from daily_metrics: group consecutive active days into islands
+    # (date - row_number is constant within a run), then take the latest
+    # island as the current streak and the biggest as the longest
+    op.execute(
+        """
+        INSERT INTO user_streaks (
+            user_id, current_streak, longest_streak, streak_anchor_date, created_at, updated_at
+        )
+        SELECT
+            user_id,
+            (array_agg(length ORDER BY end_day DESC))[1],
+            MAX(length),
+            MAX(end_day),
+            NOW() AT TIME ZONE 'UTC',
+            NOW() AT TIME ZONE 'UTC'
+        FROM (
+            SELECT user_id, COUNT(*) AS length, MAX(date) AS end_day
+            FROM (
+                SELECT
+                    user_id,
+                    date,
+                    date - (ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY date))::int AS grp
+                FROM daily_metrics
+                WHERE tasks_completed > 0
+            ) active_days
+            GROUP BY user_id, grp
+        ) islands
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_streaks")
@@ -0,0 +1,59 @@
+"""Add plan_jobs table for background plan generation
+
+Revision ID: 5e8a0b3c7d21
+Revises: c47d2e9a1f63
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8a0b3c7d21'
+down_revision: Union[str, None] = 'c47d2e9a1f63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+plan_job_kind = sa.Enum("GENERATE", "REGENERATE", name="planjobkind")
+plan_job_status = sa.Enum("QUEUED", "RUNNING", "SUCCEEDED", "FAILED", name="planjobstatus")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "plan_jobs",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("kind", plan_job_kind, nullable=False),
+        sa.Column("status", plan_job_status, nullable=False),
+        sa.Column("plan_id", sa.Integer(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["plan_id"], ["plans.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_plan_jobs_status_created_at", "plan_jobs", ["status", "created_at"])
+    # At most one queued or running job per user
+    op.create_index(
+        "uq_plan_jobs_user_id_pending",
+        "plan_jobs",
+        ["user_id"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('QUEUED', 'RUNNING')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_plan_jobs_user_id_pending", table_name="plan_jobs")
+    op.drop_index("ix_plan_jobs_status_created_at", table_name="plan_jobs")
+    op.drop_table("plan_jobs")
+    plan_job_status.drop(op.get_bind(), checkfirst=True)
+    plan_job_kind.drop(op.get_bind(), checkfirst=True)
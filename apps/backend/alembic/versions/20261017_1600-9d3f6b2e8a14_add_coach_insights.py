@@ -0,0 +1,36 @@
+"""Add coach_insights table for precomputed daily insights
+
+Revision ID: 9d3f6b2e8a14
+Revises: 5e8a0b3c7d21
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3f6b2e8a14'
+down_revision: Union[str, None] = '5e8a0b3c7d21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "coach_insights",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("insight_date", sa.Date(), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "insight_date"),
+    )
+    op.create_index("ix_coach_insights_insight_date", "coach_insights", ["insight_date"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_coach_insights_insight_date", table_name="coach_insights")
+    op.drop_table("coach_insights")
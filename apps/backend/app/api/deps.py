@@ -3,10 +3,16 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.user import User
+from app.models.plan import Plan
+from app.models.task import Task
 from app.crud import user as crud_user
-from app.core.security import verify_token
+from app.crud import plan as crud_plan
+from app.crud import task as crud_task
+from app.core.security import decode_token
+from app.core.token_revocation import token_revocation
+from app.core.principal_cache import Principal, principal_cache
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
@@ -34,36 +40,81 @@ async def get_current_user(
     ```
 
     Raises:
-        HTTPException: If token is invalid or user not found
+        HTTPException: If token is invalid or revoked, or user not found
 
     Returns:
         User: Current authenticated user
     """
-    credentials_exception = HTTPException(
+    user_id = await _user_id_from_token(db, token)
+
+    # Get user from database
+    user = await crud_user.get_user_by_id(db, user_id)
+    if user is None:
+        raise _credentials_exception()
+
+    principal_cache.put(Principal.from_user(user))
+
+    # Check if user is active
+    _ensure_active(user.is_active)
+
+    return user
+
+
+async def get_current_principal(
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+) -> Principal:
+    """
+    Get current authenticated principal (id, email, is_active)
+
+    For endpoints that only need the user's id: served from the
+    principal cache, so cache hits do not touch the database. Misses
+    load the user once and populate the cache.
+
+    Raises:
+        HTTPException: If token is invalid or revoked, user not found or inactive
+
+    Returns:
+        Principal: Current authenticated principal
+    """
+    user_id = await _user_id_from_token(db, token)
+
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        user = await crud_user.get_user_by_id(db, user_id)
+        if user is None:
+            raise _credentials_exception()
+        principal = Principal.from_user(user)
+        principal_cache.put(principal)
+
+    _ensure_active(principal.is_active)
+
+    return principal
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    # Verify token and extract user_id
-    user_id = verify_token(token, token_type="access")
-    if user_id is None:
-        raise credentials_exception
 
-    # Get user from database
-    user = await crud_user.get_user_by_id(db, int(user_id))
-    if user is None:
-        raise credentials_exception
+async def _user_id_from_token(db: AsyncSession, token: str) -> int:
+    """Verify access token, reject revoked ones and extract user_id"""
+    claims = decode_token(token, token_type="access")
+    if claims is None or await token_revocation.is_revoked(db, claims.get("jti")):
+        raise _credentials_exception()
+    return int(claims["sub"])
 
-    # Check if user is active
-    if not user.is_active:
+
+def _ensure_active(is_active: bool) -> None:
+    if not is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user"
         )
 
-    return user
-
 
 async def get_current_active_superuser(
     current_user: User = Depends(get_current_user),
@@ -83,3 +134,66 @@ async def get_current_active_superuser(
     # For now, just return the current user
     # In production, add: if not current_user.is_superuser: raise HTTPException(...)
     return current_user
+
+
+async def _require_active_plan(db: AsyncSession, user_id: int) -> Plan:
+    plan = await crud_plan.get_active_plan(db, user_id)
+    if not plan:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No active plan found. Generate a new plan first."
+        )
+    return plan
+
+
+async def get_active_plan(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> Plan:
+    """
+    Get current user's active plan
+
+    Resolved once per request (FastAPI caches dependencies), so handlers
+    and other dependencies can share it without another lookup.
+
+    Raises:
+        HTTPException: If user has no active plan
+
+    Returns:
+        Plan: Active plan
+    """
+    return await _require_active_plan(db, current_user.id)
+
+
+async def get_active_plan_read(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> Plan:
+    """Same as get_active_plan, loaded through the read-replica session"""
+    return await _require_active_plan(db, current_user.id)
+
+
+async def get_owned_task(
+    task_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+) -> Task:
+    """
+    Get a task from the current user's active plan
+
+    Loads the task joined to its plan, filtered by user and active plan,
+    in one query. Handlers update this same object.
+
+    Raises:
+        HTTPException: If task does not exist or is not in the user's active plan
+
+    Returns:
+        Task: Task owned by the current user
+    """
+    task = await crud_task.get_active_plan_task(db, task_id, current_user.id)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found in your active plan"
+        )
+    return task
@@ -13,9 +13,9 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
-from app.db.session import get_db
-from app.models.user import User as UserModel
+from app.api.deps import get_current_principal
+from app.db.session import get_db, get_read_db
+from app.core.principal_cache import Principal
 from app.schemas.daily_metric import (
     DailyMetric,
     DailyMetricCreate,
@@ -38,7 +38,7 @@ router = APIRouter()
 async def log_daily_metric(
     metric_data: DailyMetricCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> DailyMetric:
     """
     Log daily metrics (energy, sleep, mood, stress, weight)
@@ -49,15 +49,13 @@ async def log_daily_metric(
     db_metric = await crud_metric.create_or_update_metric(
         db, current_user.id, metric_data
     )
-    await db.commit()
-    await db.refresh(db_metric)
     return db_metric
 
 
 @router.get("/metrics/today", response_model=DailyMetric)
 async def get_today_metric(
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> DailyMetric:
     """Get today's metrics"""
     metric = await crud_metric.get_metric_today(db, current_user.id)
@@ -75,7 +73,7 @@ async def get_today_metric(
 async def get_metric_by_date(
     metric_date: date,
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> DailyMetric:
     """Get metrics for specific date"""
     metric = await crud_metric.get_metric_by_date(db, current_user.id, metric_date)
@@ -94,7 +92,7 @@ async def update_daily_metric(
     metric_date: date,
     update_data: DailyMetricUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> DailyMetric:
     """Update metrics for specific date"""
     metric = await crud_metric.get_metric_by_date(db, current_user.id, metric_date)
@@ -106,15 +104,13 @@ async def update_daily_metric(
         )
 
     updated_metric = await crud_metric.update_metric(db, metric, update_data)
-    await db.commit()
-    await db.refresh(updated_metric)
     return updated_metric
 
 
 @router.get("/body-battery", response_model=BodyBatteryResponse)
 async def get_body_battery(
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> BodyBatteryResponse:
     """
     Get current Body Battery status
@@ -141,8 +137,8 @@ async def get_body_battery(
 @router.get("/energy-history", response_model=List[EnergyHistoryResponse])
 async def get_energy_history(
     days: int = 7,
-    db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ) -> List[EnergyHistoryResponse]:
     """
     Get energy history for last N days (default 7)
@@ -182,8 +178,8 @@ async def get_energy_history(
 @router.get("/habits", response_model=List[dict])
 async def get_habit_grid(
     days: int = 90,
-    db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ) -> List[dict]:
     """
     Get habit grid data (GitHub-style contribution graph)
@@ -233,17 +229,19 @@ async def get_habit_grid(
 
 @router.get("/streak", response_model=dict)
 async def get_current_streak(
-    db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ) -> dict:
     """
     Get current streak (consecutive days with at least 1 task completed)
 
     Returns:
     - current_streak: Number of consecutive days
+    - longest_streak: Best streak so far
     - message: Motivational message based on streak
     """
     streak = await crud_metric.get_streak(db, current_user.id)
+    longest_streak = await crud_metric.get_longest_streak(db, current_user.id)
 
     # Generate motivational message
     if streak == 0:
@@ -261,14 +259,15 @@ async def get_current_streak(
 
     return {
         "current_streak": streak,
+        "longest_streak": max(longest_streak, streak),
         "message": message
     }
 
 
 @router.get("/correlations/sleep-energy", response_model=dict)
 async def get_sleep_energy_correlation(
-    db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ) -> dict:
     """
     Analyze correlation between sleep and energy (Pro feature)
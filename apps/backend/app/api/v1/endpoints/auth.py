@@ -1,22 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from app.api.deps import get_current_user
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from app.api.deps import get_current_user, get_current_principal, oauth2_scheme
+from app.core.principal_cache import Principal
 from app.models.user import User as UserModel
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
 from app.db.session import get_db
-from app.schemas.auth import LoginRequest, RefreshRequest, AuthResponse, Token
+from app.schemas.auth import LoginRequest, LogoutRequest, RefreshRequest, AuthResponse, Token
 from app.schemas.user import UserCreate, User
 from app.crud import user as crud_user
-from app.core.security import create_access_token, create_refresh_token, verify_token
+from app.core.security import create_access_token, create_refresh_token, decode_token
+from app.core.token_revocation import token_revocation
+from app.core.rate_limit import auth_rate_limiter
 
 router = APIRouter()
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_in: UserCreate,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ) -> AuthResponse:
     """
@@ -32,6 +35,9 @@ async def register(
 
     Returns access token, refresh token, and user information
     """
+    # Shed bursts before any database or hashing work
+    await auth_rate_limiter.check(request, user_in.email)
+
     # Check if user already exists
     existing_user = await crud_user.get_user_by_email(db, user_in.email)
     if existing_user:
@@ -42,7 +48,6 @@ async def register(
 
     # Create new user
     db_user = await crud_user.create_user(db, user_in)
-    await db.commit()
 
     # Generate tokens
     access_token = create_access_token(subject=str(db_user.id))
@@ -65,6 +70,7 @@ async def register(
 @router.post("/login", response_model=Token)
 async def login(
     credentials: LoginRequest,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ) -> Token:
     """
@@ -75,6 +81,9 @@ async def login(
 
     Returns JWT access token and refresh token
     """
+    # Shed bursts before any database or hashing work
+    await auth_rate_limiter.check(request, credentials.email)
+
     # Authenticate user
     user = await crud_user.authenticate_user(db, credentials.email, credentials.password)
     if not user:
@@ -105,17 +114,21 @@ async def refresh_token(
 
     - **refresh_token**: Valid refresh token
 
-    Returns new access token and refresh token
+    Returns new access token and refresh token. The refresh token is
+    single-use: it is revoked on rotation, so a replayed (e.g. stolen) one
+    is rejected.
     """
-    # Verify refresh token
-    user_id = verify_token(request.refresh_token, token_type="refresh")
-    if not user_id:
+    # Verify refresh token and make sure it was not revoked
+    claims = decode_token(request.refresh_token, token_type="refresh")
+    if claims is None or await token_revocation.is_revoked(db, claims.get("jti")):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid refresh token",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    user_id = claims["sub"]
+
     # Check if user still exists and is active
     user = await crud_user.get_user_by_id(db, int(user_id))
     if not user or not user.is_active:
@@ -124,6 +137,16 @@ async def refresh_token(
             detail="User not found or inactive",
         )
 
+    # Revoke the used refresh token; of concurrent refreshes with the same
+    # token only one gets here first. Tokens without jti cannot be revoked,
+    # so they cannot be rotated safely either
+    if not await token_revocation.revoke(db, claims, user_id=user.id):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     # Generate new tokens
     access_token = create_access_token(subject=user_id)
     new_refresh_token = create_refresh_token(subject=user_id)
@@ -135,6 +158,32 @@ async def refresh_token(
     )
 
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    request: Optional[LogoutRequest] = None,
+    token: str = Depends(oauth2_scheme),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+) -> Response:
+    """
+    Logout: revoke the current access token
+
+    - **refresh_token**: Optional refresh token to revoke as well (the body
+      itself is optional)
+
+    Requires authentication header: `Authorization: Bearer <access_token>`
+    """
+    access_claims = decode_token(token, token_type="access")
+    await token_revocation.revoke(db, access_claims, user_id=current_user.id)
+
+    if request is not None and request.refresh_token:
+        refresh_claims = decode_token(request.refresh_token, token_type="refresh")
+        if refresh_claims is not None and refresh_claims["sub"] == str(current_user.id):
+            await token_revocation.revoke(db, refresh_claims, user_id=current_user.id)
+
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
 @router.get("/me", response_model=User)
 async def get_current_user_info(
     current_user: UserModel = Depends(get_current_user)
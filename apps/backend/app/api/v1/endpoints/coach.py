@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Any, AsyncIterator, Dict, List
 from datetime import datetime
+from contextlib import aclosing
+import json
 import random
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_current_principal
 from app.db.session import get_db
 from app.models.user import User as UserModel
+from app.core.principal_cache import Principal
 from app.schemas.coach import (
     ChatMessage,
     ChatResponse,
@@ -16,7 +20,11 @@ from app.schemas.coach import (
     PlanAdjustment,
     PlanAdjustmentResponse
 )
-from app.services.openai_service import chat_with_coach as ai_chat, generate_daily_insight
+from app.services.openai_service import (
+    chat_with_coach as ai_chat,
+    stream_chat_with_coach,
+)
+from app.services.daily_insights import daily_insights, insight_user_data
 
 router = APIRouter()
 
@@ -46,7 +54,7 @@ async def chat_with_coach(
     }
 
     # Call OpenAI service
-    ai_response = ai_chat(
+    ai_response = await ai_chat(
         message=message.message,
         user_context=user_context,
         conversation_history=None  # Could store conversation history in future
@@ -59,6 +67,63 @@ async def chat_with_coach(
     )
 
 
+@router.post("/chat/stream")
+async def stream_chat(
+    message: ChatMessage,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Chat with AI health coach, streamed as Server-Sent Events
+
+    Same input as `/coach/chat`. Events:
+    - **delta**: `{"content": "..."}` for each piece of the response
+    - **done**: `{"response", "suggestions", "timestamp"}` when complete
+    - **fallback**: `{"response", "suggestions", "timestamp"}` if the AI
+      fails, possibly partway; replaces any text received so far
+
+    Closing the connection cancels the upstream AI request.
+    """
+    user_context = {
+        "goals": current_user.goals,
+        "activity_level": current_user.activity_level,
+        "age": current_user.age,
+        "gender": current_user.gender
+    }
+
+    # Nothing to write: give the pooled connection back before the
+    # long-lived stream instead of holding it until the response ends
+    await db.close()
+
+    async def events() -> AsyncIterator[str]:
+        # Closing the generator cancels the upstream completion
+        async with aclosing(stream_chat_with_coach(
+            message=message.message,
+            user_context=user_context,
+            conversation_history=None
+        )) as stream:
+            async for event in stream:
+                if await request.is_disconnected():
+                    print("⚠️ Coach chat stream client disconnected")
+                    return
+                name = event.pop("event")
+                if name != "delta":
+                    event["timestamp"] = datetime.utcnow().isoformat()
+                yield _sse(name, event)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 @router.get("/insight", response_model=DailyInsight)
 async def get_daily_insight(
     db: AsyncSession = Depends(get_db),
@@ -68,18 +133,18 @@ async def get_daily_insight(
     Get daily insight from AI coach
 
     Receive a personalized daily insight based on your progress and goals, powered by OpenAI.
+    The insight is generated once per day (usually ahead of time) and reused.
 
     Returns daily insight with actionable recommendations
     """
-    # Prepare user data for AI insight generation
-    user_data = {
-        "goals": current_user.goals,
-        "activity_level": current_user.activity_level,
-        "recent_activity": "tracking daily tasks"  # Could be enhanced with real activity data
-    }
-
-    # Generate AI-powered insight
-    ai_message = generate_daily_insight(user_data)
+    # Precomputed once per day; generated on demand only on a miss
+    day = daily_insights.today()
+    ai_message = await daily_insights.get_stored(db, current_user.id, day)
+    if ai_message is None:
+        user_data = insight_user_data(current_user)
+        # Give the pooled connection back before the LLM call
+        await db.close()
+        ai_message = await daily_insights.get_or_generate(current_user.id, user_data, day)
 
     # Return insight with some default action items
     # In future, these could also be AI-generated
@@ -109,7 +174,7 @@ async def search_knowledge_base(
     category: str = None,
     limit: int = 5,
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> List[KnowledgeArticle]:
     """
     Search health knowledge base (stub)
@@ -180,7 +245,7 @@ async def search_knowledge_base(
 async def adjust_plan(
     adjustment: PlanAdjustment,
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> PlanAdjustmentResponse:
     """
     Request plan adjustment (stub)
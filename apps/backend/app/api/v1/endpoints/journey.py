@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Any
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
-from app.api.deps import get_current_user
-from app.db.session import get_db
-from app.models.user import User as UserModel
-from app.models.task import Task, TaskStatus
+from app.api.deps import get_current_principal, get_active_plan, get_active_plan_read
+from app.db.session import get_db, get_read_db
+from app.core.principal_cache import Principal
+from app.models.plan import Plan as PlanModel
+from app.models.task import Task
 from app.schemas.journey import Milestone, WeeklyReviewCreate, WeeklyReview, Progress
 from app.crud import plan as crud_plan
 from app.crud import task as crud_task
@@ -17,8 +18,7 @@ router = APIRouter()
 
 @router.get("/roadmap", response_model=Dict[str, Any])
 async def get_roadmap(
-    db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    plan: PlanModel = Depends(get_active_plan)
 ) -> Dict[str, Any]:
     """
     Get user's journey roadmap
@@ -32,14 +32,6 @@ async def get_roadmap(
     - **completion**: Overall completion percentage
     - **timeline**: Timeline information
     """
-    # Get active plan
-    plan = await crud_plan.get_active_plan(db, current_user.id)
-    if not plan:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active plan found. Generate a new plan first."
-        )
-
     # Extract roadmap from plan
     roadmap = plan.roadmap or {}
     phases = roadmap.get("phases", [])
@@ -57,8 +49,7 @@ async def get_roadmap(
 
 @router.get("/milestones", response_model=List[Dict[str, Any]])
 async def get_milestones(
-    db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    plan: PlanModel = Depends(get_active_plan)
 ) -> List[Dict[str, Any]]:
     """
     Get journey milestones
@@ -71,14 +62,6 @@ async def get_milestones(
     - **phase**: Phase index
     - **status**: Completion status (pending/achieved)
     """
-    # Get active plan
-    plan = await crud_plan.get_active_plan(db, current_user.id)
-    if not plan:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active plan found. Generate a new plan first."
-        )
-
     # Extract milestones from roadmap
     roadmap = plan.roadmap or {}
     phases = roadmap.get("phases", [])
@@ -101,7 +84,7 @@ async def get_milestones(
 async def complete_weekly_review(
     review_data: WeeklyReviewCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Dict[str, Any]:
     """
     Complete weekly review
@@ -141,8 +124,8 @@ async def complete_weekly_review(
 
 @router.get("/progress", response_model=Progress)
 async def get_progress(
-    db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    plan: PlanModel = Depends(get_active_plan_read)
 ) -> Progress:
     """
     Get journey progress
@@ -156,27 +139,10 @@ async def get_progress(
 
     Returns progress object with all metrics
     """
-    # Get active plan
-    plan = await crud_plan.get_active_plan(db, current_user.id)
-    if not plan:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active plan found. Generate a new plan first."
-        )
-
-    # Get all tasks for the plan
-    all_tasks = await crud_plan.get_plan_tasks(db, plan.id)
-
-    # Count completed tasks
-    completed_tasks = sum(1 for task in all_tasks if task.status == TaskStatus.COMPLETED)
-    total_tasks = len(all_tasks)
-
-    # Calculate streak (simplified - in production, use actual completion dates)
-    # For now, return a stub value
-    streak_days = 0
-    if completed_tasks > 0:
-        # Stub: assume 1 day per completed task
-        streak_days = min(completed_tasks, 7)
+    # Task counts and current streak in one query
+    completed_tasks, total_tasks, streak_days = await crud_plan.get_plan_progress(
+        db, plan.id, plan.user_id, date.today()
+    )
 
     # Count milestones
     roadmap = plan.roadmap or {}
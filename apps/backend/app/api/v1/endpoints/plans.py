@@ -1,237 +1,115 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any
-from datetime import date, timedelta
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal, get_active_plan
+from app.core.config import settings
+from app.core.principal_cache import Principal
 from app.db.session import get_db
-from app.models.user import User as UserModel
-from app.models.task import TaskPriority, TimeOfDay
-from app.schemas.plan import Plan, PlanCreate
-from app.schemas.task import TaskCreate
-from app.crud import plan as crud_plan
-from app.crud import task as crud_task
-from app.services.openai_service import generate_health_plan
-from app.services.ai_engine import generate_roadmap, generate_weekly_tasks
+from app.models.plan import Plan as PlanModel
+from app.models.plan_job import PlanJobKind
+from app.schemas.plan import Plan
+from app.schemas.plan_job import PlanJob
+from app.services.plan_jobs import plan_job_runner
 
 router = APIRouter()
 
 
-@router.post("/generate", response_model=Plan, status_code=status.HTTP_201_CREATED)
-async def generate_plan(
-    db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
-) -> Plan:
-    """
-    Generate a new personalized health plan (stub)
+async def _submit_plan_job(
+    kind: PlanJobKind,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession,
+    user_id: int
+) -> PlanJob:
+    job = await plan_job_runner.submit(db, user_id, kind)
 
-    This is a stub endpoint that creates a basic plan structure.
-    In production, this would call an AI service to generate a personalized roadmap
-    based on user's profile, goals, and health data.
+    # Workers pick the job up once the request has committed it
+    background_tasks.add_task(plan_job_runner.notify, job.id)
 
-    Returns newly generated plan
-    """
-    # Deactivate all existing plans
-    await crud_plan.deactivate_user_plans(db, current_user.id)
-
-    # Prepare user data for AI plan generation
-    user_data = {
-        "age": current_user.age,
-        "gender": current_user.gender,
-        "current_weight": current_user.current_weight,
-        "goal_weight": current_user.goal_weight,
-        "height": current_user.height,
-        "activity_level": current_user.activity_level,
-        "goals": current_user.goals
-    }
+    response.headers["Location"] = f"{settings.API_V1_STR}/plans/jobs/{job.id}"
+    return job
 
-    # Generate AI-powered roadmap using AI Engine with safety rules
-    ai_roadmap = generate_roadmap(user_data, current_user.goals)
 
-    plan_in = PlanCreate(
-        title="Your Personalized Health Journey",
-        description="An AI-generated plan tailored to your goals and fitness level",
-        roadmap=ai_roadmap
-    )
-
-    db_plan = await crud_plan.create_plan(db, current_user.id, plan_in)
-    await db.flush()
-
-    # Generate initial weekly tasks (7 days) using AI Engine
-    today = date.today()
-    start_date = today  # Start from today
-
-    # Get first phase for task generation
-    first_phase = ai_roadmap.get('phases', [])[0] if ai_roadmap.get('phases') else {
-        'name': 'Foundation',
-        'goals': ['Establish baseline habits']
-    }
-
-    # Generate AI-powered weekly tasks (7 days instead of 3)
-    ai_tasks = generate_weekly_tasks(
-        user_data=user_data,
-        phase=first_phase,
-        week_number=1,
-        start_date=start_date
-    )
+@router.post("/generate", response_model=PlanJob, status_code=status.HTTP_202_ACCEPTED)
+async def generate_plan(
+    response: Response,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+) -> PlanJob:
+    """
+    Generate a new personalized health plan
 
-    # Convert AI tasks to TaskCreate objects
-    task_creates = []
-    for task in ai_tasks:
-        # Map priority string to enum
-        priority_map = {
-            'low': TaskPriority.LOW,
-            'medium': TaskPriority.MEDIUM,
-            'high': TaskPriority.HIGH
-        }
+    Starts a background job that generates an AI roadmap and the first
+    week of tasks, then replaces the active plan. If a plan job is
+    already queued or running for the user, that job is returned.
 
-        # Map time_of_day string to enum
-        time_map = {
-            'morning': TimeOfDay.MORNING,
-            'afternoon': TimeOfDay.AFTERNOON,
-            'evening': TimeOfDay.EVENING,
-            'anytime': TimeOfDay.ANYTIME
-        }
+    Returns the job (202); poll `GET /plans/jobs/{job_id}` (see the
+    Location header) until it succeeds, then read `plan_id`
+    """
+    return await _submit_plan_job(PlanJobKind.GENERATE, response, background_tasks, db, current_user.id)
 
-        task_creates.append(TaskCreate(
-            title=task.get('title', 'Health Task'),
-            description=task.get('description', ''),
-            priority=priority_map.get(task.get('priority', 'medium'), TaskPriority.MEDIUM),
-            scheduled_date=task.get('scheduled_date', start_date),
-            time_of_day=time_map.get(task.get('time_of_day', 'anytime'), TimeOfDay.ANYTIME),
-            duration_minutes=task.get('duration_minutes', 30)
-        ))
 
-    # Create all tasks
-    for task_data in task_creates:
-        await crud_task.create_task(db, db_plan.id, task_data)
+@router.get("/jobs/{job_id}", response_model=PlanJob)
+async def get_plan_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=settings.PLAN_JOB_MAX_WAIT_SECONDS, description="Seconds to wait for completion"),
+    current_user: Principal = Depends(get_current_principal)
+) -> PlanJob:
+    """
+    Get plan generation job status
 
-    await db.commit()
-    await db.refresh(db_plan)
+    - **wait**: Long-poll up to this many seconds for the job to finish
 
-    return db_plan
+    Returns the job with status queued, running, succeeded (with `plan_id`)
+    or failed (with `error`)
+    """
+    job = await plan_job_runner.get_job(current_user.id, job_id, wait)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Plan job not found"
+        )
+    return job
 
 
 @router.get("/current", response_model=Plan)
 async def get_current_plan(
-    db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    plan: PlanModel = Depends(get_active_plan)
 ) -> Plan:
     """
     Get current active plan
 
     Returns the user's currently active health plan
     """
-    plan = await crud_plan.get_active_plan(db, current_user.id)
-    if not plan:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active plan found. Generate a new plan first."
-        )
-
     return plan
 
 
-@router.post("/regenerate", response_model=Plan)
+@router.post("/regenerate", response_model=PlanJob, status_code=status.HTTP_202_ACCEPTED)
 async def regenerate_plan(
+    response: Response,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
-) -> Plan:
+    current_user: Principal = Depends(get_current_principal)
+) -> PlanJob:
     """
     Regenerate plan based on current progress
 
-    Deactivates current plan and generates a new one based on:
+    Starts a background job that deactivates the current plan and
+    generates a new one based on:
     - Current progress and metrics
     - Updated user profile
     - Historical data and patterns
 
-    Returns newly regenerated plan
+    Returns the job (202); poll `GET /plans/jobs/{job_id}` for the result
     """
-    # Deactivate all existing plans
-    await crud_plan.deactivate_user_plans(db, current_user.id)
-
-    # Prepare user data for AI plan regeneration
-    user_data = {
-        "age": current_user.age,
-        "gender": current_user.gender,
-        "current_weight": current_user.current_weight,
-        "goal_weight": current_user.goal_weight,
-        "height": current_user.height,
-        "activity_level": current_user.activity_level,
-        "goals": current_user.goals
-    }
-
-    # Generate fresh AI-powered roadmap with safety rules
-    ai_roadmap = generate_roadmap(user_data, current_user.goals)
-
-    plan_in = PlanCreate(
-        title="Your Regenerated Health Journey",
-        description="An updated plan optimized based on your progress",
-        roadmap=ai_roadmap
-    )
-
-    db_plan = await crud_plan.create_plan(db, current_user.id, plan_in)
-    await db.flush()
-
-    # Generate initial weekly tasks for regenerated plan
-    today = date.today()
-    start_date = today
-
-    # Get first phase for task generation
-    first_phase = ai_roadmap.get('phases', [])[0] if ai_roadmap.get('phases') else {
-        'name': 'Foundation',
-        'goals': ['Establish baseline habits']
-    }
-
-    # Generate AI-powered weekly tasks
-    ai_tasks = generate_weekly_tasks(
-        user_data=user_data,
-        phase=first_phase,
-        week_number=1,
-        start_date=start_date
-    )
-
-    # Convert AI tasks to TaskCreate objects
-    task_creates = []
-    for task in ai_tasks:
-        # Map priority string to enum
-        priority_map = {
-            'low': TaskPriority.LOW,
-            'medium': TaskPriority.MEDIUM,
-            'high': TaskPriority.HIGH
-        }
-
-        # Map time_of_day string to enum
-        time_map = {
-            'morning': TimeOfDay.MORNING,
-            'afternoon': TimeOfDay.AFTERNOON,
-            'evening': TimeOfDay.EVENING,
-            'anytime': TimeOfDay.ANYTIME
-        }
-
-        task_creates.append(TaskCreate(
-            title=task.get('title', 'Health Task'),
-            description=task.get('description', ''),
-            priority=priority_map.get(task.get('priority', 'medium'), TaskPriority.MEDIUM),
-            scheduled_date=task.get('scheduled_date', start_date),
-            time_of_day=time_map.get(task.get('time_of_day', 'anytime'), TimeOfDay.ANYTIME),
-            duration_minutes=task.get('duration_minutes', 30)
-        ))
-
-    # Create all tasks
-    for task_data in task_creates:
-        await crud_task.create_task(db, db_plan.id, task_data)
-
-    await db.commit()
-    await db.refresh(db_plan)
-
-    return db_plan
+    return await _submit_plan_job(PlanJobKind.REGENERATE, response, background_tasks, db, current_user.id)
 
 
 @router.get("/roadmap", response_model=Dict[str, Any])
 async def get_plan_roadmap(
-    db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    plan: PlanModel = Depends(get_active_plan)
 ) -> Dict[str, Any]:
     """
     Get detailed roadmap for current plan
@@ -242,13 +120,6 @@ async def get_plan_roadmap(
     - **current_phase**: Current phase index
     - **completion**: Overall completion percentage
     """
-    plan = await crud_plan.get_active_plan(db, current_user.id)
-    if not plan:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active plan found. Generate a new plan first."
-        )
-
     if not plan.roadmap:
         return {
             "phases": [],
@@ -3,12 +3,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from datetime import datetime
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal, get_active_plan, get_owned_task
 from app.db.session import get_db
-from app.models.user import User as UserModel
+from app.core.principal_cache import Principal
+from app.models.plan import Plan as PlanModel
+from app.models.task import Task as TaskModel, TaskStatus
 from app.schemas.task import Task, TaskUpdate, TaskLog
-from app.crud import plan as crud_plan
 from app.crud import task as crud_task
+from app.crud import daily_metric as crud_metric
 
 router = APIRouter()
 
@@ -16,21 +18,13 @@ router = APIRouter()
 @router.get("/today", response_model=List[Task])
 async def get_today_tasks(
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    plan: PlanModel = Depends(get_active_plan)
 ) -> List[Task]:
     """
     Get tasks scheduled for today
 
     Returns list of tasks for the current active plan scheduled for today
     """
-    # Get active plan
-    plan = await crud_plan.get_active_plan(db, current_user.id)
-    if not plan:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active plan found. Generate a new plan first."
-        )
-
     # Get today's tasks (use local server time, not UTC)
     today = datetime.now().date()
     tasks = await crud_task.get_tasks_by_date(db, plan.id, today)
@@ -40,10 +34,9 @@ async def get_today_tasks(
 
 @router.patch("/{task_id}", response_model=Task)
 async def update_task_status(
-    task_id: int,
     task_in: TaskUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    task: TaskModel = Depends(get_owned_task)
 ) -> Task:
     """
     Update task status and other properties
@@ -59,84 +52,32 @@ async def update_task_status(
 
     Returns updated task
     """
-    # Get active plan
-    plan = await crud_plan.get_active_plan(db, current_user.id)
-    if not plan:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active plan found"
-        )
-
-    # Get task
-    task = await crud_task.get_task_by_id(db, task_id)
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
-
-    # Verify task belongs to user's active plan
-    if task.plan_id != plan.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Cannot update task from another plan"
-        )
-
     # Update task
-    updated_task = await crud_task.update_task(db, task_id, task_in)
+    updated_task = await crud_task.update_task(db, task, task_in)
     if not updated_task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found"
         )
 
-    await db.commit()
-    await db.refresh(updated_task)
-
     return updated_task
 
 
 @router.post("/{task_id}/complete", response_model=Task)
 async def complete_task(
-    task_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal),
+    task: TaskModel = Depends(get_owned_task)
 ) -> Task:
     """
     Mark task as completed
 
     Returns completed task
     """
-    # Get active plan
-    plan = await crud_plan.get_active_plan(db, current_user.id)
-    if not plan:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active plan found"
-        )
-
-    # Get task
-    task = await crud_task.get_task_by_id(db, task_id)
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
-
-    # Verify task belongs to user's active plan
-    if task.plan_id != plan.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Cannot complete task from another plan"
-        )
-
     # Complete task
-    from app.models.task import TaskStatus
-    from app.schemas.task import TaskUpdate
-
     completed_task = await crud_task.update_task(
         db,
-        task_id,
+        task,
         TaskUpdate(status=TaskStatus.COMPLETED)
     )
 
@@ -147,8 +88,6 @@ async def complete_task(
         )
 
     # Update daily metrics - increment tasks_completed
-    from app.crud import daily_metric as crud_metric
-
     # Determine if task is exercise-related
     exercise_keywords = ['workout', 'exercise', 'run', 'walk', 'yoga', 'gym', 'cardio', 'strength']
     is_exercise = any(keyword in completed_task.title.lower() for keyword in exercise_keywords)
@@ -161,53 +100,23 @@ async def complete_task(
         exercise_minutes=exercise_mins
     )
 
-    await db.commit()
-    await db.refresh(completed_task)
-
     return completed_task
 
 
 @router.post("/{task_id}/skip", response_model=Task)
 async def skip_task(
-    task_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    task: TaskModel = Depends(get_owned_task)
 ) -> Task:
     """
     Mark task as skipped
 
     Returns skipped task
     """
-    # Get active plan
-    plan = await crud_plan.get_active_plan(db, current_user.id)
-    if not plan:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active plan found"
-        )
-
-    # Get task
-    task = await crud_task.get_task_by_id(db, task_id)
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
-
-    # Verify task belongs to user's active plan
-    if task.plan_id != plan.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Cannot skip task from another plan"
-        )
-
     # Skip task
-    from app.models.task import TaskStatus
-    from app.schemas.task import TaskUpdate
-
     skipped_task = await crud_task.update_task(
         db,
-        task_id,
+        task,
         TaskUpdate(status=TaskStatus.SKIPPED)
     )
 
@@ -217,18 +126,14 @@ async def skip_task(
             detail="Task not found"
         )
 
-    await db.commit()
-    await db.refresh(skipped_task)
-
     return skipped_task
 
 
 @router.post("/{task_id}/log", response_model=Task)
 async def log_task(
-    task_id: int,
     log_data: TaskLog,
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    task: TaskModel = Depends(get_owned_task)
 ) -> Task:
     """
     Log task completion with notes
@@ -239,40 +144,14 @@ async def log_task(
 
     Returns completed task
     """
-    # Get active plan
-    plan = await crud_plan.get_active_plan(db, current_user.id)
-    if not plan:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active plan found"
-        )
-
-    # Get task
-    task = await crud_task.get_task_by_id(db, task_id)
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
-
-    # Verify task belongs to user's active plan
-    if task.plan_id != plan.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Cannot log task from another plan"
-        )
-
     # Log completion
-    completed_task = await crud_task.log_task_completion(db, task_id, log_data.notes)
+    completed_task = await crud_task.log_task_completion(db, task, log_data.notes)
     if not completed_task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found"
         )
 
-    await db.commit()
-    await db.refresh(completed_task)
-
     return completed_task
 
 
@@ -281,7 +160,7 @@ async def get_task_history(
     limit: int = Query(50, ge=1, le=100, description="Number of tasks to return"),
     offset: int = Query(0, ge=0, description="Number of tasks to skip"),
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    plan: PlanModel = Depends(get_active_plan)
 ) -> List[Task]:
     """
     Get task history (completed, cancelled, skipped tasks)
@@ -292,14 +171,6 @@ async def get_task_history(
 
     Returns list of completed/cancelled/skipped tasks ordered by completion date
     """
-    # Get active plan
-    plan = await crud_plan.get_active_plan(db, current_user.id)
-    if not plan:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active plan found. Generate a new plan first."
-        )
-
     # Get task history
     tasks = await crud_task.get_task_history(db, plan.id, limit, offset)
 
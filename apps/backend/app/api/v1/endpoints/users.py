@@ -3,10 +3,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
 
-from app.api.deps import get_current_user
-from app.db.session import get_db
+from app.api.deps import get_current_user, get_current_principal
+from app.db.session import get_db, get_read_db
 from app.models.user import User as UserModel
+from app.core.principal_cache import Principal
 from app.models.biometric import Biometric, BiometricType
+from app.models.plan import Plan
 from app.schemas.user import User, UserUpdate
 from app.schemas.biometric import BiometricCreate, Biometric as BiometricSchema
 from app.crud import user as crud_user
@@ -31,7 +33,7 @@ async def get_user_profile(
 async def update_user_profile(
     user_in: UserUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> User:
     """
     Update current user profile
@@ -55,9 +57,6 @@ async def update_user_profile(
             detail="User not found"
         )
 
-    await db.commit()
-    await db.refresh(updated_user)
-
     return updated_user
 
 
@@ -65,7 +64,7 @@ async def update_user_profile(
 async def add_biometric(
     biometric_in: BiometricCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> BiometricSchema:
     """
     Add biometric measurement
@@ -87,15 +86,14 @@ async def add_biometric(
     )
 
     db.add(db_biometric)
-    await db.commit()
-    await db.refresh(db_biometric)
+    await db.flush()  # INSERT ... RETURNING id; get_db commits
 
     return db_biometric
 
 
 @router.get("/me/stats", response_model=Dict[str, Any])
 async def get_user_stats(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: UserModel = Depends(get_current_user)
 ) -> Dict[str, Any]:
     """
@@ -173,9 +171,14 @@ async def get_user_stats(
             "percentage": round((weight_change / first_weight) * 100, 2) if first_weight != 0 else 0
         }
 
-    # Get plans count (will be implemented later)
-    plans_count = len(current_user.plans) if hasattr(current_user, 'plans') else 0
-    active_plan = any(plan.is_active for plan in current_user.plans) if hasattr(current_user, 'plans') and current_user.plans else False
+    # Get plans count (current_user lives on the primary session, so query the read session)
+    plans_query = select(
+        func.count(Plan.id),
+        func.count(Plan.id).filter(Plan.is_active == True),
+    ).where(Plan.user_id == current_user.id)
+    plans_result = await db.execute(plans_query)
+    plans_count, active_plans_count = plans_result.one()
+    active_plan = active_plans_count > 0
 
     return {
         "profile_completion": round(profile_completion, 2),
@@ -0,0 +1,46 @@
+"""
+Bloom Filter
+
+Compact probabilistic set: `in` never gives false negatives and gives
+false positives at roughly the configured rate, so it can screen out
+the common "definitely not present" case before a real lookup.
+"""
+
+import hashlib
+import math
+from typing import Iterable
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized from capacity and false-positive rate"""
+
+    def __init__(self, capacity: int, fp_rate: float):
+        capacity = max(1, capacity)
+        fp_rate = min(max(fp_rate, 1e-9), 0.5)
+
+        # Optimal size: m = -n ln p / (ln 2)^2, k = (m / n) ln 2
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing (Kirsch-Mitzenmacher): h1 + i * h2
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
@@ -1,8 +1,12 @@
-from typing import List, Any
+from typing import List, Any, Optional
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+def _split_csv(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -18,6 +22,24 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     DATABASE_ECHO: bool = False
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DATABASE_POOL_RECYCLE: int = 1800  # seconds, -1 disables recycling
+    DATABASE_POOL_PRE_PING: bool = True
+
+    # Statement caching
+    DATABASE_QUERY_CACHE_SIZE: int = 1200  # SQLAlchemy compiled-statement cache per engine
+    DATABASE_PREPARED_STATEMENT_CACHE_SIZE: int = 256  # asyncpg prepared statements per connection
+    # PgBouncer in transaction pooling mode cannot keep named prepared statements
+    # across transactions: disables the prepared-statement caches and uses unique names
+    DATABASE_PGBOUNCER_TRANSACTION_MODE: bool = False
+
+    # Read replicas (comma-separated URLs); empty routes reads to the primary.
+    # Kept a plain string: pydantic-settings would JSON-decode a list field
+    DATABASE_REPLICA_URLS: str = ""
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DATABASE_REPLICA_LAG_CHECK_INTERVAL: float = 10.0
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
@@ -25,6 +47,65 @@ class Settings(BaseSettings):
     # OpenAI
     OPENAI_API_KEY: str
     OPENAI_MODEL: str = "gpt-4o-mini"
+    # Shared keep-alive connection pool for all AI calls
+    OPENAI_MAX_CONNECTIONS: int = 100
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OPENAI_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    # Per-route model overrides (default: OPENAI_MODEL)
+    OPENAI_MODEL_ROADMAP: Optional[str] = None
+    OPENAI_MODEL_WEEKLY_TASKS: Optional[str] = None
+    OPENAI_MODEL_CHAT: Optional[str] = None
+    OPENAI_MODEL_INSIGHT: Optional[str] = None
+
+    # LLM gateway limits, retries and circuit breaker
+    LLM_MAX_CONCURRENCY: int = 32
+    LLM_ROUTE_MAX_CONCURRENCY: int = 16
+    LLM_QUEUE_TIMEOUT_SECONDS: float = 10.0
+    LLM_MAX_RETRIES: int = 2
+    LLM_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+    LLM_COALESCE_IDENTICAL_REQUESTS: bool = True  # share one call among identical concurrent prompts
+
+    # LLM backend: "openai", or "fake" for offline load tests (deterministic local replies)
+    LLM_BACKEND: str = "openai"
+    FAKE_LLM_LATENCY_MS: float = 800.0  # median time to reply / first token
+    FAKE_LLM_LATENCY_DISTRIBUTION: str = "lognormal"  # "fixed", "uniform" or "lognormal"
+    FAKE_LLM_LATENCY_SPREAD: float = 0.5  # lognormal sigma, or +/- fraction for uniform
+    FAKE_LLM_TOKEN_DELAY_MS: float = 20.0  # between streamed tokens
+    FAKE_LLM_ERROR_RATE: float = 0.0
+    FAKE_LLM_ERROR_STATUS_CODES: str = "429,500,503"  # comma-separated, see fake_llm_error_status_codes
+    FAKE_LLM_SEED: int = 0
+
+    # Roadmap cache by profile bucket (TTL 0 disables)
+    ROADMAP_CACHE_TTL_SECONDS: float = 86400.0
+    ROADMAP_CACHE_MAX_VARIANTS: int = 3
+    ROADMAP_CACHE_MAX_BUCKETS: int = 2000
+    ROADMAP_CACHE_AGE_BAND_YEARS: float = 10.0
+    ROADMAP_CACHE_BMI_BAND: float = 2.5
+    ROADMAP_CACHE_WEIGHT_DELTA_BAND_KG: float = 5.0  # |goal - current weight| band
+
+    # Background plan generation jobs
+    PLAN_JOB_BACKEND: str = "database"  # "database" (durable) or "inprocess"
+    PLAN_JOB_WORKERS: int = 4
+    PLAN_JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    PLAN_JOB_STALE_AFTER_SECONDS: float = 300.0
+    PLAN_JOB_MAX_ATTEMPTS: int = 3
+    PLAN_JOB_MAX_WAIT_SECONDS: float = 30.0  # longest allowed status long-poll
+
+    # Generate first-week tasks for a predicted Foundation phase while the
+    # roadmap is generated; reuse them when the real phase goals overlap enough
+    PLAN_SPECULATIVE_TASKS: bool = True
+    PLAN_SPECULATION_MIN_GOAL_OVERLAP: float = 0.3
+
+    # Daily coach insights: precomputed once per user per day in INSIGHT_TIMEZONE
+    INSIGHT_TIMEZONE: str = "UTC"
+    INSIGHT_PRECOMPUTE_ENABLED: bool = True
+    INSIGHT_PRECOMPUTE_CONCURRENCY: int = 4
+    INSIGHT_PRECOMPUTE_BATCH_SIZE: int = 100
+    INSIGHT_PRECOMPUTE_INTERVAL_SECONDS: float = 900.0
+    INSIGHT_ACTIVE_WITHIN_DAYS: int = 7  # precompute for users with a task completed this recently
+    INSIGHT_RETENTION_DAYS: int = 7
 
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = []
@@ -43,8 +124,54 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     ALGORITHM: str = "HS256"
 
+    # Password hashing (bcrypt runs in a dedicated thread pool)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64  # beyond this, auth requests get 503
+
+    # bcrypt work factor: calibrated at startup to the target latency,
+    # unless PASSWORD_BCRYPT_ROUNDS pins it
+    PASSWORD_HASH_TARGET_MS: float = 250.0
+    PASSWORD_BCRYPT_MIN_ROUNDS: int = 10
+    PASSWORD_BCRYPT_MAX_ROUNDS: int = 15
+    PASSWORD_BCRYPT_ROUNDS: Optional[int] = None
+
+    # Auth rate limiting (token buckets, checked before any hashing)
+    AUTH_RATE_LIMIT_BACKEND: str = "memory"  # "memory" or "redis" (uses REDIS_URL)
+    AUTH_RATE_LIMIT_IP_PER_MINUTE: float = 30.0
+    AUTH_RATE_LIMIT_IP_BURST: int = 10
+    AUTH_RATE_LIMIT_EMAIL_PER_MINUTE: float = 5.0
+    AUTH_RATE_LIMIT_EMAIL_BURST: int = 5
+    AUTH_RATE_LIMIT_MAX_KEYS: int = 100000
+    # Reverse proxies (comma-separated IPs or CIDRs) whose X-Forwarded-For
+    # gives the client IP; empty uses the peer address
+    TRUSTED_PROXIES: str = ""
+
+    # Authenticated principal cache (0 disables)
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+
+    # Verified JWT claims, memoized until each token's exp (0 disables)
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+
+    # Token revocation: Bloom filter in front of the revoked_tokens table
+    TOKEN_REVOCATION_BLOOM_CAPACITY: int = 100000  # minimum; grows with live revocations
+    TOKEN_REVOCATION_BLOOM_FP_RATE: float = 0.001
+    TOKEN_REVOCATION_REBUILD_INTERVAL_SECONDS: float = 30.0
+
     # API
     API_V1_STR: str = "/api/v1"
 
+    @property
+    def database_replica_urls(self) -> List[str]:
+        return _split_csv(self.DATABASE_REPLICA_URLS)
+
+    @property
+    def trusted_proxies(self) -> List[str]:
+        return _split_csv(self.TRUSTED_PROXIES)
+
+    @property
+    def fake_llm_error_status_codes(self) -> List[int]:
+        return [int(code) for code in _split_csv(self.FAKE_LLM_ERROR_STATUS_CODES)]
+
 
 settings = Settings()
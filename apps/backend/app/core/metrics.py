@@ -0,0 +1,61 @@
+"""
+In-process Metrics
+
+Small thread-safe primitives for latency and counter telemetry that is
+exposed through the /health endpoints.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Sequence
+
+# Default upper bounds (ms) of latency histogram buckets; last bucket is +Inf
+DEFAULT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class LatencyHistogram:
+    """Cumulative latency histogram with count, average and max"""
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self._bounds = tuple(buckets_ms)
+        self._lock = threading.Lock()
+        self._buckets: List[int] = [0] * (len(self._bounds) + 1)
+        self._count = 0
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+
+    def observe(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self._buckets[bisect_left(self._bounds, elapsed_ms)] += 1
+            self._count += 1
+            self._total_ms += elapsed_ms
+            self._max_ms = max(self._max_ms, elapsed_ms)
+
+    def percentile(self, fraction: float) -> float:
+        """Approximate percentile: upper bound of the bucket containing it"""
+        with self._lock:
+            if not self._count:
+                return 0.0
+            target = fraction * self._count
+            cumulative = 0
+            for bound, count in zip(self._bounds, self._buckets):
+                cumulative += count
+                if cumulative >= target:
+                    return float(bound)
+            return self._max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            histogram = {}
+            cumulative = 0
+            for bound, count in zip(list(self._bounds) + [None], self._buckets):
+                cumulative += count
+                histogram[f"le_{bound}ms" if bound is not None else "le_inf"] = cumulative
+
+            count = self._count
+            return {
+                "count": count,
+                "avg": round(self._total_ms / count, 3) if count else 0.0,
+                "max": round(self._max_ms, 3),
+                "histogram": histogram,
+            }
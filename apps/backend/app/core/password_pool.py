@@ -0,0 +1,83 @@
+"""
+Password Hashing Worker Pool
+
+bcrypt takes hundreds of milliseconds per call, so hashing and
+verification run in a dedicated, bounded thread pool instead of on the
+event loop (bcrypt releases the GIL while it works).
+
+- Fixed number of worker threads
+- Pending-work limit: beyond it, calls fail fast with PasswordHashPoolFull
+- Queue-wait and hash-time latency metrics
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+from app.core.metrics import LatencyHistogram
+
+T = TypeVar("T")
+
+
+class PasswordHashPoolFull(Exception):
+    """Raised when too much password hashing work is already pending"""
+
+
+class PasswordHashPool:
+    """Bounded executor for password hashing and verification"""
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hash",
+        )
+        # Only touched from the event loop thread
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait = LatencyHistogram()
+        self.hash_time = LatencyHistogram()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run fn(*args) on a worker thread, failing fast when saturated"""
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHashPoolFull(
+                f"{self._pending} password hash operations pending (limit {self.max_pending})"
+            )
+
+        submitted = time.perf_counter()
+
+        def timed() -> T:
+            started = time.perf_counter()
+            self.queue_wait.observe((started - submitted) * 1000)
+            try:
+                return fn(*args)
+            finally:
+                self.hash_time.observe((time.perf_counter() - started) * 1000)
+
+        self._pending += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+            self.completed += 1
+            return result
+        finally:
+            self._pending -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queue_wait_ms": self.queue_wait.snapshot(),
+            "hash_time_ms": self.hash_time.snapshot(),
+        }
@@ -0,0 +1,91 @@
+"""
+Authenticated Principal Cache
+
+Short-lived, per-process cache of the minimal identity needed to
+authorize a request, so get_current_principal does not hit the users
+table on every call.
+
+- The database stays the source of truth: entries expire after a TTL
+- update_user invalidates the user's entry explicitly once its
+  transaction commits (profile changes, is_active toggles); other
+  workers pick up the change within the TTL
+- Bounded size with least-recently-used eviction
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Identity of the authenticated user, without the ORM object"""
+
+    id: int
+    email: str
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: Any) -> "Principal":
+        return cls(id=user.id, email=user.email, is_active=user.is_active)
+
+
+class PrincipalCache:
+    """TTL + LRU cache of principals keyed by user id"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[Principal, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        principal, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[user_id]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return principal
+
+    def put(self, principal: Principal) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        self._entries[principal.id] = (principal, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(principal.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        if self._entries.pop(user_id, None) is not None:
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+)
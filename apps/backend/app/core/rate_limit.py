@@ -0,0 +1,215 @@
+"""
+Auth Rate Limiting
+
+Token-bucket admission control for the bcrypt-heavy auth endpoints.
+Requests are checked per client IP and per (client IP, email) *before*
+any database or hashing work, so bursts are shed cheaply with 429 +
+Retry-After.
+
+The email bucket is keyed on the client IP too: a bucket per email alone
+would let anyone lock a victim out of their account by hammering their
+address. Guessing one account's password from many IPs is still bounded
+by the per-IP limits of each of them.
+
+Behind a reverse proxy the peer address is the proxy's, so the client IP
+is taken from X-Forwarded-For when the peer is in TRUSTED_PROXIES.
+
+Backends:
+- memory: per-process buckets (default, limits scale with worker count)
+- redis: buckets shared by all workers, via an atomic Lua script
+  (requires the optional `redis` package)
+"""
+
+import ipaddress
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from fastapi import Request
+
+from app.core.config import settings
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a client has exhausted its request budget"""
+
+    def __init__(self, scope: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded for {scope}")
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class MemoryTokenBucket:
+    """In-process token buckets with least-recently-used eviction of idle keys"""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        """
+        Take one token from the bucket
+
+        Returns:
+            0 if allowed, otherwise seconds until a token is available
+        """
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (float(burst), now))
+        tokens = min(float(burst), tokens + (now - updated_at) * rate)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+# KEYS[1] = bucket key; ARGV = rate (tokens/s), burst. Uses the Redis clock
+# so all workers agree on time. Returns retry-after seconds as a string.
+_REDIS_TOKEN_BUCKET = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + (now - ts) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(retry_after)
+"""
+
+
+class RedisTokenBucket:
+    """Token buckets shared across workers through Redis"""
+
+    def __init__(self, redis_url: str):
+        try:
+            from redis import asyncio as aioredis
+        except ImportError as e:
+            raise RuntimeError(
+                "AUTH_RATE_LIMIT_BACKEND=redis requires the 'redis' package"
+            ) from e
+
+        self._redis = aioredis.from_url(redis_url)
+        self._script = self._redis.register_script(_REDIS_TOKEN_BUCKET)
+        self.errors = 0
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        try:
+            retry_after = await self._script(keys=[f"ratelimit:{key}"], args=[rate, burst])
+        except Exception as e:
+            # Fail open: a Redis outage must not lock everyone out of login
+            self.errors += 1
+            print(f"❌ Rate limiter Redis error: {type(e).__name__}: {e}")
+            return 0.0
+        return float(retry_after)
+
+
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def _is_trusted(address: str, trusted: List[IPNetwork]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted)
+
+
+def client_ip(request: Request, trusted_proxies: List[IPNetwork]) -> str:
+    """
+    Address of the client behind any trusted proxies
+
+    X-Forwarded-For is read right to left, skipping trusted proxies; the
+    first other hop is the client. Entries left of it were written by the
+    client itself and are ignored.
+
+    Args:
+        request: Incoming request
+        trusted_proxies: Networks whose forwarding headers are believed
+
+    Returns:
+        Client IP ("unknown" without a peer address)
+    """
+    peer = request.client.host if request.client else None
+    if peer is None:
+        return "unknown"
+    if not _is_trusted(peer, trusted_proxies):
+        return peer
+
+    hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted(hop, trusted_proxies):
+            return hop
+    # Only proxies in the chain: the leftmost is closest to the client
+    return hops[0] if hops else peer
+
+
+class AuthRateLimiter:
+    """Per-IP and per-(IP, email) limits for login and registration"""
+
+    def __init__(self, backend: Any, trusted_proxies: Optional[List[str]] = None):
+        self.backend = backend
+        self.trusted_proxies: List[IPNetwork] = [
+            ipaddress.ip_network(proxy, strict=False) for proxy in trusted_proxies or []
+        ]
+        self.allowed = 0
+        self.rejected: Dict[str, int] = {"ip": 0, "email": 0}
+
+    async def check(self, request: Request, email: Optional[str]) -> None:
+        """
+        Admit an auth request or shed it
+
+        Raises:
+            RateLimitExceeded: If the client IP, or this IP for the email, is over its limit
+        """
+        ip = client_ip(request, self.trusted_proxies)
+        limits = [
+            ("ip", ip, settings.AUTH_RATE_LIMIT_IP_PER_MINUTE, settings.AUTH_RATE_LIMIT_IP_BURST),
+        ]
+        if email:
+            limits.append(
+                ("email", f"{ip}:{email.lower()}", settings.AUTH_RATE_LIMIT_EMAIL_PER_MINUTE,
+                 settings.AUTH_RATE_LIMIT_EMAIL_BURST)
+            )
+
+        for scope, value, per_minute, burst in limits:
+            retry_after = await self.backend.acquire(f"auth:{scope}:{value}", per_minute / 60, burst)
+            if retry_after > 0:
+                self.rejected[scope] += 1
+                raise RateLimitExceeded(scope, retry_after)
+
+        self.allowed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            "backend": settings.AUTH_RATE_LIMIT_BACKEND,
+            "allowed": self.allowed,
+            "rejected": dict(self.rejected),
+        }
+        if isinstance(self.backend, RedisTokenBucket):
+            stats["backend_errors"] = self.backend.errors
+        return stats
+
+
+def _create_backend() -> Any:
+    if settings.AUTH_RATE_LIMIT_BACKEND == "redis":
+        return RedisTokenBucket(settings.REDIS_URL)
+    return MemoryTokenBucket(max_keys=settings.AUTH_RATE_LIMIT_MAX_KEYS)
+
+
+auth_rate_limiter = AuthRateLimiter(_create_backend(), trusted_proxies=settings.trusted_proxies)
@@ -1,13 +1,36 @@
+import time
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Tuple
+from uuid import uuid4
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.password_pool import PasswordHashPool
+from app.core.token_cache import VerifiedTokenCache
 
-# Password hashing context
+# Password hashing context; work factor is set by calibrate_password_hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Chosen hashing parameters and calibration results, reported on /health/auth
+password_hash_params: Dict[str, Any] = {
+    "scheme": "bcrypt",
+    "rounds": None,
+    "source": "library default",
+    "target_ms": settings.PASSWORD_HASH_TARGET_MS,
+    "measured_ms": None,
+    "rehashed_on_login": 0,
+}
+
+# Worker pool that keeps bcrypt off the event loop
+password_hash_pool = PasswordHashPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+# Memo of verified token claims, so reused tokens skip jwt.decode
+token_cache = VerifiedTokenCache(max_entries=settings.TOKEN_CACHE_MAX_ENTRIES)
+
 
 def create_access_token(subject: str | Any, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -25,7 +48,7 @@ def create_access_token(subject: str | Any, expires_delta: Optional[timedelta] =
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    to_encode = {"exp": expire, "sub": str(subject), "type": "access"}
+    to_encode = {"exp": expire, "sub": str(subject), "type": "access", "jti": str(uuid4())}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -46,34 +69,52 @@ def create_refresh_token(subject: str | Any, expires_delta: Optional[timedelta]
     else:
         expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
 
-    to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
+    to_encode = {"exp": expire, "sub": str(subject), "type": "refresh", "jti": str(uuid4())}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
-def verify_token(token: str, token_type: str = "access") -> Optional[str]:
+def decode_token(token: str, token_type: str = "access") -> Optional[Dict[str, Any]]:
     """
-    Verify JWT token and return the subject (user_id)
+    Verify JWT token and return its claims
 
     Args:
         token: JWT token to verify
         token_type: Either "access" or "refresh"
 
     Returns:
-        Subject (user_id) if token is valid, None otherwise
+        Verified claims (sub, exp, type, jti) if token is valid, None otherwise
     """
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        token_data = payload.get("sub")
-        token_type_data = payload.get("type")
-
-        if token_data is None or token_type_data != token_type:
+    payload = token_cache.get(token)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError:
             return None
+        token_cache.put(token, payload)
 
-        return token_data
-    except JWTError:
+    if payload.get("sub") is None or payload.get("type") != token_type:
         return None
 
+    return payload
+
+
+def verify_token(token: str, token_type: str = "access") -> Optional[str]:
+    """
+    Verify JWT token and return the subject (user_id)
+
+    Does not check revocation; see app.core.token_revocation.
+
+    Args:
+        token: JWT token to verify
+        token_type: Either "access" or "refresh"
+
+    Returns:
+        Subject (user_id) if token is valid, None otherwise
+    """
+    payload = decode_token(token, token_type)
+    return payload["sub"] if payload is not None else None
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -102,3 +143,96 @@ def get_password_hash(password: str) -> str:
     # Bcrypt has a 72 byte limit, truncate if necessary
     password_bytes = password.encode('utf-8')[:72]
     return pwd_context.hash(password_bytes.decode('utf-8', errors='ignore'))
+
+
+def verify_password_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if its parameters are outdated
+
+    Returns:
+        (matches, new_hash): new_hash is set when the stored hash uses a
+        lower work factor than the current one and should be replaced
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def _time_bcrypt_hash(rounds: int) -> float:
+    """Milliseconds to hash a throwaway password at the given rounds"""
+    context = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=rounds)
+    started = time.perf_counter()
+    context.hash("calibration-password")
+    return (time.perf_counter() - started) * 1000
+
+
+def calibrate_password_hashing() -> Dict[str, Any]:
+    """
+    Pick the bcrypt work factor for this machine
+
+    Each extra round doubles bcrypt's cost, so one measurement at the
+    minimum rounds is enough to estimate every other setting. Picks the
+    highest rounds whose estimate fits PASSWORD_HASH_TARGET_MS, then
+    measures it. PASSWORD_BCRYPT_ROUNDS, if set, skips calibration.
+
+    Existing hashes with fewer rounds are upgraded on the next login.
+
+    Returns:
+        The chosen parameters (also stored in password_hash_params)
+    """
+    min_rounds = settings.PASSWORD_BCRYPT_MIN_ROUNDS
+    max_rounds = settings.PASSWORD_BCRYPT_MAX_ROUNDS
+
+    if settings.PASSWORD_BCRYPT_ROUNDS is not None:
+        rounds = settings.PASSWORD_BCRYPT_ROUNDS
+        source = "configured"
+    else:
+        base_ms = _time_bcrypt_hash(min_rounds)
+        rounds = min_rounds
+        while rounds < max_rounds and base_ms * 2 ** (rounds + 1 - min_rounds) <= settings.PASSWORD_HASH_TARGET_MS:
+            rounds += 1
+        source = "calibrated"
+
+    pwd_context.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+    password_hash_params.update(
+        rounds=rounds,
+        source=source,
+        measured_ms=round(_time_bcrypt_hash(rounds), 1),
+    )
+    print(
+        f"🔐 Password hashing: bcrypt rounds={rounds} ({source}), "
+        f"{password_hash_params['measured_ms']} ms per hash "
+        f"(target {settings.PASSWORD_HASH_TARGET_MS} ms)"
+    )
+    return dict(password_hash_params)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password on the password hash pool
+
+    Raises:
+        PasswordHashPoolFull: If the pool is saturated
+    """
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def verify_password_and_update_async(
+    plain_password: str,
+    hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify (and possibly rehash) a password on the password hash pool
+
+    Raises:
+        PasswordHashPoolFull: If the pool is saturated
+    """
+    return await password_hash_pool.run(verify_password_and_update, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password on the password hash pool
+
+    Raises:
+        PasswordHashPoolFull: If the pool is saturated
+    """
+    return await password_hash_pool.run(get_password_hash, password)
@@ -0,0 +1,79 @@
+"""
+Verified Token Cache
+
+Access tokens are reused for up to ACCESS_TOKEN_EXPIRE_MINUTES, but
+jwt.decode re-verifies the HMAC and re-parses the JSON on every request.
+This memoizes successfully verified claims per token.
+
+- Keyed by SHA-256 digest of the token, so raw tokens are not kept in memory
+- Each entry expires at the token's own `exp`: expired tokens are never served
+- Only verified tokens are cached; invalid tokens always take the full path
+- Bounded size with least-recently-used eviction
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class VerifiedTokenCache:
+    """LRU cache of token digest -> verified JWT claims"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self.digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            claims, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        """Cache verified claims until the token's exp (tokens without exp are skipped)"""
+        expires_at = claims.get("exp")
+        if self.max_entries <= 0 or not isinstance(expires_at, (int, float)):
+            return
+
+        key = self.digest(token)
+        with self._lock:
+            self._entries[key] = (claims, float(expires_at))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
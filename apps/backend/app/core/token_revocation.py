@@ -0,0 +1,178 @@
+"""
+Token Revocation
+
+Revoked tokens are identified by their `jti` claim and stored in
+Postgres (revoked_tokens). To keep revocation checks off the database
+for the common case, every check first goes through an in-memory Bloom
+filter of revoked jtis:
+
+- Not in the filter: definitely not revoked, no I/O
+- In the filter: possibly revoked, confirmed against the store
+
+The filter is rebuilt periodically from the store, sized from the
+number of live revocations and the configured false-positive target.
+Revocations made by this process enter the filter as soon as their
+transaction commits; revocations made by other workers become visible
+after their next rebuild.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.crud import revoked_token as crud_revoked
+from app.db.hooks import after_commit
+
+
+class TokenRevocationList:
+    """Bloom-filtered view of the revoked_tokens store"""
+
+    def __init__(self, capacity: int, fp_rate: float, rebuild_interval: float):
+        self.min_capacity = capacity
+        self.fp_rate = fp_rate
+        self.rebuild_interval = rebuild_interval
+        self._filter = BloomFilter(capacity, fp_rate)
+        # Committed local revocations (jti -> token expiry) not yet seen in a
+        # store snapshot; carried into every rebuilt filter until they are
+        self._recent: Dict[str, datetime] = {}
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.filter_negatives = 0
+        self.store_lookups = 0
+        self.false_positives = 0
+        self.rebuilds = 0
+        self.last_rebuild_at: Optional[datetime] = None
+
+    async def is_revoked(self, db: AsyncSession, jti: Optional[str]) -> bool:
+        """Check whether a token was revoked (tokens without jti never are)"""
+        if jti is None:
+            return False
+
+        if jti not in self._filter:
+            self.filter_negatives += 1
+            return False
+
+        self.store_lookups += 1
+        revoked = await crud_revoked.is_token_revoked(db, jti)
+        if not revoked:
+            self.false_positives += 1
+        return revoked
+
+    async def revoke(
+        self,
+        db: AsyncSession,
+        claims: Dict[str, Any],
+        user_id: Optional[int] = None
+    ) -> bool:
+        """
+        Revoke a verified token
+
+        Args:
+            db: Database session (committed by the request)
+            claims: Verified JWT claims, must include jti and exp
+            user_id: Owner of the token
+
+        Returns:
+            Whether this call revoked the token: False if it carries no jti
+            and cannot be revoked, or if it was already revoked (once
+            concurrent revocations of the same token have committed, only
+            one of them gets True)
+        """
+        jti = claims.get("jti")
+        if jti is None:
+            return False
+
+        expires_at = datetime.utcfromtimestamp(claims["exp"])
+        revoked = await crud_revoked.revoke_token(
+            db,
+            jti=jti,
+            token_type=claims.get("type", "access"),
+            expires_at=expires_at,
+            user_id=user_id
+        )
+        after_commit(db, lambda: self._add_committed(jti, expires_at))
+        return revoked
+
+    def _add_committed(self, jti: str, expires_at: datetime) -> None:
+        self._filter.add(jti)
+        self._recent[jti] = expires_at
+
+    async def rebuild(self, session_factory: async_sessionmaker) -> None:
+        """Reload the filter from the store and purge expired revocations"""
+        async with self._lock:
+            async with session_factory() as db:
+                await crud_revoked.purge_expired(db)
+                await db.commit()
+                jtis = await crud_revoked.get_active_revoked_jtis(db)
+
+            # Local revocations committed after the snapshot was read are
+            # kept until a later snapshot contains them (or they expire)
+            now = datetime.utcnow()
+            loaded = set(jtis)
+            self._recent = {
+                jti: expires_at
+                for jti, expires_at in self._recent.items()
+                if jti not in loaded and expires_at > now
+            }
+
+            # Headroom for revocations until the next rebuild
+            capacity = max(self.min_capacity, (len(jtis) + len(self._recent)) * 2)
+            new_filter = BloomFilter(capacity, self.fp_rate)
+            for jti in jtis:
+                new_filter.add(jti)
+            for jti in self._recent:
+                new_filter.add(jti)
+
+            self._filter = new_filter
+            self.rebuilds += 1
+            self.last_rebuild_at = datetime.utcnow()
+
+    async def _rebuild_loop(self, session_factory: async_sessionmaker) -> None:
+        while True:
+            try:
+                await self.rebuild(session_factory)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Token revocation filter rebuild failed: {type(e).__name__}: {e}")
+            await asyncio.sleep(self.rebuild_interval)
+
+    def start(self, session_factory: async_sessionmaker) -> None:
+        """Start periodic rebuilds on the running event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._rebuild_loop(session_factory))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "filter_capacity": self._filter.capacity,
+            "filter_entries": self._filter.count,
+            "filter_bits": self._filter.num_bits,
+            "filter_hashes": self._filter.num_hashes,
+            "fp_rate_target": self.fp_rate,
+            "filter_negatives": self.filter_negatives,
+            "store_lookups": self.store_lookups,
+            "false_positives": self.false_positives,
+            "local_pending_rebuild": len(self._recent),
+            "rebuilds": self.rebuilds,
+            "last_rebuild_at": self.last_rebuild_at.isoformat() if self.last_rebuild_at else None,
+        }
+
+
+token_revocation = TokenRevocationList(
+    capacity=settings.TOKEN_REVOCATION_BLOOM_CAPACITY,
+    fp_rate=settings.TOKEN_REVOCATION_BLOOM_FP_RATE,
+    rebuild_interval=settings.TOKEN_REVOCATION_REBUILD_INTERVAL_SECONDS,
+)
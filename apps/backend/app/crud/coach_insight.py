@@ -0,0 +1,110 @@
+"""
+Coach Insight CRUD Operations
+
+Store of precomputed daily insights
+"""
+
+from datetime import date, datetime
+from typing import List, Optional
+from sqlalchemy import select, delete, func, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.coach_insight import CoachInsight
+from app.models.user import User
+from app.models.user_streak import UserStreak
+
+# Arbitrary key for the advisory lock that serializes precompute batches
+PRECOMPUTE_LOCK_KEY = 0x1C0AC4
+
+
+async def get_insight(db: AsyncSession, user_id: int, day: date) -> Optional[str]:
+    """Get the user's stored insight message for a day"""
+    result = await db.execute(
+        select(CoachInsight.message).where(
+            and_(CoachInsight.user_id == user_id, CoachInsight.insight_date == day)
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+async def save_insight(db: AsyncSession, user_id: int, day: date, message: str) -> str:
+    """
+    Store the user's insight for a day, keeping an existing one
+
+    Returns:
+        The stored message (the earlier one if another worker won the race)
+    """
+    await db.execute(
+        pg_insert(CoachInsight)
+        .values(
+            user_id=user_id,
+            insight_date=day,
+            message=message,
+            created_at=datetime.utcnow()
+        )
+        .on_conflict_do_nothing(index_elements=[CoachInsight.user_id, CoachInsight.insight_date])
+    )
+    stored = await get_insight(db, user_id, day)
+    return stored if stored is not None else message
+
+
+async def get_users_missing_insight(
+    db: AsyncSession,
+    day: date,
+    active_since: date,
+    after_id: int = 0,
+    limit: int = 100
+) -> List[User]:
+    """
+    Active users without an insight for the day, in ID order (keyset pages)
+
+    Active means the account is enabled and the user completed a task on
+    or after active_since.
+    """
+    result = await db.execute(
+        select(User)
+        .join(UserStreak, UserStreak.user_id == User.id)
+        .outerjoin(
+            CoachInsight,
+            and_(CoachInsight.user_id == User.id, CoachInsight.insight_date == day)
+        )
+        .where(
+            and_(
+                User.is_active.is_(True),
+                User.id > after_id,
+                UserStreak.streak_anchor_date >= active_since,
+                CoachInsight.user_id.is_(None)
+            )
+        )
+        .order_by(User.id)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def try_lock_precompute(db: AsyncSession) -> bool:
+    """
+    Take the precompute batch lock on the session's connection
+
+    Session-level advisory lock, taken with the connection in autocommit
+    mode so no transaction stays open while a batch runs. It is held until
+    unlock_precompute (or until the connection closes, e.g. if the process
+    dies), so the session must keep its connection for the whole batch.
+    Needs a direct connection: behind PgBouncer in transaction mode the
+    server connection could be handed to another client.
+    """
+    conn = await db.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+    result = await conn.execute(select(func.pg_try_advisory_lock(PRECOMPUTE_LOCK_KEY)))
+    return bool(result.scalar_one())
+
+
+async def unlock_precompute(db: AsyncSession) -> None:
+    """Release the lock taken by try_lock_precompute on the same session"""
+    await db.execute(select(func.pg_advisory_unlock(PRECOMPUTE_LOCK_KEY)))
+
+
+async def purge_before(db: AsyncSession, day: date) -> int:
+    """Delete insights older than the given day"""
+    result = await db.execute(delete(CoachInsight).where(CoachInsight.insight_date < day))
+    return result.rowcount
@@ -4,12 +4,14 @@ Daily Metric CRUD Operations
 Create, Read, Update operations for daily metrics
 """
 
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from typing import List, Optional
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, update, and_, func, lambda_stmt, cast, Integer
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.daily_metric import DailyMetric
+from app.models.user_streak import UserStreak
 from app.schemas.daily_metric import DailyMetricCreate, DailyMetricUpdate
 
 
@@ -21,37 +23,27 @@ async def create_or_update_metric(
     """
     Create or update daily metric for a specific date
 
-    If metric already exists for the date, update it.
-    Otherwise, create new metric.
+    Single INSERT ... ON CONFLICT (user_id, date) DO UPDATE ... RETURNING:
+    if a metric already exists for the date, only the fields that were
+    sent are overwritten. Otherwise, a new metric is created.
     """
-    # Check if metric exists for this date
-    stmt = select(DailyMetric).where(
-        and_(
-            DailyMetric.user_id == user_id,
-            DailyMetric.date == metric_data.date
+    stmt = pg_insert(DailyMetric).values(user_id=user_id, **metric_data.model_dump())
+
+    update_fields = metric_data.model_dump(exclude_unset=True)
+    update_fields.pop('date', None)  # Don't update date
+    set_ = {field: stmt.excluded[field] for field in update_fields}
+    set_['updated_at'] = datetime.utcnow()  # onupdate is not applied to ON CONFLICT
+
+    stmt = (
+        stmt.on_conflict_do_update(
+            index_elements=[DailyMetric.user_id, DailyMetric.date],
+            set_=set_
         )
+        .returning(DailyMetric)
+        .execution_options(populate_existing=True)
     )
     result = await db.execute(stmt)
-    existing_metric = result.scalar_one_or_none()
-
-    if existing_metric:
-        # Update existing metric
-        for field, value in metric_data.model_dump(exclude_unset=True).items():
-            if field != 'date':  # Don't update date
-                setattr(existing_metric, field, value)
-        await db.flush()
-        await db.refresh(existing_metric)
-        return existing_metric
-    else:
-        # Create new metric
-        db_metric = DailyMetric(
-            user_id=user_id,
-            **metric_data.model_dump()
-        )
-        db.add(db_metric)
-        await db.flush()
-        await db.refresh(db_metric)
-        return db_metric
+    return result.scalar_one()
 
 
 async def get_metric_by_date(
@@ -60,10 +52,12 @@ async def get_metric_by_date(
     metric_date: date
 ) -> Optional[DailyMetric]:
     """Get daily metric for specific date"""
-    stmt = select(DailyMetric).where(
-        and_(
-            DailyMetric.user_id == user_id,
-            DailyMetric.date == metric_date
+    stmt = lambda_stmt(
+        lambda: select(DailyMetric).where(
+            and_(
+                DailyMetric.user_id == user_id,
+                DailyMetric.date == metric_date
+            )
         )
     )
     result = await db.execute(stmt)
@@ -115,12 +109,26 @@ async def update_metric(
     update_data: DailyMetricUpdate
 ) -> DailyMetric:
     """Update existing metric"""
-    for field, value in update_data.model_dump(exclude_unset=True).items():
-        setattr(metric, field, value)
+    values = update_data.model_dump(exclude_unset=True)
+    if not values:
+        return metric
+    return await _update_metric_returning(db, metric.id, values)
 
-    await db.flush()
-    await db.refresh(metric)
-    return metric
+
+async def _update_metric_returning(
+    db: AsyncSession,
+    metric_id: int,
+    values: dict
+) -> DailyMetric:
+    """UPDATE ... RETURNING, refreshing any copy already in the session"""
+    result = await db.execute(
+        update(DailyMetric)
+        .where(DailyMetric.id == metric_id)
+        .values(**values)
+        .returning(DailyMetric)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
 
 
 async def increment_tasks_completed(
@@ -132,25 +140,38 @@ async def increment_tasks_completed(
     """
     Increment tasks_completed counter for a date
     Also add exercise minutes if task was exercise-related
+
+    Single INSERT ... ON CONFLICT DO UPDATE with server-side arithmetic,
+    so concurrent completions neither create duplicate rows nor lose
+    increments.
     """
-    metric = await get_metric_by_date(db, user_id, task_date)
-
-    if not metric:
-        # Create metric if doesn't exist
-        metric = DailyMetric(
-            user_id=user_id,
-            date=task_date,
-            tasks_completed=1,
-            exercise_minutes=exercise_minutes
+    stmt = pg_insert(DailyMetric).values(
+        user_id=user_id,
+        date=task_date,
+        tasks_completed=1,
+        exercise_minutes=exercise_minutes
+    )
+    stmt = (
+        stmt.on_conflict_do_update(
+            index_elements=[DailyMetric.user_id, DailyMetric.date],
+            set_={
+                'tasks_completed': func.coalesce(DailyMetric.tasks_completed, 0) + 1,
+                'exercise_minutes': (
+                    func.coalesce(DailyMetric.exercise_minutes, 0) + stmt.excluded.exercise_minutes
+                ),
+                'updated_at': datetime.utcnow(),
+            }
         )
-        db.add(metric)
-    else:
-        # Update existing
-        metric.tasks_completed += 1
-        metric.exercise_minutes += exercise_minutes
+        .returning(DailyMetric)
+        .execution_options(populate_existing=True)
+    )
+    result = await db.execute(stmt)
+    metric = result.scalar_one()
+
+    # First completion of the day extends (or starts) the streak
+    if metric.tasks_completed == 1:
+        await _record_active_day(db, user_id, task_date)
 
-    await db.flush()
-    await db.refresh(metric)
     return metric
 
 
@@ -182,21 +203,140 @@ async def get_streak(
     user_id: int
 ) -> int:
     """
-    Calculate current streak of days with at least 1 task completed
-    Counts backwards from today until finding a day with 0 tasks
+    Current streak of days with at least 1 task completed, ending today
+
+    Reads the maintained UserStreak row; users without one fall back to
+    a single gaps-and-islands query. So do users whose anchor is in the
+    future (tasks completed ahead of their scheduled date), since the
+    maintained run then ends after today.
     """
     today = date.today()
-    streak = 0
-    current_date = today
+    state = await db.get(UserStreak, user_id)
+
+    if state is None or (state.streak_anchor_date is not None and state.streak_anchor_date > today):
+        return await _calculate_streak(db, user_id, today)
+
+    return state.current_streak if state.streak_anchor_date == today else 0
 
-    # Check up to 365 days back
-    for _ in range(365):
-        metric = await get_metric_by_date(db, user_id, current_date)
 
-        if not metric or metric.tasks_completed == 0:
-            break
+async def get_longest_streak(
+    db: AsyncSession,
+    user_id: int
+) -> int:
+    """Longest streak ever recorded for the user"""
+    state = await db.get(UserStreak, user_id)
+
+    if state is None:
+        return await _calculate_longest_streak(db, user_id)
 
-        streak += 1
-        current_date -= timedelta(days=1)
+    return state.longest_streak
+
+
+def _active_days_ranked(user_id: int, order_by):
+    """Active days (tasks_completed > 0) with their row number"""
+    return select(
+        DailyMetric.date.label("day"),
+        cast(func.row_number().over(order_by=order_by), Integer).label("rn")
+    ).where(
+        and_(
+            DailyMetric.user_id == user_id,
+            DailyMetric.tasks_completed > 0
+        )
+    )
+
+
+async def _calculate_streak(
+    db: AsyncSession,
+    user_id: int,
+    end_date: date
+) -> int:
+    """
+    Length of the run of consecutive active days ending on end_date
+
+    Numbering active days newest-first, a day belongs to the run ending
+    on end_date exactly when day + row_number = end_date + 1.
+    """
+    ranked = (
+        _active_days_ranked(user_id, DailyMetric.date.desc())
+        .where(DailyMetric.date <= end_date)
+        .subquery()
+    )
+    stmt = select(func.count()).select_from(ranked).where(
+        ranked.c.day + ranked.c.rn == end_date + timedelta(days=1)
+    )
+    result = await db.execute(stmt)
+    return result.scalar_one()
+
+
+async def _calculate_longest_streak(
+    db: AsyncSession,
+    user_id: int
+) -> int:
+    """Longest run of consecutive active days (gaps-and-islands)"""
+    ranked = _active_days_ranked(user_id, DailyMetric.date.asc()).subquery()
+    islands = (
+        select(func.count().label("length"))
+        .select_from(ranked)
+        .group_by(ranked.c.day - ranked.c.rn)
+        .subquery()
+    )
+    result = await db.execute(select(func.coalesce(func.max(islands.c.length), 0)))
+    return result.scalar_one()
+
+
+async def _record_active_day(
+    db: AsyncSession,
+    user_id: int,
+    day: date
+) -> UserStreak:
+    """
+    Update the maintained streak after `day` became active
+
+    Extending from the anchor is O(1). Backfilled days (completing an
+    older task) can bridge gaps, so those recompute from daily_metrics.
+    """
+    await db.execute(
+        pg_insert(UserStreak)
+        .values(user_id=user_id, current_streak=0, longest_streak=0)
+        .on_conflict_do_nothing(index_elements=[UserStreak.user_id])
+    )
+    result = await db.execute(
+        select(UserStreak)
+        .where(UserStreak.user_id == user_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    state = result.scalar_one()
+    anchor = state.streak_anchor_date
+
+    if anchor == day:
+        return state
+
+    if anchor is not None and day == anchor + timedelta(days=1):
+        state.current_streak += 1
+        state.streak_anchor_date = day
+    elif anchor is not None and day > anchor:
+        state.current_streak = 1
+        state.streak_anchor_date = day
+    else:
+        # Backfill, or no state yet: recompute from the source of truth
+        if anchor is None:
+            result = await db.execute(
+                select(func.max(DailyMetric.date)).where(
+                    and_(
+                        DailyMetric.user_id == user_id,
+                        DailyMetric.tasks_completed > 0
+                    )
+                )
+            )
+            anchor = result.scalar_one()
+        new_anchor = max(anchor, day) if anchor is not None else day
+        state.current_streak = await _calculate_streak(db, user_id, new_anchor)
+        state.longest_streak = max(
+            state.longest_streak,
+            await _calculate_longest_streak(db, user_id)
+        )
+        state.streak_anchor_date = new_anchor
 
-    return streak
+    state.longest_streak = max(state.longest_streak, state.current_streak)
+    return state
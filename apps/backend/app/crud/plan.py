@@ -1,9 +1,12 @@
-from typing import Optional, List
-from sqlalchemy import select
+from datetime import date
+from typing import Optional, List, Tuple
+from sqlalchemy import select, insert, update, lambda_stmt, func, case
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.plan import Plan
-from app.models.task import Task
+from app.models.task import Task, TaskStatus
+from app.models.user_streak import UserStreak
+from app.crud.daily_metric import _calculate_streak
 from app.schemas.plan import PlanCreate, PlanUpdate
 
 
@@ -26,9 +29,11 @@ async def get_user_plans(db: AsyncSession, user_id: int) -> List[Plan]:
 async def get_active_plan(db: AsyncSession, user_id: int) -> Optional[Plan]:
     """Get user's active plan"""
     result = await db.execute(
-        select(Plan)
-        .where(Plan.user_id == user_id, Plan.is_active == True)
-        .order_by(Plan.created_at.desc())
+        lambda_stmt(
+            lambda: select(Plan)
+            .where(Plan.user_id == user_id, Plan.is_active == True)
+            .order_by(Plan.created_at.desc())
+        )
     )
     return result.scalar_one_or_none()
 
@@ -45,19 +50,21 @@ async def create_plan(db: AsyncSession, user_id: int, plan_in: PlanCreate) -> Pl
     Returns:
         Created plan
     """
-    db_plan = Plan(
-        user_id=user_id,
-        title=plan_in.title,
-        description=plan_in.description,
-        roadmap=plan_in.roadmap,
-        current_phase=0,
-        completion_percentage=0.0,
-        is_active=True,
+    # INSERT ... RETURNING fills the ORM object in one round trip
+    result = await db.execute(
+        insert(Plan)
+        .values(
+            user_id=user_id,
+            title=plan_in.title,
+            description=plan_in.description,
+            roadmap=plan_in.roadmap,
+            current_phase=0,
+            completion_percentage=0.0,
+            is_active=True,
+        )
+        .returning(Plan)
     )
-
-    db.add(db_plan)
-    await db.flush()
-    await db.refresh(db_plan)
+    db_plan = result.scalar_one()
 
     return db_plan
 
@@ -74,19 +81,18 @@ async def update_plan(db: AsyncSession, plan_id: int, plan_in: PlanUpdate) -> Op
     Returns:
         Updated plan or None if not found
     """
-    db_plan = await get_plan_by_id(db, plan_id)
-    if not db_plan:
-        return None
-
     update_data = plan_in.model_dump(exclude_unset=True)
+    if not update_data:
+        return await get_plan_by_id(db, plan_id)
 
-    for field, value in update_data.items():
-        setattr(db_plan, field, value)
-
-    await db.flush()
-    await db.refresh(db_plan)
-
-    return db_plan
+    result = await db.execute(
+        update(Plan)
+        .where(Plan.id == plan_id)
+        .values(**update_data)
+        .returning(Plan)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
 
 
 async def get_plan_tasks(db: AsyncSession, plan_id: int) -> List[Task]:
@@ -97,14 +103,54 @@ async def get_plan_tasks(db: AsyncSession, plan_id: int) -> List[Task]:
     return result.scalars().all()
 
 
-async def deactivate_user_plans(db: AsyncSession, user_id: int) -> None:
-    """Deactivate all plans for a user"""
+async def get_plan_progress(
+    db: AsyncSession,
+    plan_id: int,
+    user_id: int,
+    today: date
+) -> Tuple[int, int, int]:
+    """
+    Get (completed tasks, total tasks, current streak) in one query
+
+    Task counts are aggregated in SQL with COUNT(*) FILTER; the streak
+    comes from the maintained user_streaks row (0 if it ended before
+    today). Users without that row, or whose run ends after today (tasks
+    completed early), fall back to the gaps-and-islands query, as in
+    crud.daily_metric.get_streak.
+    """
+    task_counts = (
+        select(
+            func.count().filter(Task.status == TaskStatus.COMPLETED).label("completed"),
+            func.count().label("total"),
+        )
+        .where(Task.plan_id == plan_id)
+        .subquery()
+    )
+    streak = (
+        select(
+            # NULL (anchor after today) falls back to the recomputation below
+            case(
+                (UserStreak.streak_anchor_date == today, UserStreak.current_streak),
+                (UserStreak.streak_anchor_date < today, 0),
+            )
+        )
+        .where(UserStreak.user_id == user_id)
+        .scalar_subquery()
+    )
+
     result = await db.execute(
-        select(Plan).where(Plan.user_id == user_id, Plan.is_active == True)
+        select(task_counts.c.completed, task_counts.c.total, streak)
     )
-    plans = result.scalars().all()
+    completed, total, streak_days = result.one()
+    if streak_days is None:
+        streak_days = await _calculate_streak(db, user_id, today)
+    return completed, total, streak_days
 
-    for plan in plans:
-        plan.is_active = False
 
-    await db.flush()
+async def deactivate_user_plans(db: AsyncSession, user_id: int) -> None:
+    """Deactivate all plans for a user"""
+    await db.execute(
+        update(Plan)
+        .where(Plan.user_id == user_id, Plan.is_active == True)
+        .values(is_active=False)
+    )
@@ -0,0 +1,172 @@
+"""
+Plan Job CRUD Operations
+
+Create, claim and finish background plan generation jobs
+"""
+
+from datetime import datetime, timedelta
+from typing import List, Optional
+from uuid import uuid4
+from sqlalchemy import select, update, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.plan_job import PlanJob, PlanJobKind, PlanJobStatus
+
+PENDING_STATUSES = (PlanJobStatus.QUEUED, PlanJobStatus.RUNNING)
+
+
+async def create_job(db: AsyncSession, user_id: int, kind: PlanJobKind) -> Optional[PlanJob]:
+    """
+    Create a queued job, unless the user already has a pending one
+
+    Returns:
+        The new job, or None if a queued/running job exists (the partial
+        unique index on user_id decides, so concurrent submits cannot
+        both insert)
+    """
+    result = await db.execute(
+        pg_insert(PlanJob)
+        .values(
+            id=str(uuid4()),
+            user_id=user_id,
+            kind=kind,
+            status=PlanJobStatus.QUEUED,
+            attempts=0
+        )
+        .on_conflict_do_nothing(
+            index_elements=[PlanJob.user_id],
+            index_where=PlanJob.status.in_(PENDING_STATUSES)
+        )
+        .returning(PlanJob)
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_job(db: AsyncSession, job_id: str, user_id: int) -> Optional[PlanJob]:
+    """Get a user's job by ID"""
+    result = await db.execute(
+        select(PlanJob)
+        .where(and_(PlanJob.id == job_id, PlanJob.user_id == user_id))
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_pending_job(db: AsyncSession, user_id: int) -> Optional[PlanJob]:
+    """Get the user's queued or running job, if any"""
+    result = await db.execute(
+        select(PlanJob)
+        .where(and_(PlanJob.user_id == user_id, PlanJob.status.in_(PENDING_STATUSES)))
+        .order_by(PlanJob.created_at.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def start_job(db: AsyncSession, job_id: str) -> Optional[PlanJob]:
+    """Mark a queued job as running (None if it is no longer queued)"""
+    result = await db.execute(
+        update(PlanJob)
+        .where(and_(PlanJob.id == job_id, PlanJob.status == PlanJobStatus.QUEUED))
+        .values(
+            status=PlanJobStatus.RUNNING,
+            attempts=PlanJob.attempts + 1,
+            started_at=datetime.utcnow()
+        )
+        .returning(PlanJob)
+    )
+    return result.scalar_one_or_none()
+
+
+async def claim_next_job(db: AsyncSession) -> Optional[PlanJob]:
+    """
+    Claim the oldest queued job and mark it running
+
+    FOR UPDATE SKIP LOCKED lets many workers poll the same table without
+    blocking each other or claiming the same job.
+    """
+    result = await db.execute(
+        select(PlanJob.id)
+        .where(PlanJob.status == PlanJobStatus.QUEUED)
+        .order_by(PlanJob.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    job_id = result.scalar_one_or_none()
+    if job_id is None:
+        return None
+    return await start_job(db, job_id)
+
+
+async def finish_job(
+    db: AsyncSession,
+    job_id: str,
+    attempt: int,
+    plan_id: Optional[int] = None,
+    error: Optional[str] = None
+) -> bool:
+    """
+    Mark a running job succeeded (with its plan) or failed (with an error)
+
+    Only the given attempt can finish the job: if stale recovery requeued
+    or failed it in the meantime, nothing is updated.
+
+    Returns:
+        Whether this attempt still owned the job
+    """
+    result = await db.execute(
+        update(PlanJob)
+        .where(
+            and_(
+                PlanJob.id == job_id,
+                PlanJob.status == PlanJobStatus.RUNNING,
+                PlanJob.attempts == attempt
+            )
+        )
+        .values(
+            status=PlanJobStatus.FAILED if error else PlanJobStatus.SUCCEEDED,
+            plan_id=plan_id,
+            error=error,
+            finished_at=datetime.utcnow()
+        )
+        .returning(PlanJob.id)
+    )
+    return result.scalar_one_or_none() is not None
+
+
+async def recover_stale_jobs(db: AsyncSession, stale_after: timedelta, max_attempts: int) -> int:
+    """
+    Requeue jobs whose worker died mid-run; give up after max_attempts
+
+    Returns:
+        Number of jobs requeued or failed
+    """
+    cutoff = datetime.utcnow() - stale_after
+    stale = and_(PlanJob.status == PlanJobStatus.RUNNING, PlanJob.started_at < cutoff)
+
+    failed = await db.execute(
+        update(PlanJob)
+        .where(and_(stale, PlanJob.attempts >= max_attempts))
+        .values(
+            status=PlanJobStatus.FAILED,
+            error="Plan generation did not finish",
+            finished_at=datetime.utcnow()
+        )
+    )
+    requeued = await db.execute(
+        update(PlanJob)
+        .where(stale)
+        .values(status=PlanJobStatus.QUEUED, started_at=None)
+    )
+    return failed.rowcount + requeued.rowcount
+
+
+async def get_queued_job_ids(db: AsyncSession, created_before: datetime) -> List[str]:
+    """IDs of jobs still queued that were created before the given time, oldest first"""
+    result = await db.execute(
+        select(PlanJob.id)
+        .where(and_(PlanJob.status == PlanJobStatus.QUEUED, PlanJob.created_at < created_before))
+        .order_by(PlanJob.created_at)
+    )
+    return list(result.scalars().all())
@@ -0,0 +1,72 @@
+"""
+Revoked Token CRUD Operations
+
+Persistent store behind the in-memory revocation filter
+"""
+
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import select, delete, and_, lambda_stmt
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.revoked_token import RevokedToken
+
+
+async def revoke_token(
+    db: AsyncSession,
+    jti: str,
+    token_type: str,
+    expires_at: datetime,
+    user_id: Optional[int] = None
+) -> bool:
+    """
+    Record a revoked token (idempotent)
+
+    Returns:
+        Whether this call revoked it (False if it already was)
+    """
+    result = await db.execute(
+        pg_insert(RevokedToken)
+        .values(
+            jti=jti,
+            user_id=user_id,
+            token_type=token_type,
+            expires_at=expires_at,
+            revoked_at=datetime.utcnow()
+        )
+        .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+        .returning(RevokedToken.jti)
+    )
+    return result.scalar_one_or_none() is not None
+
+
+async def is_token_revoked(db: AsyncSession, jti: str) -> bool:
+    """Check the store for a revoked, not yet expired token"""
+    now = datetime.utcnow()
+    stmt = lambda_stmt(
+        lambda: select(RevokedToken.jti).where(
+            and_(
+                RevokedToken.jti == jti,
+                RevokedToken.expires_at > now
+            )
+        )
+    )
+    result = await db.execute(stmt)
+    return result.first() is not None
+
+
+async def get_active_revoked_jtis(db: AsyncSession) -> List[str]:
+    """All revoked tokens that have not expired yet"""
+    result = await db.execute(
+        select(RevokedToken.jti).where(RevokedToken.expires_at > datetime.utcnow())
+    )
+    return list(result.scalars().all())
+
+
+async def purge_expired(db: AsyncSession) -> int:
+    """Delete revocations of tokens that have expired anyway"""
+    result = await db.execute(
+        delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow())
+    )
+    return result.rowcount
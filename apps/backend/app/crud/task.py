@@ -1,8 +1,9 @@
 from datetime import date, datetime
 from typing import Optional, List
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.plan import Plan
 from app.models.task import Task, TaskStatus
 from app.schemas.task import TaskCreate, TaskUpdate
 
@@ -13,6 +14,22 @@ async def get_task_by_id(db: AsyncSession, task_id: int) -> Optional[Task]:
     return result.scalar_one_or_none()
 
 
+async def get_active_plan_task(db: AsyncSession, task_id: int, user_id: int) -> Optional[Task]:
+    """Get task by ID if it belongs to the user's active plan (single joined query)"""
+    result = await db.execute(
+        lambda_stmt(
+            lambda: select(Task)
+            .join(Plan, Task.plan_id == Plan.id)
+            .where(
+                Task.id == task_id,
+                Plan.user_id == user_id,
+                Plan.is_active == True
+            )
+        )
+    )
+    return result.scalar_one_or_none()
+
+
 async def get_plan_tasks(db: AsyncSession, plan_id: int) -> List[Task]:
     """Get all tasks for a plan"""
     result = await db.execute(
@@ -26,12 +43,14 @@ async def get_plan_tasks(db: AsyncSession, plan_id: int) -> List[Task]:
 async def get_tasks_by_date(db: AsyncSession, plan_id: int, target_date: date) -> List[Task]:
     """Get tasks scheduled for a specific date"""
     result = await db.execute(
-        select(Task)
-        .where(
-            Task.plan_id == plan_id,
-            Task.scheduled_date == target_date
+        lambda_stmt(
+            lambda: select(Task)
+            .where(
+                Task.plan_id == plan_id,
+                Task.scheduled_date == target_date
+            )
+            .order_by(Task.time_of_day, Task.created_at)
         )
-        .order_by(Task.time_of_day, Task.created_at)
     )
     return result.scalars().all()
 
@@ -68,58 +87,90 @@ async def create_task(db: AsyncSession, plan_id: int, task_in: TaskCreate) -> Ta
     Returns:
         Created task
     """
-    db_task = Task(
-        plan_id=plan_id,
-        title=task_in.title,
-        description=task_in.description,
-        priority=task_in.priority,
-        scheduled_date=task_in.scheduled_date,
-        time_of_day=task_in.time_of_day,
-        duration_minutes=task_in.duration_minutes,
-        status=TaskStatus.PENDING,
+    # INSERT ... RETURNING fills the ORM object in one round trip
+    result = await db.execute(
+        insert(Task)
+        .values(
+            plan_id=plan_id,
+            title=task_in.title,
+            description=task_in.description,
+            priority=task_in.priority,
+            scheduled_date=task_in.scheduled_date,
+            time_of_day=task_in.time_of_day,
+            duration_minutes=task_in.duration_minutes,
+            status=TaskStatus.PENDING,
+        )
+        .returning(Task)
     )
-
-    db.add(db_task)
-    await db.flush()
-    await db.refresh(db_task)
+    db_task = result.scalar_one()
 
     return db_task
 
 
-async def update_task(db: AsyncSession, task_id: int, task_in: TaskUpdate) -> Optional[Task]:
+async def create_tasks(db: AsyncSession, plan_id: int, tasks_in: List[TaskCreate]) -> List[Task]:
+    """
+    Create many tasks for a plan in one statement
+
+    Uses a multi-row INSERT ... RETURNING (batched by SQLAlchemy's
+    insertmanyvalues), so a generated week costs one round trip instead
+    of one per task.
+
+    Args:
+        db: Database session
+        plan_id: Plan ID
+        tasks_in: Task creation schemas
+
+    Returns:
+        Created tasks, in the same order as tasks_in
+    """
+    if not tasks_in:
+        return []
+
+    result = await db.scalars(
+        insert(Task).returning(Task, sort_by_parameter_order=True),
+        [
+            {
+                "plan_id": plan_id,
+                "title": task_in.title,
+                "description": task_in.description,
+                "priority": task_in.priority,
+                "scheduled_date": task_in.scheduled_date,
+                "time_of_day": task_in.time_of_day,
+                "duration_minutes": task_in.duration_minutes,
+                "status": TaskStatus.PENDING,
+            }
+            for task_in in tasks_in
+        ],
+    )
+    return list(result.all())
+
+
+async def update_task(db: AsyncSession, db_task: Task, task_in: TaskUpdate) -> Optional[Task]:
     """
     Update task
 
     Args:
         db: Database session
-        task_id: Task ID to update
+        db_task: Task to update (already loaded, e.g. by get_owned_task)
         task_in: Task update schema
 
     Returns:
         Updated task or None if not found
     """
-    db_task = await get_task_by_id(db, task_id)
-    if not db_task:
-        return None
-
     update_data = task_in.model_dump(exclude_unset=True)
+    if not update_data:
+        return db_task
 
     # If status is being changed to completed, set completed_at
     if "status" in update_data and update_data["status"] == TaskStatus.COMPLETED:
         update_data["completed_at"] = datetime.utcnow().date()
 
-    for field, value in update_data.items():
-        setattr(db_task, field, value)
-
-    await db.flush()
-    await db.refresh(db_task)
-
-    return db_task
+    return await _update_task_returning(db, db_task.id, update_data)
 
 
 async def log_task_completion(
     db: AsyncSession,
-    task_id: int,
+    db_task: Task,
     notes: Optional[str] = None
 ) -> Optional[Task]:
     """
@@ -127,22 +178,33 @@ async def log_task_completion(
 
     Args:
         db: Database session
-        task_id: Task ID
+        db_task: Task to complete
         notes: Completion notes
 
     Returns:
         Updated task or None if not found
     """
-    db_task = await get_task_by_id(db, task_id)
-    if not db_task:
-        return None
-
-    db_task.status = TaskStatus.COMPLETED
-    db_task.completed_at = datetime.utcnow().date()
+    update_data = {
+        "status": TaskStatus.COMPLETED,
+        "completed_at": datetime.utcnow().date(),
+    }
     if notes:
-        db_task.notes = notes
+        update_data["notes"] = notes
 
-    await db.flush()
-    await db.refresh(db_task)
+    return await _update_task_returning(db, db_task.id, update_data)
 
-    return db_task
+
+async def _update_task_returning(
+    db: AsyncSession,
+    task_id: int,
+    update_data: dict
+) -> Optional[Task]:
+    """UPDATE ... RETURNING, refreshing the copy already in the session in place"""
+    result = await db.execute(
+        update(Task)
+        .where(Task.id == task_id)
+        .values(**update_data)
+        .returning(Task)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
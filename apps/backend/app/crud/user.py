@@ -1,16 +1,24 @@
 from typing import Optional
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
 import json
 
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import (
+    get_password_hash_async,
+    password_hash_params,
+    verify_password_and_update_async,
+)
+from app.core.principal_cache import principal_cache
+from app.db.hooks import after_commit
 
 
 async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
     """Get user by ID"""
-    result = await db.execute(select(User).where(User.id == user_id))
+    # Runs on every authenticated request: lambda_stmt builds and compiles the
+    # statement once and only re-binds user_id afterwards
+    result = await db.execute(lambda_stmt(lambda: select(User).where(User.id == user_id)))
     return result.scalar_one_or_none()
 
 
@@ -34,23 +42,25 @@ async def create_user(db: AsyncSession, user_in: UserCreate) -> User:
     # Convert goals list to JSON string if provided
     goals_json = json.dumps(user_in.goals) if user_in.goals else None
 
-    db_user = User(
-        email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
-        full_name=user_in.full_name,
-        age=user_in.age,
-        gender=user_in.gender,
-        height=user_in.height,
-        current_weight=user_in.current_weight,
-        goal_weight=user_in.goal_weight,
-        activity_level=user_in.activity_level,
-        goals=goals_json,
-        is_active=user_in.is_active,
+    # INSERT ... RETURNING fills the ORM object in one round trip
+    result = await db.execute(
+        insert(User)
+        .values(
+            email=user_in.email,
+            hashed_password=await get_password_hash_async(user_in.password),
+            full_name=user_in.full_name,
+            age=user_in.age,
+            gender=user_in.gender,
+            height=user_in.height,
+            current_weight=user_in.current_weight,
+            goal_weight=user_in.goal_weight,
+            activity_level=user_in.activity_level,
+            goals=goals_json,
+            is_active=user_in.is_active,
+        )
+        .returning(User)
     )
-
-    db.add(db_user)
-    await db.flush()
-    await db.refresh(db_user)
+    db_user = result.scalar_one()
 
     return db_user
 
@@ -67,27 +77,32 @@ async def update_user(db: AsyncSession, user_id: int, user_in: UserUpdate) -> Op
     Returns:
         Updated user or None if not found
     """
-    db_user = await get_user_by_id(db, user_id)
-    if not db_user:
-        return None
-
     update_data = user_in.model_dump(exclude_unset=True)
+    if not update_data:
+        return await get_user_by_id(db, user_id)
 
     # Hash password if it's being updated
     if "password" in update_data:
-        update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+        update_data["hashed_password"] = await get_password_hash_async(update_data.pop("password"))
 
     # Convert goals list to JSON string if provided
     if "goals" in update_data and update_data["goals"] is not None:
         update_data["goals"] = json.dumps(update_data["goals"])
 
-    for field, value in update_data.items():
-        setattr(db_user, field, value)
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(**update_data)
+        .returning(User)
+        .execution_options(populate_existing=True)
+    )
 
-    await db.flush()
-    await db.refresh(db_user)
+    # Cached principals must not outlive profile or is_active changes. Dropped
+    # after the commit: invalidating earlier would let a concurrent request
+    # re-cache the old row before the update is visible
+    after_commit(db, lambda: principal_cache.invalidate(user_id))
 
-    return db_user
+    return result.scalar_one_or_none()
 
 
 async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
@@ -105,8 +120,15 @@ async def authenticate_user(db: AsyncSession, email: str, password: str) -> Opti
     user = await get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    verified, new_hash = await verify_password_and_update_async(password, user.hashed_password)
+    if not verified:
         return None
     if not user.is_active:
         return None
+
+    # Hash was created with an older, cheaper work factor: upgrade it
+    if new_hash is not None:
+        user.hashed_password = new_hash
+        password_hash_params["rehashed_on_login"] += 1
+
     return user
@@ -0,0 +1,45 @@
+"""
+Transaction Hooks
+
+CRUD helpers never commit (get_db is the single commit point), so side
+effects outside the database that must only happen once a write is
+durable, like dropping a cache entry, are queued on the session with
+after_commit() and run when its transaction commits. They are discarded
+if it rolls back.
+"""
+
+from typing import Callable, List
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+_AFTER_COMMIT_KEY = "after_commit_callbacks"
+
+
+def after_commit(db: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Run callback once the session's current transaction commits
+
+    Args:
+        db: Database session
+        callback: Synchronous callable, run after the COMMIT succeeded
+    """
+    db.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    callbacks: List[Callable[[], None]] = session.info.pop(_AFTER_COMMIT_KEY, [])
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception as e:
+            # The transaction is already committed; a failing hook must not
+            # turn the request into an error
+            print(f"⚠️ after_commit hook failed: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit(session: Session) -> None:
+    session.info.pop(_AFTER_COMMIT_KEY, None)
@@ -0,0 +1,146 @@
+"""
+Connection Pool Telemetry
+
+Live statistics for the SQLAlchemy connection pools, used to size
+workers against Postgres max_connections:
+- Connections checked out / overflow in use
+- Checkout wait time histogram
+- Checkout failures (pool timeouts)
+
+Counters are fed by SQLAlchemy pool events. Wait time is measured by
+InstrumentedAsyncQueuePool, which times every checkout from the pool.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import LatencyHistogram
+
+# Upper bounds (ms) of the checkout wait histogram buckets; last bucket is +Inf
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class PoolStats:
+    """Thread-safe counters for a single named pool"""
+
+    def __init__(self, name: str, capacity: int):
+        self.name = name
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._pool: Optional[Any] = None
+
+        self.connections_opened = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.checkout_failures = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.wait_ms = LatencyHistogram(WAIT_BUCKETS_MS)
+
+    def record_wait(self, elapsed_ms: float) -> None:
+        """Record how long a checkout waited for a connection"""
+        self.wait_ms.observe(elapsed_ms)
+
+    def record_failure(self) -> None:
+        """Record a checkout that timed out waiting for the pool"""
+        with self._lock:
+            self.checkout_failures += 1
+
+    def attach(self, engine: AsyncEngine) -> None:
+        """Subscribe to pool events on the engine"""
+        sync_engine = engine.sync_engine
+        self._pool = sync_engine.pool
+
+        @event.listens_for(sync_engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            with self._lock:
+                self.connections_opened += 1
+
+        @event.listens_for(sync_engine, "checkout")
+        def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+            with self._lock:
+                self.checkouts += 1
+                self.in_use += 1
+                self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+        @event.listens_for(sync_engine, "checkin")
+        def _on_checkin(dbapi_connection, connection_record):
+            with self._lock:
+                self.checkins += 1
+                self.in_use = max(self.in_use - 1, 0)
+
+        @event.listens_for(sync_engine, "invalidate")
+        def _on_invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.invalidations += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a point-in-time view of the pool"""
+        pool = self._pool
+        with self._lock:
+            return {
+                "pool": self.name,
+                "capacity": self.capacity,
+                "size": pool.size() if pool is not None else None,
+                "checked_out": pool.checkedout() if pool is not None else self.in_use,
+                "checked_in": pool.checkedin() if pool is not None else None,
+                "overflow": max(pool.overflow(), 0) if pool is not None else None,
+                "peak_checked_out": self.peak_in_use,
+                "connections_opened": self.connections_opened,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "checkout_failures": self.checkout_failures,
+                "wait_ms": self.wait_ms.snapshot(),
+            }
+
+
+# Stats registry keyed by pool logging name
+_registry: Dict[str, PoolStats] = {}
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that times each checkout
+
+    Stats are looked up by the pool's logging name, which survives
+    pool.recreate() on engine.dispose().
+    """
+
+    def connect(self):
+        stats = _registry.get(getattr(self, "logging_name", None) or "")
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            if stats is not None:
+                stats.record_failure()
+            raise
+        if stats is not None:
+            stats.record_wait((time.perf_counter() - start) * 1000)
+        return connection
+
+
+def register_pool(engine: AsyncEngine, name: str, capacity: int) -> PoolStats:
+    """
+    Start collecting stats for an engine
+
+    The engine must be created with pool_logging_name=name so that
+    InstrumentedAsyncQueuePool can find its stats.
+    """
+    stats = PoolStats(name, capacity)
+    stats.attach(engine)
+    _registry[name] = stats
+    return stats
+
+
+def get_pool_stats() -> List[Dict[str, Any]]:
+    """Snapshot of every registered pool"""
+    return [stats.snapshot() for stats in _registry.values()]
@@ -0,0 +1,147 @@
+"""
+Read Replica Routing
+
+Routes read-only sessions to streaming replicas:
+- Round-robin across replicas whose replication lag is within bounds
+- Lag is sampled by a background task every check interval, never on
+  the request path, so a dead replica cannot stall reads
+- A replica whose last good sample is older than a few intervals is
+  treated as unusable
+- Falls back to the primary when no replica is usable
+"""
+
+import asyncio
+import itertools
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+# Seconds behind the primary; 0 when caught up or not a standby
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+# Lag samples older than this many check intervals are not trusted
+STALE_SAMPLE_INTERVALS = 3
+
+
+class Replica:
+    """A single replica engine with its last observed lag"""
+
+    def __init__(self, name: str, engine: AsyncEngine, session_factory: async_sessionmaker):
+        self.name = name
+        self.engine = engine
+        self.session_factory = session_factory
+        self.lag_seconds: Optional[float] = None
+        self.checked_at = 0.0
+        self.last_error: Optional[str] = None
+
+    async def refresh_lag(self, timeout: float) -> None:
+        """Sample replication lag (the lag loop calls this; requests never do)"""
+        try:
+            self.lag_seconds = await asyncio.wait_for(self._query_lag(), timeout)
+            self.checked_at = time.monotonic()
+            self.last_error = None
+        except Exception as e:
+            self.lag_seconds = None
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"❌ Replica {self.name} lag check failed: {self.last_error}")
+
+    async def _query_lag(self) -> float:
+        async with self.engine.connect() as conn:
+            result = await conn.execute(REPLICA_LAG_QUERY)
+            return float(result.scalar() or 0)
+
+    def is_usable(self, max_lag_seconds: float, max_sample_age: float) -> bool:
+        if self.lag_seconds is None:
+            return False
+        if time.monotonic() - self.checked_at > max_sample_age:
+            return False
+        return self.lag_seconds <= max_lag_seconds
+
+
+class ReadRouter:
+    """Chooses a session factory for read-only work"""
+
+    def __init__(
+        self,
+        primary_factory: async_sessionmaker,
+        replicas: List[Replica],
+        max_lag_seconds: float,
+        check_interval: float,
+    ):
+        self.primary_factory = primary_factory
+        self.replicas = replicas
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._cycle = itertools.cycle(replicas) if replicas else None
+        self._task: Optional[asyncio.Task] = None
+        self.replica_reads = 0
+        self.primary_fallbacks = 0
+
+    @property
+    def max_sample_age(self) -> float:
+        return self.check_interval * STALE_SAMPLE_INTERVALS
+
+    def choose(self) -> async_sessionmaker:
+        """Return the next usable replica's factory, or the primary's (no I/O)"""
+        if self._cycle is None:
+            return self.primary_factory
+
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            if replica.is_usable(self.max_lag_seconds, self.max_sample_age):
+                self.replica_reads += 1
+                return replica.session_factory
+
+        self.primary_fallbacks += 1
+        return self.primary_factory
+
+    async def refresh(self) -> None:
+        """Sample every replica's lag concurrently"""
+        await asyncio.gather(
+            *(replica.refresh_lag(timeout=self.check_interval) for replica in self.replicas)
+        )
+
+    async def _lag_loop(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.check_interval)
+
+    def start(self) -> None:
+        """Start background lag sampling on the running event loop"""
+        if self.replicas and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._lag_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "max_lag_seconds": self.max_lag_seconds,
+            "replica_reads": self.replica_reads,
+            "primary_fallbacks": self.primary_fallbacks,
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "lag_seconds": replica.lag_seconds,
+                    "usable": replica.is_usable(self.max_lag_seconds, self.max_sample_age),
+                    "last_error": replica.last_error,
+                }
+                for replica in self.replicas
+            ],
+        }
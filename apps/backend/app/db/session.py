@@ -1,20 +1,81 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from typing import Any, Dict
+from uuid import uuid4
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
 from app.core.config import settings
+from app.db.pool_stats import InstrumentedAsyncQueuePool, register_pool
+from app.db.replica import Replica, ReadRouter
+
+
+def _asyncpg_connect_args() -> Dict[str, Any]:
+    """Prepared-statement cache settings for the asyncpg driver"""
+    if settings.DATABASE_PGBOUNCER_TRANSACTION_MODE:
+        # Server connections are shared between clients per transaction, so
+        # statements must not be cached and names must never collide
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {
+        "prepared_statement_cache_size": settings.DATABASE_PREPARED_STATEMENT_CACHE_SIZE,
+    }
+
+
+def _create_engine(url: str, name: str) -> AsyncEngine:
+    """Create an async engine with the configured pool and register its telemetry"""
+    db_engine = create_async_engine(
+        url,
+        echo=settings.DATABASE_ECHO,
+        future=True,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+        pool_logging_name=name,
+        query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,
+        connect_args=_asyncpg_connect_args(),
+    )
+
+    # Pool telemetry (checked-out, overflow, wait times, checkout failures)
+    register_pool(
+        db_engine,
+        name,
+        capacity=settings.DATABASE_POOL_SIZE + settings.DATABASE_MAX_OVERFLOW,
+    )
+    return db_engine
+
+
+def _create_sessionmaker(db_engine: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(
+        db_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
 
 # Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DATABASE_ECHO,
-    future=True,
-)
+engine = _create_engine(settings.DATABASE_URL, "primary")
 
 # Create async session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
+AsyncSessionLocal = _create_sessionmaker(engine)
+
+# Read replicas (fall back to the primary when none are usable)
+replicas = []
+for index, replica_url in enumerate(settings.database_replica_urls):
+    replica_engine = _create_engine(replica_url, f"replica-{index}")
+    replicas.append(
+        Replica(f"replica-{index}", replica_engine, _create_sessionmaker(replica_engine))
+    )
+
+read_router = ReadRouter(
+    primary_factory=AsyncSessionLocal,
+    replicas=replicas,
+    max_lag_seconds=settings.DATABASE_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL,
 )
 
 
@@ -22,6 +83,11 @@ async def get_db() -> AsyncSession:
     """
     Dependency for getting async database session
 
+    This is the single commit point for a request: CRUD helpers and
+    endpoints write with INSERT/UPDATE ... RETURNING and never commit
+    themselves; the transaction is committed here once the endpoint
+    returns, or rolled back if it raised.
+
     Usage:
         @app.get("/users/")
         async def get_users(db: AsyncSession = Depends(get_db)):
@@ -36,3 +102,23 @@ async def get_db() -> AsyncSession:
             raise
         finally:
             await session.close()
+
+
+async def get_read_db() -> AsyncSession:
+    """
+    Dependency for read-only endpoints
+
+    Yields a session on a replica within the configured lag bound,
+    or on the primary if no replica qualifies. Never commits.
+
+    Usage:
+        @app.get("/stats/")
+        async def get_stats(db: AsyncSession = Depends(get_read_db)):
+            ...
+    """
+    session_factory = read_router.choose()
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
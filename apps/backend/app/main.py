@@ -1,12 +1,56 @@
-from fastapi import FastAPI
+import math
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.core.config import settings
 from app.api.v1.router import api_router
+from app.db.pool_stats import get_pool_stats
+from app.db.session import AsyncSessionLocal, read_router
+from app.core.password_pool import PasswordHashPoolFull
+from app.core.principal_cache import principal_cache
+from app.core.rate_limit import RateLimitExceeded, auth_rate_limiter
+from app.core.security import (
+    calibrate_password_hashing,
+    password_hash_params,
+    password_hash_pool,
+    token_cache,
+)
+from app.core.token_revocation import token_revocation
+from app.services.openai_client import close_openai_client, llm_backend_stats
+from app.services.llm_gateway import llm_gateway
+from app.services.ai_engine.roadmap_cache import roadmap_cache
+from app.services.plan_jobs import plan_job_runner
+from app.services.plan_builder import speculation_stats
+from app.services.daily_insights import daily_insights
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pick the bcrypt work factor for this hardware before serving logins
+    await password_hash_pool.run(calibrate_password_hashing)
+    # Sample replica lag in the background (reads never wait on it)
+    read_router.start()
+    # Load revoked tokens into the Bloom filter and keep it fresh
+    token_revocation.start(AsyncSessionLocal)
+    # Background plan generation workers
+    plan_job_runner.start(AsyncSessionLocal)
+    # Daily coach insights precompute
+    daily_insights.start(AsyncSessionLocal)
+    yield
+    await daily_insights.stop()
+    await plan_job_runner.stop()
+    await token_revocation.stop()
+    await read_router.stop()
+    await close_openai_client()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Set CORS
@@ -22,6 +66,24 @@ if settings.BACKEND_CORS_ORIGINS:
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
+@app.exception_handler(PasswordHashPoolFull)
+async def password_hash_pool_full_handler(request: Request, exc: PasswordHashPoolFull):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Authentication is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Too many attempts, please retry later"},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+
+
 @app.get("/")
 async def root():
     return {
@@ -34,3 +96,32 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/health/db")
+async def database_pool_stats():
+    return {"pools": get_pool_stats(), "read_routing": read_router.status()}
+
+
+@app.get("/health/auth")
+async def auth_stats():
+    return {
+        "password_hash": password_hash_params,
+        "password_hash_pool": password_hash_pool.stats(),
+        "rate_limit": auth_rate_limiter.stats(),
+        "principal_cache": principal_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "token_revocation": token_revocation.stats(),
+    }
+
+
+@app.get("/health/llm")
+async def llm_stats():
+    return {
+        **llm_backend_stats(),
+        **llm_gateway.stats(),
+        "roadmap_cache": roadmap_cache.stats(),
+        "plan_jobs": plan_job_runner.stats(),
+        "plan_speculation": speculation_stats,
+        "daily_insights": daily_insights.stats(),
+    }
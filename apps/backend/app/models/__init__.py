@@ -5,6 +5,10 @@ from app.models.plan import Plan
 from app.models.task import Task
 from app.models.biometric import Biometric
 from app.models.daily_metric import DailyMetric
+from app.models.user_streak import UserStreak
+from app.models.revoked_token import RevokedToken
+from app.models.plan_job import PlanJob
+from app.models.coach_insight import CoachInsight
 
 # Export all models for Alembic autogenerate
-__all__ = ["Base", "User", "Plan", "Task", "Biometric", "DailyMetric"]
+__all__ = ["Base", "User", "Plan", "Task", "Biometric", "DailyMetric", "UserStreak", "RevokedToken", "PlanJob", "CoachInsight"]
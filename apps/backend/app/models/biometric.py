@@ -1,6 +1,6 @@
 from datetime import date
 from typing import Optional
-from sqlalchemy import Float, ForeignKey, Date, Enum as SQLEnum
+from sqlalchemy import Float, ForeignKey, Date, Enum as SQLEnum, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 
@@ -26,6 +26,10 @@ class Biometric(Base, TimestampMixin):
     """Biometric model for tracking health metrics"""
 
     __tablename__ = "biometrics"
+    __table_args__ = (
+        # Latest measurement per type and weight history
+        Index("ix_biometrics_user_type_date", "user_id", "metric_type", "measurement_date"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
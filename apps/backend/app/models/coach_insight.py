@@ -0,0 +1,28 @@
+from datetime import date, datetime
+from sqlalchemy import Text, Date, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base
+
+
+class CoachInsight(Base):
+    """
+    Daily coach insight for a user
+
+    Generated once per user per day (by the precompute batch, or on the
+    first dashboard load that misses) and served from here afterwards.
+    """
+
+    __tablename__ = "coach_insights"
+    __table_args__ = (
+        # Retention purge
+        Index("ix_coach_insights_insight_date", "insight_date"),
+    )
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    insight_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<CoachInsight(user_id={self.user_id}, date={self.insight_date})>"
@@ -10,7 +10,7 @@ Stores daily health and performance metrics for users:
 """
 
 from datetime import date, datetime
-from sqlalchemy import Column, Integer, Float, String, Date, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Float, String, Date, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -28,6 +28,10 @@ class DailyMetric(Base):
     - Result clamped between 0-100
     """
     __tablename__ = "daily_metrics"
+    __table_args__ = (
+        # One row per user per day; also the arbiter for upserts
+        Index("uq_daily_metrics_user_date", "user_id", "date", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,5 +1,5 @@
 from typing import Optional, List
-from sqlalchemy import String, Integer, Text, ForeignKey, JSON
+from sqlalchemy import String, Integer, Text, ForeignKey, JSON, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base_class import Base, TimestampMixin
@@ -9,6 +9,16 @@ class Plan(Base, TimestampMixin):
     """Plan model for user's health journey roadmap"""
 
     __tablename__ = "plans"
+    __table_args__ = (
+        Index("ix_plans_user_id_is_active", "user_id", "is_active"),
+        # At most one active plan per user
+        Index(
+            "uq_plans_one_active_per_user",
+            "user_id",
+            unique=True,
+            postgresql_where=text("is_active"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
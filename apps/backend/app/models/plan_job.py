@@ -0,0 +1,62 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, Text, ForeignKey, DateTime, Integer, Index, Enum as SQLEnum, text
+from sqlalchemy.orm import Mapped, mapped_column
+import enum
+
+from app.db.base_class import Base, TimestampMixin
+
+
+class PlanJobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class PlanJobKind(str, enum.Enum):
+    GENERATE = "generate"
+    REGENERATE = "regenerate"
+
+
+class PlanJob(Base, TimestampMixin):
+    """
+    Background plan generation job
+
+    Doubles as the durable queue: workers claim QUEUED rows with
+    SELECT ... FOR UPDATE SKIP LOCKED. A user has at most one queued or
+    running job (partial unique index).
+    """
+
+    __tablename__ = "plan_jobs"
+    __table_args__ = (
+        # Queue claiming (oldest queued first) and stale-job recovery
+        Index("ix_plan_jobs_status_created_at", "status", "created_at"),
+        # One pending job per user; also serves the pending-job lookup
+        Index(
+            "uq_plan_jobs_user_id_pending",
+            "user_id",
+            unique=True,
+            postgresql_where=text("status IN ('QUEUED', 'RUNNING')"),
+        ),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+
+    kind: Mapped[PlanJobKind] = mapped_column(SQLEnum(PlanJobKind), nullable=False)
+    status: Mapped[PlanJobStatus] = mapped_column(
+        SQLEnum(PlanJobStatus), default=PlanJobStatus.QUEUED, nullable=False
+    )
+
+    # Result
+    plan_id: Mapped[Optional[int]] = mapped_column(ForeignKey("plans.id", ondelete="SET NULL"))
+    error: Mapped[Optional[str]] = mapped_column(Text)
+
+    # Execution bookkeeping
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+
+    def __repr__(self) -> str:
+        return f"<PlanJob(id={self.id}, user_id={self.user_id}, kind={self.kind}, status={self.status})>"
@@ -1,6 +1,6 @@
 from datetime import date
 from typing import Optional
-from sqlalchemy import String, Text, ForeignKey, Date, Enum as SQLEnum, Integer
+from sqlalchemy import String, Text, ForeignKey, Date, Enum as SQLEnum, Integer, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 
@@ -32,6 +32,12 @@ class Task(Base, TimestampMixin):
     """Task model for daily activities and goals"""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Today's tasks / plan task lists
+        Index("ix_tasks_plan_scheduled_date", "plan_id", "scheduled_date"),
+        # Task history and completion counts
+        Index("ix_tasks_plan_status_completed_at", "plan_id", "status", "completed_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     plan_id: Mapped[int] = mapped_column(ForeignKey("plans.id", ondelete="CASCADE"), nullable=False, index=True)
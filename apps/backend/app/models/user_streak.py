@@ -0,0 +1,32 @@
+from datetime import date
+from typing import Optional
+from sqlalchemy import Integer, Date, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base, TimestampMixin
+
+
+class UserStreak(Base, TimestampMixin):
+    """
+    Maintained streak state for a user
+
+    Updated incrementally when a day gets its first completed task, so
+    reading the streak is a single primary-key lookup.
+    """
+
+    __tablename__ = "user_streaks"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    # Length of the streak ending on streak_anchor_date
+    current_streak: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    longest_streak: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    # Latest day with at least one completed task
+    streak_anchor_date: Mapped[Optional[date]] = mapped_column(Date)
+
+    def __repr__(self) -> str:
+        return (
+            f"<UserStreak(user_id={self.user_id}, current={self.current_streak}, "
+            f"longest={self.longest_streak}, anchor={self.streak_anchor_date})>"
+        )
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import BaseModel, EmailStr, Field
 
 
@@ -13,6 +14,7 @@ class TokenPayload(BaseModel):
     sub: str  # subject (user_id)
     exp: int  # expiration time
     type: str  # token type (access or refresh)
+    jti: Optional[str] = None  # token id, used for revocation
 
 
 class LoginRequest(BaseModel):
@@ -26,6 +28,11 @@ class RefreshRequest(BaseModel):
     refresh_token: str
 
 
+class LogoutRequest(BaseModel):
+    """Logout request model"""
+    refresh_token: Optional[str] = None
+
+
 class AuthResponse(BaseModel):
     """Authentication response with tokens and user info"""
     access_token: str
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+
+from app.models.plan_job import PlanJobKind, PlanJobStatus
+
+
+# Properties to return to client
+class PlanJob(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    kind: PlanJobKind
+    status: PlanJobStatus
+    plan_id: Optional[int] = None
+    error: Optional[str] = None
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -7,7 +7,7 @@ Provides intelligent health coaching features:
 - Failure recovery for returning users
 """
 
-from .plan_generator import generate_roadmap, generate_weekly_tasks
+from .plan_generator import generate_roadmap, generate_weekly_tasks, get_cached_roadmap
 from .task_adapter import adapt_tasks, get_task_recommendations
 from .failure_recovery import (
     handle_user_return,
@@ -18,6 +18,7 @@ from .failure_recovery import (
 __all__ = [
     'generate_roadmap',
     'generate_weekly_tasks',
+    'get_cached_roadmap',
     'adapt_tasks',
     'get_task_recommendations',
     'handle_user_return',
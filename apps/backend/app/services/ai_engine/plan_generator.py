@@ -7,28 +7,10 @@ Includes safety rules and user constraint handling.
 
 from typing import Dict, Any, List, Optional
 from datetime import date, timedelta
-from openai import OpenAI
 import json
 
-from app.core.config import settings
-
-# OpenAI client instance (lazy initialization)
-_client: Optional[OpenAI] = None
-
-
-def get_openai_client() -> OpenAI:
-    """Get or create OpenAI client instance"""
-    global _client
-    if _client is None:
-        api_key = settings.OPENAI_API_KEY
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY environment variable is not set")
-
-        key_preview = f"{api_key[:10]}...{api_key[-4:]}" if len(api_key) > 14 else "***"
-        print(f"🔑 Initializing OpenAI client: {key_preview}")
-
-        _client = OpenAI(api_key=api_key)
-    return _client
+from app.services.llm_gateway import llm_gateway
+from app.services.ai_engine.roadmap_cache import profile_fingerprint, roadmap_cache
 
 
 def _apply_safety_rules(user_data: Dict[str, Any]) -> List[str]:
@@ -66,13 +48,37 @@ def _apply_safety_rules(user_data: Dict[str, Any]) -> List[str]:
     return constraints
 
 
-def generate_roadmap(user_data: Dict[str, Any], goal: Optional[str] = None) -> Dict[str, Any]:
+def get_cached_roadmap(user_data: Dict[str, Any], goal: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Roadmap for the user's profile bucket from the roadmap cache (no LLM call)
+
+    Args:
+        user_data: User profile (age, weight, height, activity_level, goals, etc.)
+        goal: Specific goal override
+
+    Returns:
+        Cached roadmap, or None on a miss
+    """
+    fingerprint = profile_fingerprint(user_data, goal, _apply_safety_rules(user_data))
+    cached_roadmap = roadmap_cache.get(fingerprint)
+    if cached_roadmap is not None:
+        print(f"⚡ Roadmap served from cache (bucket {fingerprint[:12]})")
+    return cached_roadmap
+
+
+async def generate_roadmap(
+    user_data: Dict[str, Any],
+    goal: Optional[str] = None,
+    check_cache: bool = True
+) -> Dict[str, Any]:
     """
     Generate a 12-week personalized health roadmap with 3 phases
 
     Args:
         user_data: User profile (age, weight, height, activity_level, goals, etc.)
         goal: Specific goal override
+        check_cache: Look up the roadmap cache first (False when the caller
+            already did); the generated roadmap is added to it either way
 
     Returns:
         Dict with structure:
@@ -95,6 +101,13 @@ def generate_roadmap(user_data: Dict[str, Any], goal: Optional[str] = None) -> D
     safety_rules = _apply_safety_rules(user_data)
     safety_section = "\n".join(f"- {rule}" for rule in safety_rules) if safety_rules else "No special constraints"
 
+    # Users in the same profile bucket share roadmaps
+    if check_cache:
+        cached_roadmap = get_cached_roadmap(user_data, goal)
+        if cached_roadmap is not None:
+            return cached_roadmap
+    fingerprint = profile_fingerprint(user_data, goal, safety_rules)
+
     # Build detailed context
     context = f"""
 You are a professional certified health and fitness coach creating a personalized 12-week health journey.
@@ -159,10 +172,8 @@ Return ONLY valid JSON with this EXACT structure:
 
     try:
         print("🤖 Generating roadmap with OpenAI (with safety rules)...")
-        client = get_openai_client()
-
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        content = await llm_gateway.complete(
+            "roadmap",
             messages=[
                 {
                     "role": "system",
@@ -175,12 +186,12 @@ Return ONLY valid JSON with this EXACT structure:
             ],
             temperature=0.7,
             max_tokens=1500,
-            response_format={"type": "json_object"},
-            timeout=30.0
+            response_format={"type": "json_object"}
         )
 
-        roadmap = json.loads(response.choices[0].message.content)
+        roadmap = json.loads(content)
         print(f"✅ Generated roadmap with {len(roadmap.get('phases', []))} phases")
+        roadmap_cache.add(fingerprint, roadmap)
         return roadmap
 
     except Exception as e:
@@ -214,7 +225,7 @@ Return ONLY valid JSON with this EXACT structure:
         }
 
 
-def generate_weekly_tasks(
+async def generate_weekly_tasks(
     user_data: Dict[str, Any],
     phase: Dict[str, Any],
     week_number: int = 1,
@@ -295,10 +306,8 @@ Generate tasks for all 7 days (day 1-7).
 
     try:
         print(f"🤖 Generating weekly tasks for week {week_number}...")
-        client = get_openai_client()
-
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        content = await llm_gateway.complete(
+            "weekly_tasks",
             messages=[
                 {
                     "role": "system",
@@ -311,11 +320,10 @@ Generate tasks for all 7 days (day 1-7).
             ],
             temperature=0.8,
             max_tokens=2000,
-            response_format={"type": "json_object"},
-            timeout=30.0
+            response_format={"type": "json_object"}
         )
 
-        result = json.loads(response.choices[0].message.content)
+        result = json.loads(content)
         tasks_raw = result.get('tasks', result.get('weekly_tasks', []))
 
         # Convert to proper format with dates
@@ -0,0 +1,162 @@
+"""
+Roadmap Cache
+
+Most users fall into a small number of profile buckets, and roadmaps
+for the same bucket are interchangeable. Roadmaps are cached by a
+canonical profile fingerprint so most plan generations skip the LLM.
+
+Fingerprint = (age band, BMI band, gender, activity level, weight goal
+direction and distance band, normalized goals, safety constraints).
+Each bucket keeps up to ROADMAP_CACHE_MAX_VARIANTS roadmaps: until it is
+full, lookups miss and new generations are added, afterwards a random
+variant is served.
+"""
+
+import hashlib
+import json
+import random
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+def _band(value: Optional[float], width: float) -> Optional[int]:
+    if value is None or width <= 0:
+        return None
+    return int(value // width)
+
+
+def _weight_goal(current_weight: Optional[float], goal_weight: Optional[float]) -> Optional[Tuple[str, Optional[int]]]:
+    """(direction, band of |goal - current|); roadmaps state weight targets"""
+    if current_weight is None or goal_weight is None:
+        return None
+    delta = goal_weight - current_weight
+    direction = "lose" if delta < 0 else "gain" if delta > 0 else "maintain"
+    return direction, _band(abs(delta), settings.ROADMAP_CACHE_WEIGHT_DELTA_BAND_KG)
+
+
+def _normalize_goals(goals: Any) -> List[str]:
+    """Goals as a sorted list of lowercase, whitespace-collapsed strings"""
+    if goals is None:
+        return []
+    if isinstance(goals, str):
+        try:
+            goals = json.loads(goals)
+        except ValueError:
+            goals = [goals]
+    if isinstance(goals, str):
+        goals = [goals]
+    return sorted({" ".join(str(goal).lower().split()) for goal in goals if goal})
+
+
+def profile_fingerprint(
+    user_data: Dict[str, Any],
+    goal: Optional[str],
+    safety_rules: List[str]
+) -> str:
+    """
+    Canonical fingerprint of the roadmap-relevant parts of a profile
+
+    Args:
+        user_data: User profile (age, height, current_weight, goal_weight,
+            activity_level, goals)
+        goal: Goal override passed to generate_roadmap
+        safety_rules: Output of _apply_safety_rules for the profile
+
+    Returns:
+        Hex digest identifying the profile bucket
+    """
+    bmi = None
+    height_cm = user_data.get('height')
+    weight_kg = user_data.get('current_weight')
+    if height_cm and weight_kg:
+        bmi = weight_kg / ((height_cm / 100) ** 2)
+
+    activity_level = user_data.get('activity_level')
+    activity_level = getattr(activity_level, "value", activity_level)
+    gender = user_data.get('gender')
+    gender = getattr(gender, "value", gender)
+
+    bucket = {
+        "age": _band(user_data.get('age'), settings.ROADMAP_CACHE_AGE_BAND_YEARS),
+        "bmi": _band(bmi, settings.ROADMAP_CACHE_BMI_BAND),
+        "gender": gender.lower() if gender else None,
+        "activity": activity_level.lower() if activity_level else None,
+        "weight_goal": _weight_goal(weight_kg, user_data.get('goal_weight')),
+        "goals": _normalize_goals(goal or user_data.get('goals')),
+        "safety": sorted(safety_rules),
+    }
+    canonical = json.dumps(bucket, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class RoadmapCache:
+    """TTL cache of roadmap variants per profile bucket, LRU over buckets"""
+
+    def __init__(self, ttl_seconds: float, max_variants: int, max_buckets: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_variants = max_variants
+        self.max_buckets = max_buckets
+        # fingerprint -> [(roadmap, expires_at)]
+        self._buckets: "OrderedDict[str, List[Tuple[Dict[str, Any], float]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_variants > 0
+
+    def get(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """A cached roadmap for the bucket, once the bucket has all its variants"""
+        if not self.enabled:
+            self.misses += 1
+            return None
+
+        now = time.monotonic()
+        variants = [v for v in self._buckets.get(fingerprint, []) if v[1] > now]
+
+        if variants:
+            self._buckets[fingerprint] = variants
+            self._buckets.move_to_end(fingerprint)
+        else:
+            self._buckets.pop(fingerprint, None)
+
+        if len(variants) < self.max_variants:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return deepcopy(random.choice(variants)[0])
+
+    def add(self, fingerprint: str, roadmap: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+
+        variants = self._buckets.setdefault(fingerprint, [])
+        variants.append((deepcopy(roadmap), time.monotonic() + self.ttl_seconds))
+        del variants[:-self.max_variants]
+        self._buckets.move_to_end(fingerprint)
+        while len(self._buckets) > self.max_buckets:
+            self._buckets.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "buckets": len(self._buckets),
+            "variants": sum(len(v) for v in self._buckets.values()),
+            "max_variants": self.max_variants,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+roadmap_cache = RoadmapCache(
+    ttl_seconds=settings.ROADMAP_CACHE_TTL_SECONDS,
+    max_variants=settings.ROADMAP_CACHE_MAX_VARIANTS,
+    max_buckets=settings.ROADMAP_CACHE_MAX_BUCKETS,
+)
@@ -0,0 +1,218 @@
+"""
+Daily Insights
+
+Coach insights are generated once per user per day and stored in
+coach_insights, instead of one LLM completion per dashboard load:
+
+- A background batch precomputes today's insight for active users, with
+  bounded concurrency. One process runs it at a time (advisory lock)
+- GET /coach/insight serves the stored insight; on a miss it generates
+  one on demand. Concurrent misses for the same user share a single
+  generation (single-flight), and the table's primary key keeps
+  processes from storing two different insights for the same day
+
+"Day" is the calendar day in INSIGHT_TIMEZONE. Fallback insights (LLM
+unavailable) are served but not stored, so they are retried later.
+"""
+
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.crud import coach_insight as crud_insight
+from app.services.openai_service import INSIGHT_FALLBACK, generate_daily_insight
+
+
+def insight_user_data(user: Any) -> Dict[str, Any]:
+    """Profile fields used for insight generation"""
+    return {
+        "goals": user.goals,
+        "activity_level": user.activity_level,
+        "recent_activity": "tracking daily tasks"  # Could be enhanced with real activity data
+    }
+
+
+class DailyInsightService:
+    """Stored daily insights with single-flight on-demand generation"""
+
+    def __init__(
+        self,
+        timezone: str,
+        precompute_enabled: bool,
+        concurrency: int,
+        batch_size: int,
+        interval: float,
+        active_days: int,
+        retention_days: int
+    ):
+        self.timezone = ZoneInfo(timezone)
+        self.precompute_enabled = precompute_enabled
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.interval = interval
+        self.active_days = active_days
+        self.retention_days = retention_days
+        self._session_factory: Optional[async_sessionmaker] = None
+        self._inflight: Dict[Tuple[int, date], asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.served_stored = 0
+        self.generated = 0
+        self.coalesced = 0
+        self.fallbacks = 0
+        self.precomputed = 0
+        self.last_precompute_at: Optional[datetime] = None
+
+    def today(self) -> date:
+        return datetime.now(self.timezone).date()
+
+    async def get_stored(self, db: AsyncSession, user_id: int, day: date) -> Optional[str]:
+        """The user's stored insight for the day, if any"""
+        message = await crud_insight.get_insight(db, user_id, day)
+        if message is not None:
+            self.served_stored += 1
+        return message
+
+    async def get_or_generate(self, user_id: int, user_data: Dict[str, Any], day: date) -> str:
+        """
+        Generate and store the user's insight for the day
+
+        Concurrent calls for the same user and day share one generation.
+        Uses its own short sessions; no connection is held during the
+        LLM call.
+
+        Args:
+            user_id: Insight owner
+            user_data: Output of insight_user_data
+            day: Insight day (see today())
+
+        Returns:
+            Insight message
+        """
+        key = (user_id, day)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._generate(user_id, user_data, day))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # A cancelled caller must not cancel the generation others wait on
+        return await asyncio.shield(task)
+
+    async def _generate(self, user_id: int, user_data: Dict[str, Any], day: date) -> str:
+        message = await generate_daily_insight(user_data)
+        if message == INSIGHT_FALLBACK:
+            self.fallbacks += 1
+            return message
+
+        try:
+            async with self._session_factory() as db:
+                message = await crud_insight.save_insight(db, user_id, day, message)
+                await db.commit()
+            self.generated += 1
+        except Exception as e:
+            print(f"❌ Failed to store daily insight for user {user_id}: {type(e).__name__}: {e}")
+        return message
+
+    async def precompute(self) -> int:
+        """
+        Generate today's insight for active users that do not have one
+
+        Returns:
+            Number of users processed (0 if another process holds the batch lock)
+        """
+        day = self.today()
+        active_since = day - timedelta(days=self.active_days)
+
+        # Session-level lock on lock_db's connection, idle (no open
+        # transaction) while the batch runs
+        async with self._session_factory() as lock_db:
+            if not await crud_insight.try_lock_precompute(lock_db):
+                return 0
+            try:
+                processed = await self._precompute_batch(day, active_since)
+            finally:
+                await crud_insight.unlock_precompute(lock_db)
+
+        self.precomputed += processed
+        self.last_precompute_at = datetime.utcnow()
+        return processed
+
+    async def _precompute_batch(self, day: date, active_since: date) -> int:
+        processed = 0
+        async with self._session_factory() as db:
+            await crud_insight.purge_before(db, day - timedelta(days=self.retention_days))
+            await db.commit()
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def generate(user: Any) -> None:
+            async with semaphore:
+                await self.get_or_generate(user.id, insight_user_data(user), day)
+
+        after_id = 0
+        while True:
+            async with self._session_factory() as db:
+                users: List[Any] = await crud_insight.get_users_missing_insight(
+                    db, day, active_since, after_id=after_id, limit=self.batch_size
+                )
+            if not users:
+                break
+            after_id = users[-1].id
+            await asyncio.gather(*(generate(user) for user in users))
+            processed += len(users)
+        return processed
+
+    async def _precompute_loop(self) -> None:
+        while True:
+            try:
+                processed = await self.precompute()
+                if processed:
+                    print(f"✅ Precomputed daily insights for {processed} users")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Daily insight precompute failed: {type(e).__name__}: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self, session_factory: async_sessionmaker) -> None:
+        """Set the session factory and start the precompute loop (if enabled)"""
+        self._session_factory = session_factory
+        if self.precompute_enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._precompute_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "timezone": str(self.timezone),
+            "served_stored": self.served_stored,
+            "generated": self.generated,
+            "coalesced": self.coalesced,
+            "fallbacks": self.fallbacks,
+            "in_flight": len(self._inflight),
+            "precomputed": self.precomputed,
+            "last_precompute_at": self.last_precompute_at.isoformat() if self.last_precompute_at else None,
+        }
+
+
+daily_insights = DailyInsightService(
+    timezone=settings.INSIGHT_TIMEZONE,
+    precompute_enabled=settings.INSIGHT_PRECOMPUTE_ENABLED,
+    concurrency=settings.INSIGHT_PRECOMPUTE_CONCURRENCY,
+    batch_size=settings.INSIGHT_PRECOMPUTE_BATCH_SIZE,
+    interval=settings.INSIGHT_PRECOMPUTE_INTERVAL_SECONDS,
+    active_days=settings.INSIGHT_ACTIVE_WITHIN_DAYS,
+    retention_days=settings.INSIGHT_RETENTION_DAYS,
+)
@@ -0,0 +1,289 @@
+"""
+Fake LLM Backend
+
+Local stand-in for the OpenAI chat-completions API, for load tests and
+benchmarks that must run offline (LLM_BACKEND=fake). It plugs in as the
+httpx transport of the shared OpenAI client, so the SDK, the gateway
+(limits, retries, breakers, coalescing) and the services all run
+unchanged; only the network hop is replaced.
+
+- Replies are deterministic for a given request and FAKE_LLM_SEED, and
+  match what the services parse: roadmap JSON, {"tasks": [...]} weekly
+  tasks, short insights and coach chat replies
+- Latency is drawn from a configurable distribution (fixed, uniform or
+  lognormal around FAKE_LLM_LATENCY_MS); streamed replies add a delay
+  per token after the first
+- FAKE_LLM_ERROR_RATE injects HTTP errors (429/500/503 by default), and
+  calls slower than the request timeout fail with a read timeout
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Dict, List, Sequence
+
+import httpx
+
+from app.core.config import settings
+
+ROADMAP_GOALS = {
+    "Foundation": [
+        ["Establish daily movement habit", "Track nutrition basics", "Build consistency"],
+        ["Establish daily movement habit", "Track nutrition basics", "Improve sleep routine"],
+        ["Build consistency", "Track nutrition basics", "Establish hydration habit"],
+    ],
+    "Progress": [
+        ["Increase activity intensity", "Improve nutrition quality", "Build strength"],
+        ["Add two strength sessions per week", "Improve meal quality", "Increase daily steps"],
+    ],
+    "Optimization": [
+        ["Maximize results", "Fine-tune habits", "Prepare for maintenance"],
+        ["Refine training split", "Dial in nutrition", "Plan long-term routine"],
+    ],
+}
+
+ROADMAP_MILESTONES = {
+    "Foundation": ["14 days of activity logged", "Baseline measurements taken"],
+    "Progress": ["30% progress toward goal", "Improved energy levels"],
+    "Optimization": ["70% progress toward goal", "Sustainable routine established"],
+}
+
+WEEKLY_TASKS = [
+    ("Morning Walk", "Brisk walk at a comfortable pace", "high", "morning", 30),
+    ("Track Meals", "Log all meals and water intake", "medium", "anytime", 10),
+    ("Strength Training", "Bodyweight squats, push-ups and planks", "high", "morning", 20),
+    ("Meal Prep", "Prepare healthy lunches for the next days", "medium", "evening", 30),
+    ("Yoga Session", "Gentle yoga for flexibility", "medium", "morning", 25),
+    ("Hydration Check", "Drink 8 glasses of water", "high", "anytime", 5),
+    ("Cardio Workout", "Moderate cardio of your choice", "high", "afternoon", 30),
+    ("Active Recovery", "Light stretching and mobility", "low", "evening", 15),
+    ("Outdoor Activity", "Hiking, cycling or sports", "medium", "afternoon", 45),
+    ("Weekly Review", "Review progress and plan next week", "low", "evening", 15),
+]
+
+INSIGHTS = [
+    "Consistency beats intensity: a short walk today keeps your momentum going.",
+    "You have been showing up, and that is the hardest part. Add one glass of water to today's routine.",
+    "Small wins compound. Pick the easiest task on your list and finish it before lunch.",
+    "Rest is part of the plan. If you feel tired, swap today's workout for a gentle stretch.",
+]
+
+CHAT_OPENERS = [
+    "Great question!",
+    "Thanks for sharing that.",
+    "That's a common challenge, and you're not alone.",
+]
+
+CHAT_BODIES = [
+    "Focus on one small, repeatable habit this week, like a 10-minute walk after dinner, and track it every day.",
+    "Try planning tomorrow's meals tonight; having a plan makes healthy choices much easier when you're busy.",
+    "Progress is rarely linear. Look at your weekly trend rather than single days, and keep your routine simple.",
+]
+
+CHAT_CLOSERS = [
+    "What feels like the biggest obstacle for you right now?",
+    "How does that fit with your current schedule?",
+    "Would you like a few specific ideas to get started?",
+]
+
+
+def _request_rng(body: bytes) -> random.Random:
+    """RNG seeded by the request, so identical requests get identical replies"""
+    digest = hashlib.sha256(body).hexdigest()
+    return random.Random(f"{settings.FAKE_LLM_SEED}:{digest}")
+
+
+def _fake_roadmap(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "phases": [
+            {
+                "name": name,
+                "duration": "4 weeks",
+                "goals": list(rng.choice(ROADMAP_GOALS[name])),
+                "milestones": list(ROADMAP_MILESTONES[name]),
+            }
+            for name in ("Foundation", "Progress", "Optimization")
+        ],
+        "timeline": {
+            "total_duration": "12 weeks",
+            "estimated_completion": "Steady progress toward your goal over 12 weeks",
+        },
+    }
+
+
+def _fake_weekly_tasks(rng: random.Random) -> Dict[str, Any]:
+    tasks = []
+    for day in range(1, 8):
+        title, description, priority, time_of_day, duration = rng.choice(WEEKLY_TASKS)
+        tasks.append({
+            "day": day,
+            "title": title,
+            "description": description,
+            "priority": priority,
+            "time_of_day": time_of_day,
+            "duration_minutes": duration,
+        })
+    return {"tasks": tasks}
+
+
+def fake_completion_content(messages: List[Dict[str, Any]], rng: random.Random) -> str:
+    """
+    Reply content for a chat request, shaped after the prompt it answers
+
+    Roadmap and weekly-task prompts get JSON, the insight prompt a single
+    sentence, anything else a short coach reply.
+    """
+    system = " ".join(str(m.get("content", "")) for m in messages if m.get("role") == "system")
+    user = " ".join(str(m.get("content", "")) for m in messages if m.get("role") == "user")
+
+    if "weekly task plan" in user:
+        return json.dumps(_fake_weekly_tasks(rng))
+    if "12-week" in user and '"phases"' in user:
+        return json.dumps(_fake_roadmap(rng))
+    if "daily insights" in system:
+        return rng.choice(INSIGHTS)
+    return " ".join([rng.choice(CHAT_OPENERS), rng.choice(CHAT_BODIES), rng.choice(CHAT_CLOSERS)])
+
+
+class FakeLLMTransport(httpx.AsyncBaseTransport):
+    """httpx transport answering POST .../chat/completions locally"""
+
+    def __init__(
+        self,
+        latency_ms: float,
+        distribution: str,
+        spread: float,
+        token_delay_ms: float,
+        error_rate: float,
+        error_status_codes: Sequence[int],
+        seed: int
+    ):
+        if distribution not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown FAKE_LLM_LATENCY_DISTRIBUTION: {distribution}")
+        self.latency_ms = latency_ms
+        self.distribution = distribution
+        self.spread = spread
+        self.token_delay_ms = token_delay_ms
+        self.error_rate = error_rate
+        self.error_status_codes = list(error_status_codes) or [500]
+        # Latency and error draws: reproducible sequence for a given seed
+        self._rng = random.Random(seed)
+        self.requests = 0
+        self.injected_errors = 0
+        self.timeouts = 0
+
+    def _latency(self) -> float:
+        """Seconds until the reply (or first token) is sent"""
+        if self.distribution == "fixed":
+            ms = self.latency_ms
+        elif self.distribution == "uniform":
+            ms = self.latency_ms * self._rng.uniform(1 - self.spread, 1 + self.spread)
+        else:
+            # Median latency_ms, long right tail like real completions
+            ms = self._rng.lognormvariate(0, self.spread) * self.latency_ms
+        return max(ms, 0.0) / 1000
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        body = await request.aread()
+
+        if request.method != "POST" or not request.url.path.endswith("/chat/completions"):
+            return httpx.Response(404, json={"error": {"message": "Not found", "type": "invalid_request_error"}})
+
+        payload = json.loads(body)
+
+        if self._rng.random() < self.error_rate:
+            self.injected_errors += 1
+            status_code = self._rng.choice(self.error_status_codes)
+            return httpx.Response(
+                status_code,
+                json={"error": {"message": "Injected fake LLM error", "type": "server_error"}},
+            )
+
+        # Honour the request timeout like a real slow upstream would
+        latency = self._latency()
+        read_timeout = (request.extensions.get("timeout") or {}).get("read")
+        if read_timeout is not None and latency > read_timeout:
+            await asyncio.sleep(read_timeout)
+            self.timeouts += 1
+            raise httpx.ReadTimeout("Fake LLM read timeout", request=request)
+
+        rng = _request_rng(body)
+        content = fake_completion_content(payload.get("messages", []), rng)
+        model = payload.get("model", settings.OPENAI_MODEL)
+        completion_id = f"chatcmpl-fake-{hashlib.sha256(body).hexdigest()[:24]}"
+
+        if payload.get("stream"):
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/event-stream"},
+                content=self._stream(completion_id, model, content, latency),
+            )
+
+        await asyncio.sleep(latency)
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in payload.get("messages", []))
+        completion_tokens = len(content.split())
+        return httpx.Response(200, json={
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    async def _stream(self, completion_id: str, model: str, content: str, latency: float) -> AsyncIterator[bytes]:
+        """Chat-completion chunks as Server-Sent Events"""
+        created = int(time.time())
+
+        def chunk(delta: Dict[str, Any], finish_reason: Any = None) -> bytes:
+            data = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            return f"data: {json.dumps(data)}\n\n".encode("utf-8")
+
+        await asyncio.sleep(latency)
+        yield chunk({"role": "assistant", "content": ""})
+        for i, token in enumerate(re.findall(r"\S+\s*", content)):
+            if i:
+                await asyncio.sleep(self.token_delay_ms / 1000)
+            yield chunk({"content": token})
+        yield chunk({}, finish_reason="stop")
+        yield b"data: [DONE]\n\n"
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "injected_errors": self.injected_errors,
+            "timeouts": self.timeouts,
+            "latency_ms": self.latency_ms,
+            "distribution": self.distribution,
+        }
+
+
+def create_fake_transport() -> FakeLLMTransport:
+    """Fake transport configured from settings"""
+    return FakeLLMTransport(
+        latency_ms=settings.FAKE_LLM_LATENCY_MS,
+        distribution=settings.FAKE_LLM_LATENCY_DISTRIBUTION,
+        spread=settings.FAKE_LLM_LATENCY_SPREAD,
+        token_delay_ms=settings.FAKE_LLM_TOKEN_DELAY_MS,
+        error_rate=settings.FAKE_LLM_ERROR_RATE,
+        error_status_codes=settings.fake_llm_error_status_codes,
+        seed=settings.FAKE_LLM_SEED,
+    )
@@ -0,0 +1,414 @@
+"""
+LLM Gateway
+
+Single entry point for every chat completion the AI services make:
+
+- Per-route model and timeout (settings.OPENAI_MODEL unless overridden)
+- Global and per-route concurrency limits; callers that cannot get a
+  slot within LLM_QUEUE_TIMEOUT_SECONDS are turned away
+- Retries of transient errors with exponential backoff and full jitter;
+  the concurrency slots are given back while backing off
+- Per-route circuit breaker: after repeated provider failures (5xx,
+  408/429, timeouts, connection errors) calls fail immediately, so
+  callers go straight to their fallbacks. Other 4xx responses mean the
+  request was bad, not the provider, and leave the breaker alone
+- Identical concurrent completions (same model, messages and
+  parameters) are coalesced into one upstream call whose result is
+  shared by every waiter
+- Latency, time-to-first-token and error metrics per route, exposed
+  on /health/llm
+
+Every refusal raises LLMUnavailable; the services already catch
+exceptions around their LLM calls and return fallback content.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import openai
+
+from app.core.config import settings
+from app.core.metrics import LatencyHistogram
+from app.services.openai_client import get_openai_client
+
+# Transient failures worth retrying; anything else (bad request, auth) is not
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+# Status codes that say the provider, not the request, is the problem
+PROVIDER_FAILURE_STATUS_CODES = (408, 429)
+
+
+def _is_provider_failure(error: Exception) -> bool:
+    """Whether an error should count against the route's circuit breaker"""
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code >= 500 or error.status_code in PROVIDER_FAILURE_STATUS_CODES
+    # Timeouts, connection errors, broken streams
+    return True
+
+
+class LLMUnavailable(Exception):
+    """Raised when the gateway refuses or gives up on a call"""
+
+
+@dataclass(frozen=True)
+class LLMRoute:
+    """Model and limits for one kind of LLM call"""
+
+    name: str
+    model: str
+    timeout: float
+    max_concurrency: int
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    closed -> open after `failure_threshold` failures in a row; open ->
+    half-open after `reset_timeout`, letting a single probe call through;
+    the probe's outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Give up a half-open probe slot without recording an outcome"""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self._probe_in_flight or self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+
+class RouteStats:
+    """Counters and latency for one route"""
+
+    def __init__(self):
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.retries = 0
+        self.short_circuited = 0
+        self.queue_timeouts = 0
+        self.coalesced = 0
+        self.latency = LatencyHistogram()
+        self.time_to_first_token = LatencyHistogram()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": self.failures,
+            "retries": self.retries,
+            "short_circuited": self.short_circuited,
+            "queue_timeouts": self.queue_timeouts,
+            "coalesced": self.coalesced,
+            "latency_ms": self.latency.snapshot(),
+            "time_to_first_token_ms": self.time_to_first_token.snapshot(),
+        }
+
+
+class LLMGateway:
+    """Routes chat completions through limits, retries and breakers"""
+
+    def __init__(self, routes: List[LLMRoute], max_concurrency: int, coalesce: bool = True):
+        self.routes = {route.name: route for route in routes}
+        self._global = asyncio.Semaphore(max_concurrency)
+        self._route_limits = {route.name: asyncio.Semaphore(route.max_concurrency) for route in routes}
+        self._breakers = {
+            route.name: CircuitBreaker(
+                settings.LLM_BREAKER_FAILURE_THRESHOLD,
+                settings.LLM_BREAKER_RESET_SECONDS,
+            )
+            for route in routes
+        }
+        self._stats = {route.name: RouteStats() for route in routes}
+        self.max_concurrency = max_concurrency
+        self.coalesce = coalesce
+        # request key -> [shared call, number of waiters]
+        self._inflight: Dict[str, List[Any]] = {}
+
+    async def complete(self, route_name: str, messages: List[Dict[str, str]], **params: Any) -> str:
+        """
+        Run a chat completion on the given route
+
+        Args:
+            route_name: One of the configured routes (roadmap, weekly_tasks, chat, insight)
+            messages: Chat messages
+            **params: Extra completion parameters (temperature, max_tokens, response_format)
+
+        Identical concurrent requests share one upstream call; it is only
+        cancelled once every waiter has gone away.
+
+        Returns:
+            Content of the first choice
+
+        Raises:
+            LLMUnavailable: If the circuit is open, no slot frees up in time,
+                or all retries failed
+        """
+        if not self.coalesce:
+            return await self._complete(route_name, messages, params)
+
+        key = _request_key(self.routes[route_name], messages, params)
+        entry = self._inflight.get(key)
+        if entry is None:
+            task = asyncio.create_task(self._complete(route_name, messages, params))
+            entry = self._inflight[key] = [task, 0]
+            task.add_done_callback(lambda _: self._forget(key, entry))
+        else:
+            self._stats[route_name].coalesced += 1
+
+        task = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not task.done():
+                # Nobody left to use the result; later callers start afresh
+                self._forget(key, entry)
+                task.cancel()
+
+    def _forget(self, key: str, entry: List[Any]) -> None:
+        if self._inflight.get(key) is entry:
+            del self._inflight[key]
+
+    async def _complete(self, route_name: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+        async with self._guarded(route_name) as (route, stats, held):
+            response = await self._create_with_retries(route, stats, held, messages, params)
+            return response.choices[0].message.content
+
+    async def stream(
+        self,
+        route_name: str,
+        messages: List[Dict[str, str]],
+        **params: Any
+    ) -> AsyncIterator[str]:
+        """
+        Run a streaming chat completion, yielding content deltas
+
+        The concurrency slot is held until the stream ends. Only opening
+        the stream is retried; once tokens flow, errors are final. If the
+        consumer stops early (client disconnect), the upstream HTTP
+        response is closed, which cancels the generation.
+
+        Raises:
+            LLMUnavailable: Same conditions as complete, or the stream broke
+        """
+        async with self._guarded(route_name) as (route, stats, held):
+            started = time.perf_counter()
+            response = await self._create_with_retries(route, stats, held, messages, {**params, "stream": True})
+            first_token = True
+            try:
+                async for chunk in response:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        if first_token:
+                            stats.time_to_first_token.observe((time.perf_counter() - started) * 1000)
+                            first_token = False
+                        yield delta
+            finally:
+                await response.close()
+
+    @asynccontextmanager
+    async def _guarded(self, route_name: str) -> AsyncIterator[Tuple[LLMRoute, RouteStats, AsyncExitStack]]:
+        """
+        Circuit breaker and metrics around one call, including its retries
+
+        Yields the route, its stats and a stack on which the successful
+        attempt's concurrency slots are kept until the call ends.
+        """
+        route = self.routes[route_name]
+        breaker = self._breakers[route_name]
+        stats = self._stats[route_name]
+        stats.calls += 1
+
+        if not breaker.allow():
+            stats.short_circuited += 1
+            raise LLMUnavailable(f"Circuit open for LLM route '{route_name}'")
+
+        started = time.perf_counter()
+        try:
+            async with AsyncExitStack() as held:
+                try:
+                    yield route, stats, held
+                finally:
+                    stats.latency.observe((time.perf_counter() - started) * 1000)
+        except _QueueTimeout:
+            # Local saturation, not a provider failure
+            stats.queue_timeouts += 1
+            breaker.release_probe()
+            raise LLMUnavailable(f"No free LLM slot for route '{route_name}'") from None
+        except Exception as e:
+            stats.failures += 1
+            if _is_provider_failure(e):
+                breaker.record_failure()
+            else:
+                # The provider answered; the request itself was rejected
+                breaker.release_probe()
+            raise LLMUnavailable(f"LLM route '{route_name}' failed: {type(e).__name__}: {e}") from e
+        except BaseException:
+            # Cancelled (e.g. client went away): no verdict on the provider
+            breaker.release_probe()
+            raise
+
+        stats.successes += 1
+        breaker.record_success()
+
+    @asynccontextmanager
+    async def _slots(self, route_name: str) -> AsyncIterator[None]:
+        """Route and global concurrency slots for one attempt"""
+        async with _acquire(self._route_limits[route_name], settings.LLM_QUEUE_TIMEOUT_SECONDS):
+            async with _acquire(self._global, settings.LLM_QUEUE_TIMEOUT_SECONDS):
+                yield
+
+    async def _create_with_retries(
+        self,
+        route: LLMRoute,
+        stats: RouteStats,
+        held: AsyncExitStack,
+        messages: List[Dict[str, str]],
+        params: Dict[str, Any]
+    ) -> Any:
+        """
+        Create the completion, retrying transient errors
+
+        Each attempt takes its own concurrency slots and gives them back
+        before backing off; the successful attempt's slots move to `held`
+        (a stream keeps them until it ends).
+        """
+        client = get_openai_client()
+        attempt = 0
+        while True:
+            async with AsyncExitStack() as attempt_slots:
+                await attempt_slots.enter_async_context(self._slots(route.name))
+                try:
+                    response = await client.chat.completions.create(
+                        model=route.model,
+                        messages=messages,
+                        timeout=route.timeout,
+                        **params
+                    )
+                    held.push_async_callback(attempt_slots.pop_all().aclose)
+                    return response
+                except RETRYABLE_ERRORS:
+                    if attempt >= settings.LLM_MAX_RETRIES:
+                        raise
+
+            # Full jitter: sleep uniformly in [0, base * 2^attempt], without a slot
+            attempt += 1
+            stats.retries += 1
+            await asyncio.sleep(random.uniform(0, settings.LLM_RETRY_BASE_DELAY_SECONDS * 2 ** attempt))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "coalesce": self.coalesce,
+            "in_flight_requests": len(self._inflight),
+            "routes": {
+                name: {
+                    "model": route.model,
+                    "timeout": route.timeout,
+                    "max_concurrency": route.max_concurrency,
+                    "circuit": self._breakers[name].state,
+                    **self._stats[name].snapshot(),
+                }
+                for name, route in self.routes.items()
+            },
+        }
+
+
+class _QueueTimeout(Exception):
+    """No concurrency slot freed up in time"""
+
+
+class _acquire:
+    """Acquire a semaphore with a timeout, as an async context manager"""
+
+    def __init__(self, semaphore: asyncio.Semaphore, timeout: float):
+        self.semaphore = semaphore
+        self.timeout = timeout
+
+    async def __aenter__(self):
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            raise _QueueTimeout() from None
+
+    async def __aexit__(self, *exc_info):
+        self.semaphore.release()
+
+
+def _request_key(route: LLMRoute, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+    """Hash of everything that determines a completion"""
+    canonical = json.dumps(
+        {"model": route.model, "messages": messages, "params": params},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _route(name: str, model: Optional[str], timeout: float) -> LLMRoute:
+    return LLMRoute(
+        name=name,
+        model=model or settings.OPENAI_MODEL,
+        timeout=timeout,
+        max_concurrency=settings.LLM_ROUTE_MAX_CONCURRENCY,
+    )
+
+
+llm_gateway = LLMGateway(
+    routes=[
+        _route("roadmap", settings.OPENAI_MODEL_ROADMAP, 30.0),
+        _route("weekly_tasks", settings.OPENAI_MODEL_WEEKLY_TASKS, 30.0),
+        _route("chat", settings.OPENAI_MODEL_CHAT, 30.0),
+        _route("insight", settings.OPENAI_MODEL_INSIGHT, 15.0),  # shorter for quick insights
+    ],
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    coalesce=settings.LLM_COALESCE_IDENTICAL_REQUESTS,
+)
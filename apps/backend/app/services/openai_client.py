@@ -0,0 +1,72 @@
+"""
+Shared OpenAI Client
+
+Single AsyncOpenAI instance for all AI services, backed by one keep-alive
+httpx connection pool, so LLM calls never block the event loop and reuse
+TLS connections instead of opening a new one per request.
+
+With LLM_BACKEND=fake the client talks to a local deterministic stand-in
+(app.services.fake_llm) instead of OpenAI, for offline load tests.
+"""
+
+from typing import Any, Dict, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.core.config import settings
+from app.services.fake_llm import FakeLLMTransport, create_fake_transport
+
+# OpenAI client instance (initialized lazily)
+_client: Optional[AsyncOpenAI] = None
+_fake_transport: Optional[FakeLLMTransport] = None
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Get or create the shared AsyncOpenAI client"""
+    global _client, _fake_transport
+    if _client is None and settings.LLM_BACKEND == "fake":
+        print("🧪 Using fake LLM backend (no OpenAI calls)")
+        _fake_transport = create_fake_transport()
+        http_client = httpx.AsyncClient(transport=_fake_transport, timeout=httpx.Timeout(60.0, connect=5.0))
+        _client = AsyncOpenAI(api_key="fake", http_client=http_client, max_retries=0)
+    elif _client is None:
+        if settings.LLM_BACKEND != "openai":
+            raise ValueError(f"Unknown LLM_BACKEND: {settings.LLM_BACKEND}")
+
+        api_key = settings.OPENAI_API_KEY
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY environment variable is not set")
+
+        # Log API key info (first 10 and last 4 characters for security)
+        key_preview = f"{api_key[:10]}...{api_key[-4:]}" if len(api_key) > 14 else "***"
+        print(f"🔑 Initializing OpenAI client with key: {key_preview}")
+
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=httpx.Timeout(60.0, connect=5.0),
+        )
+        # Retries are handled by the LLM gateway
+        _client = AsyncOpenAI(api_key=api_key, http_client=http_client, max_retries=0)
+    return _client
+
+
+async def close_openai_client() -> None:
+    """Close the shared client and its connection pool (application shutdown)"""
+    global _client, _fake_transport
+    if _client is not None:
+        await _client.close()
+        _client = None
+        _fake_transport = None
+
+
+def llm_backend_stats() -> Dict[str, Any]:
+    """Which backend serves completions (plus fake backend counters)"""
+    stats: Dict[str, Any] = {"backend": settings.LLM_BACKEND}
+    if _fake_transport is not None:
+        stats["fake"] = _fake_transport.stats()
+    return stats
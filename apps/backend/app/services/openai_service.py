@@ -6,33 +6,15 @@ This module provides integration with OpenAI API for:
 - AI coach chat functionality
 - Health insights and recommendations
 """
-from typing import Optional, Dict, Any, List
-from openai import OpenAI
+from typing import Optional, Dict, Any, List, AsyncIterator
+from contextlib import aclosing
+from copy import deepcopy
 import json
 
-from app.core.config import settings
+from app.services.llm_gateway import llm_gateway
 
-# OpenAI client instance (initialized lazily)
-_client: Optional[OpenAI] = None
 
-
-def get_openai_client() -> OpenAI:
-    """Get or create OpenAI client instance"""
-    global _client
-    if _client is None:
-        api_key = settings.OPENAI_API_KEY
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY environment variable is not set")
-
-        # Log API key info (first 10 and last 4 characters for security)
-        key_preview = f"{api_key[:10]}...{api_key[-4:]}" if len(api_key) > 14 else "***"
-        print(f"🔑 Initializing OpenAI client with key: {key_preview}")
-
-        _client = OpenAI(api_key=api_key)
-    return _client
-
-
-def generate_health_plan(
+async def generate_health_plan(
     user_data: Dict[str, Any],
     goals: Optional[str] = None
 ) -> Dict[str, Any]:
@@ -87,11 +69,8 @@ Return ONLY a valid JSON object with this exact structure:
 
     try:
         print("🤖 Attempting to generate health plan with OpenAI...")
-        client = get_openai_client()
-        print(f"✅ OpenAI client initialized successfully")
-
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        content = await llm_gateway.complete(
+            "roadmap",
             messages=[
                 {
                     "role": "system",
@@ -104,12 +83,11 @@ Return ONLY a valid JSON object with this exact structure:
             ],
             temperature=0.7,
             max_tokens=1000,
-            response_format={"type": "json_object"},
-            timeout=30.0  # 30 second timeout
+            response_format={"type": "json_object"}
         )
 
         # Parse the response
-        roadmap = json.loads(response.choices[0].message.content)
+        roadmap = json.loads(content)
         print(f"✅ Successfully generated AI health plan with {len(roadmap.get('phases', []))} phases")
         return roadmap
 
@@ -144,22 +122,33 @@ Return ONLY a valid JSON object with this exact structure:
         }
 
 
-def chat_with_coach(
+# Follow-up suggestions (could be enhanced with another API call)
+COACH_SUGGESTIONS = [
+    "How can I improve my routine?",
+    "What should I focus on this week?",
+    "Can you explain this concept more?"
+]
+
+# Response used when the LLM is unavailable or fails
+COACH_FALLBACK = {
+    "response": "I understand your question. As your health coach, I'm here to help you achieve your goals through consistent, sustainable habits. Could you tell me more about what specific aspect you'd like to focus on?",
+    "suggestions": [
+        "How can I improve my morning routine?",
+        "What should I track to measure progress?",
+        "Can you help me with meal planning?"
+    ]
+}
+
+# Daily insight used when the LLM is unavailable or fails
+INSIGHT_FALLBACK = "Every small step counts! Focus on consistency today, and trust the process. Your dedication is building the foundation for lasting change."
+
+
+def _build_coach_messages(
     message: str,
     user_context: Optional[Dict[str, Any]] = None,
     conversation_history: Optional[List[Dict[str, str]]] = None
-) -> Dict[str, Any]:
-    """
-    Chat with AI health coach using OpenAI
-
-    Args:
-        message: User's message
-        user_context: Optional user data for context
-        conversation_history: Previous messages in the conversation
-
-    Returns:
-        Dict containing response and suggestions
-    """
+) -> List[Dict[str, str]]:
+    """Build the chat messages (system prompt, history, user message) for the coach"""
     # Build system prompt
     system_prompt = """You are an empathetic and knowledgeable health and fitness coach.
 Your role is to provide personalized advice, motivation, and guidance.
@@ -189,48 +178,94 @@ Guidelines:
 
     # Add current message
     messages.append({"role": "user", "content": message})
+    return messages
+
+
+async def chat_with_coach(
+    message: str,
+    user_context: Optional[Dict[str, Any]] = None,
+    conversation_history: Optional[List[Dict[str, str]]] = None
+) -> Dict[str, Any]:
+    """
+    Chat with AI health coach using OpenAI
+
+    Args:
+        message: User's message
+        user_context: Optional user data for context
+        conversation_history: Previous messages in the conversation
+
+    Returns:
+        Dict containing response and suggestions
+    """
+    messages = _build_coach_messages(message, user_context, conversation_history)
 
     try:
         print(f"🤖 Processing coach chat message: '{message[:50]}...'")
-        client = get_openai_client()
-
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        coach_response = await llm_gateway.complete(
+            "chat",
             messages=messages,
             temperature=0.8,
-            max_tokens=500,
-            timeout=30.0  # 30 second timeout
+            max_tokens=500
         )
 
-        coach_response = response.choices[0].message.content
         print(f"✅ AI coach response generated successfully")
 
-        # Generate suggestions (could be enhanced with another API call)
-        suggestions = [
-            "How can I improve my routine?",
-            "What should I focus on this week?",
-            "Can you explain this concept more?"
-        ]
-
         return {
             "response": coach_response,
-            "suggestions": suggestions
+            "suggestions": list(COACH_SUGGESTIONS)
         }
 
     except Exception as e:
         print(f"❌ OpenAI chat error: {type(e).__name__}: {e}")
         # Fallback response
-        return {
-            "response": "I understand your question. As your health coach, I'm here to help you achieve your goals through consistent, sustainable habits. Could you tell me more about what specific aspect you'd like to focus on?",
-            "suggestions": [
-                "How can I improve my morning routine?",
-                "What should I track to measure progress?",
-                "Can you help me with meal planning?"
-            ]
-        }
+        return deepcopy(COACH_FALLBACK)
+
+
+async def stream_chat_with_coach(
+    message: str,
+    user_context: Optional[Dict[str, Any]] = None,
+    conversation_history: Optional[List[Dict[str, str]]] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Chat with AI health coach, streaming the response
+
+    Args:
+        message: User's message
+        user_context: Optional user data for context
+        conversation_history: Previous messages in the conversation
+
+    Yields:
+        {"event": "delta", "content": str} for each token delta, then either
+        {"event": "done", "response": str, "suggestions": [...]} or, if the
+        stream fails (even partway), {"event": "fallback", "response": str,
+        "suggestions": [...]} whose response replaces any partial text
+    """
+    messages = _build_coach_messages(message, user_context, conversation_history)
+    parts: List[str] = []
 
+    try:
+        print(f"🤖 Streaming coach chat message: '{message[:50]}...'")
+        # aclosing: if our consumer stops early, close the upstream stream now
+        async with aclosing(llm_gateway.stream(
+            "chat",
+            messages=messages,
+            temperature=0.8,
+            max_tokens=500
+        )) as deltas:
+            async for delta in deltas:
+                parts.append(delta)
+                yield {"event": "delta", "content": delta}
+
+    except Exception as e:
+        print(f"❌ OpenAI chat stream error after {len(parts)} deltas: {type(e).__name__}: {e}")
+        yield {"event": "fallback", **deepcopy(COACH_FALLBACK)}
+        return
+
+    print(f"✅ AI coach response streamed successfully")
+    yield {"event": "done", "response": "".join(parts), "suggestions": list(COACH_SUGGESTIONS)}
 
-def generate_daily_insight(user_data: Dict[str, Any]) -> str:
+
+async def generate_daily_insight(user_data: Dict[str, Any]) -> str:
     """
     Generate a personalized daily insight
 
@@ -257,10 +292,8 @@ Respond with just the insight text, no formatting or extra explanations.
 
     try:
         print("🤖 Generating daily insight with OpenAI...")
-        client = get_openai_client()
-
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        content = await llm_gateway.complete(
+            "insight",
             messages=[
                 {
                     "role": "system",
@@ -272,15 +305,14 @@ Respond with just the insight text, no formatting or extra explanations.
                 }
             ],
             temperature=0.9,
-            max_tokens=100,
-            timeout=15.0  # 15 second timeout (shorter for quick insights)
+            max_tokens=100
         )
 
-        insight = response.choices[0].message.content.strip()
+        insight = content.strip()
         print(f"✅ AI daily insight generated successfully")
         return insight
 
     except Exception as e:
         print(f"❌ OpenAI daily insight error: {type(e).__name__}: {e}")
         # Fallback insight
-        return "Every small step counts! Focus on consistency today, and trust the process. Your dedication is building the foundation for lasting change."
+        return INSIGHT_FALLBACK
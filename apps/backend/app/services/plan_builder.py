@@ -0,0 +1,260 @@
+"""
+Plan Builder
+
+Generates a plan (roadmap + first week of tasks) for a user and saves
+it. Split in two so the slow LLM work never holds a database connection:
+
+- generate_plan_content: LLM calls only, no database access
+- save_plan: one short transaction that replaces the active plan
+
+The first phase is nearly always a "Foundation" phase, so when the
+roadmap is not cached, first-week tasks are generated speculatively for
+a predicted Foundation phase while the roadmap is still being generated,
+and reused if the real first phase turns out compatible: same phase
+name, and goals that cover the same themes (movement, nutrition,
+habits, ...) after light stemming, since LLM goals rarely repeat the
+predicted wording.
+"""
+
+import asyncio
+import re
+from contextlib import suppress
+from datetime import date
+from typing import Any, Dict, List, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.plan import Plan
+from app.models.plan_job import PlanJobKind
+from app.models.task import TaskPriority, TimeOfDay
+from app.core.config import settings
+from app.schemas.plan import PlanCreate
+from app.schemas.task import TaskCreate
+from app.crud import plan as crud_plan
+from app.crud import task as crud_task
+from app.services.ai_engine import generate_roadmap, generate_weekly_tasks, get_cached_roadmap
+
+# Plan title and description per job kind
+PLAN_TEXTS = {
+    PlanJobKind.GENERATE: (
+        "Your Personalized Health Journey",
+        "An AI-generated plan tailored to your goals and fitness level",
+    ),
+    PlanJobKind.REGENERATE: (
+        "Your Regenerated Health Journey",
+        "An updated plan optimized based on your progress",
+    ),
+}
+
+# Map priority string to enum
+PRIORITY_MAP = {
+    'low': TaskPriority.LOW,
+    'medium': TaskPriority.MEDIUM,
+    'high': TaskPriority.HIGH
+}
+
+# Map time_of_day string to enum
+TIME_OF_DAY_MAP = {
+    'morning': TimeOfDay.MORNING,
+    'afternoon': TimeOfDay.AFTERNOON,
+    'evening': TimeOfDay.EVENING,
+    'anytime': TimeOfDay.ANYTIME
+}
+
+
+# Predicted first phase used to start weekly-task generation early
+SPECULATIVE_FIRST_PHASE = {
+    'name': 'Foundation',
+    'goals': ['Establish daily movement habit', 'Track nutrition basics', 'Build consistency']
+}
+
+# Speculation outcomes, reported on /health/llm
+speculation_stats = {"reused": 0, "regenerated": 0, "skipped_cached_roadmap": 0}
+
+_STOPWORDS = {"and", "the", "for", "with", "your", "into", "from", "that", "this", "daily", "weekly"}
+
+_SUFFIXES = ("ing", "ed", "es", "s", "e")
+
+# Keywords (stemmed at import) per goal theme; goals are compared by theme
+GOAL_THEMES = {
+    "movement": {"movement", "move", "activity", "active", "exercise", "walk", "steps", "cardio",
+                 "workout", "mobility", "stretching", "fitness"},
+    "nutrition": {"nutrition", "meal", "food", "diet", "eating", "calories", "protein", "vegetables",
+                  "portion"},
+    "habits": {"habit", "consistency", "consistent", "routine", "baseline", "track", "tracking",
+               "logging"},
+    "hydration": {"hydration", "hydrate", "water"},
+    "sleep": {"sleep", "rest", "recovery"},
+    "strength": {"strength", "muscle", "resistance", "weights"},
+}
+
+
+def user_plan_data(user: Any) -> Dict[str, Any]:
+    """Profile fields used for plan generation"""
+    return {
+        "age": user.age,
+        "gender": user.gender,
+        "current_weight": user.current_weight,
+        "goal_weight": user.goal_weight,
+        "height": user.height,
+        "activity_level": user.activity_level,
+        "goals": user.goals
+    }
+
+
+def _to_task_creates(ai_tasks: List[Dict[str, Any]], start_date: date) -> List[TaskCreate]:
+    """Convert AI tasks to TaskCreate objects"""
+    return [
+        TaskCreate(
+            title=task.get('title', 'Health Task'),
+            description=task.get('description', ''),
+            priority=PRIORITY_MAP.get(task.get('priority', 'medium'), TaskPriority.MEDIUM),
+            scheduled_date=task.get('scheduled_date', start_date),
+            time_of_day=TIME_OF_DAY_MAP.get(task.get('time_of_day', 'anytime'), TimeOfDay.ANYTIME),
+            duration_minutes=task.get('duration_minutes', 30)
+        )
+        for task in ai_tasks
+    ]
+
+
+def _stem(word: str) -> str:
+    """Strip one common suffix ("habits" -> "habit", "walking" -> "walk")"""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            return word[:-len(suffix)]
+    return word
+
+
+_THEME_BY_STEM = {_stem(word): theme for theme, words in GOAL_THEMES.items() for word in words}
+
+
+def _keywords(text: str) -> Set[str]:
+    words = re.findall(r"[a-z]+", text.lower())
+    return {_stem(word) for word in words if len(word) > 3 and word not in _STOPWORDS}
+
+
+def _goal_themes(phase: Dict[str, Any]) -> Set[str]:
+    """Themes of the phase goals; stemmed keywords if none is recognized"""
+    keywords = _keywords(" ".join(str(goal) for goal in phase.get('goals', [])))
+    themes = {_THEME_BY_STEM[word] for word in keywords if word in _THEME_BY_STEM}
+    return themes or keywords
+
+
+def _phase_compatible(speculative: Dict[str, Any], actual: Dict[str, Any]) -> bool:
+    """
+    Whether tasks generated for the speculative phase fit the actual one
+
+    The actual phase name contains the speculative one ("Foundation",
+    "Building Foundations", "Phase 1: Foundation"), and the goal themes
+    overlap enough (Jaccard similarity >= PLAN_SPECULATION_MIN_GOAL_OVERLAP).
+    """
+    if not _keywords(str(speculative.get('name', ''))) <= _keywords(str(actual.get('name', ''))):
+        return False
+
+    expected, found = _goal_themes(speculative), _goal_themes(actual)
+    if not expected or not found:
+        return False
+    return len(expected & found) / len(expected | found) >= settings.PLAN_SPECULATION_MIN_GOAL_OVERLAP
+
+
+async def generate_plan_content(
+    user_data: Dict[str, Any],
+    goals: Any
+) -> Tuple[Dict[str, Any], List[TaskCreate]]:
+    """
+    Generate the roadmap and the first week of tasks (LLM only, no database)
+
+    A cached roadmap is used directly and its tasks generated for the real
+    first phase. Otherwise, with PLAN_SPECULATIVE_TASKS, weekly tasks for
+    SPECULATIVE_FIRST_PHASE are generated concurrently with the roadmap;
+    if the real first phase is compatible they are used as-is, otherwise
+    they are discarded and tasks are generated for the real phase.
+
+    Args:
+        user_data: Output of user_plan_data
+        goals: User's goals
+
+    Returns:
+        (roadmap, tasks starting today)
+    """
+    start_date = date.today()
+
+    def weekly_tasks(phase: Dict[str, Any]):
+        return generate_weekly_tasks(
+            user_data=user_data,
+            phase=phase,
+            week_number=1,
+            start_date=start_date
+        )
+
+    # A cached roadmap is known right away: nothing to speculate about
+    cached_roadmap = get_cached_roadmap(user_data, goals)
+
+    speculative = None
+    if settings.PLAN_SPECULATIVE_TASKS:
+        if cached_roadmap is None:
+            speculative = asyncio.create_task(weekly_tasks(SPECULATIVE_FIRST_PHASE))
+        else:
+            speculation_stats["skipped_cached_roadmap"] += 1
+
+    try:
+        ai_roadmap = cached_roadmap
+        if ai_roadmap is None:
+            # Generate AI-powered roadmap using AI Engine with safety rules
+            ai_roadmap = await generate_roadmap(user_data, goals, check_cache=False)
+
+        # Get first phase for task generation
+        first_phase = ai_roadmap.get('phases', [])[0] if ai_roadmap.get('phases') else {
+            'name': 'Foundation',
+            'goals': ['Establish baseline habits']
+        }
+
+        if speculative is not None and _phase_compatible(SPECULATIVE_FIRST_PHASE, first_phase):
+            ai_tasks = await speculative
+            speculation_stats["reused"] += 1
+        else:
+            if speculative is not None:
+                speculative.cancel()
+                speculation_stats["regenerated"] += 1
+            # Generate AI-powered weekly tasks (7 days) starting today
+            ai_tasks = await weekly_tasks(first_phase)
+    finally:
+        if speculative is not None and not speculative.done():
+            speculative.cancel()
+            with suppress(asyncio.CancelledError):
+                await speculative
+
+    return ai_roadmap, _to_task_creates(ai_tasks, start_date)
+
+
+async def save_plan(
+    db: AsyncSession,
+    user_id: int,
+    kind: PlanJobKind,
+    roadmap: Dict[str, Any],
+    tasks: List[TaskCreate]
+) -> Plan:
+    """
+    Replace the user's active plan with a new one and its tasks
+
+    Args:
+        db: Database session (caller commits)
+        user_id: Plan owner
+        kind: Generate or regenerate (sets title and description)
+        roadmap: Generated roadmap
+        tasks: Tasks for the new plan
+
+    Returns:
+        Created plan
+    """
+    # Deactivate all existing plans
+    await crud_plan.deactivate_user_plans(db, user_id)
+
+    title, description = PLAN_TEXTS[kind]
+    plan_in = PlanCreate(title=title, description=description, roadmap=roadmap)
+    db_plan = await crud_plan.create_plan(db, user_id, plan_in)
+
+    # Create all tasks in one multi-row INSERT
+    await crud_task.create_tasks(db, db_plan.id, tasks)
+
+    return db_plan
@@ -0,0 +1,274 @@
+"""
+Plan Generation Jobs
+
+Plan generation takes two LLM calls (up to a minute), so the
+endpoints only enqueue a job and return 202; a worker pool generates and
+saves the plan. Job state lives in the plan_jobs table for both backends,
+so clients poll the same status endpoint either way.
+
+Backends (PLAN_JOB_BACKEND):
+- inprocess: jobs are handed to local workers through an asyncio queue.
+  Simple and dependency-free (tests, single process). The local queue
+  dies with the process, so on start every pending row is an orphan of
+  the previous run: running ones are requeued (or failed after
+  PLAN_JOB_MAX_ATTEMPTS) and queued ones handed to the local workers
+- database: plan_jobs is the durable queue. Workers in every process
+  claim rows with SELECT ... FOR UPDATE SKIP LOCKED; jobs whose worker
+  died are requeued after PLAN_JOB_STALE_AFTER_SECONDS
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.metrics import LatencyHistogram
+from app.crud import plan_job as crud_plan_job
+from app.crud import user as crud_user
+from app.models.plan_job import PlanJob, PlanJobKind
+from app.services.plan_builder import generate_plan_content, save_plan, user_plan_data
+
+
+class _Superseded(Exception):
+    """Stale recovery requeued or failed the job while this attempt ran"""
+
+
+class PlanJobRunner:
+    """Worker pool executing plan generation jobs"""
+
+    def __init__(
+        self,
+        backend: str,
+        workers: int,
+        poll_interval: float,
+        stale_after: float,
+        max_attempts: int
+    ):
+        if backend not in ("inprocess", "database"):
+            raise ValueError(f"Unknown PLAN_JOB_BACKEND: {backend}")
+        self.backend = backend
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self._session_factory: Optional[async_sessionmaker] = None
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._wake = asyncio.Event()
+        # job ID -> event set when this process finishes the job, and
+        # the number of get_job calls waiting on it
+        self._finished: Dict[str, asyncio.Event] = {}
+        self._pollers: Dict[str, int] = {}
+        self._tasks: List[asyncio.Task] = []
+        self.running = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.superseded = 0
+        self.duration = LatencyHistogram()
+
+    async def submit(self, db: AsyncSession, user_id: int, kind: PlanJobKind) -> PlanJob:
+        """
+        Create a job for the user, or return the one already pending
+
+        The job row is committed with the request; call notify(job.id)
+        after the response (e.g. as a background task) to start it.
+        """
+        while True:
+            job = await crud_plan_job.create_job(db, user_id, kind)
+            if job is not None:
+                return job
+            # Lost to a pending job; it may finish before we read it, then retry
+            pending = await crud_plan_job.get_pending_job(db, user_id)
+            if pending is not None:
+                return pending
+
+    def notify(self, job_id: str) -> None:
+        """Tell local workers that a committed job is waiting"""
+        if self.backend == "inprocess":
+            self._queue.put_nowait(job_id)
+        else:
+            self._wake.set()
+
+    async def get_job(self, user_id: int, job_id: str, wait: float = 0.0) -> Optional[PlanJob]:
+        """
+        Get a user's job, optionally long-polling until it finishes
+
+        Args:
+            user_id: Job owner
+            job_id: Job ID
+            wait: Seconds to wait for a queued/running job to finish
+
+        Returns:
+            The job (possibly still pending when wait runs out), or None
+        """
+        deadline = time.monotonic() + wait
+        self._pollers[job_id] = self._pollers.get(job_id, 0) + 1
+        try:
+            while True:
+                # Short sessions: no connection is held while waiting
+                async with self._session_factory() as db:
+                    job = await crud_plan_job.get_job(db, job_id, user_id)
+
+                if job is None or job.status not in crud_plan_job.PENDING_STATUSES:
+                    return job
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return job
+
+                # Woken early if this process runs the job; otherwise re-check periodically
+                event = self._finished.setdefault(job_id, asyncio.Event())
+                try:
+                    await asyncio.wait_for(event.wait(), min(remaining, self.poll_interval))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            # The last poller to leave (done, timed out or cancelled) drops the event
+            self._pollers[job_id] -= 1
+            if not self._pollers[job_id]:
+                del self._pollers[job_id]
+                self._finished.pop(job_id, None)
+
+    def start(self, session_factory: async_sessionmaker) -> None:
+        """Start the worker pool on the running event loop"""
+        self._session_factory = session_factory
+        if self._tasks:
+            return
+        for _ in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker()))
+        self._tasks.append(asyncio.create_task(self._recover_stale_loop()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                job = await self._next_job()
+                if job is not None:
+                    await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Plan job worker error: {type(e).__name__}: {e}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def _next_job(self) -> Optional[PlanJob]:
+        if self.backend == "inprocess":
+            job_id = await self._queue.get()
+            async with self._session_factory() as db:
+                job = await crud_plan_job.start_job(db, job_id)
+                await db.commit()
+            return job
+
+        async with self._session_factory() as db:
+            job = await crud_plan_job.claim_next_job(db)
+            await db.commit()
+        if job is None:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+        return job
+
+    async def _run(self, job: PlanJob) -> None:
+        """Generate and save the plan for a claimed job"""
+        started = time.perf_counter()
+        self.running += 1
+        print(f"🤖 Plan job {job.id} ({job.kind.value}) started for user {job.user_id}")
+        try:
+            async with self._session_factory() as db:
+                user = await crud_user.get_user_by_id(db, job.user_id)
+            if user is None or not user.is_active:
+                raise ValueError("User not found or inactive")
+
+            # LLM calls run without a database connection
+            roadmap, tasks = await generate_plan_content(user_plan_data(user), user.goals)
+
+            async with self._session_factory() as db:
+                plan = await save_plan(db, job.user_id, job.kind, roadmap, tasks)
+                # If recovery took the job away meanwhile, the plan is rolled back
+                if not await crud_plan_job.finish_job(db, job.id, job.attempts, plan_id=plan.id):
+                    raise _Superseded()
+                await db.commit()
+
+            self.succeeded += 1
+            print(f"✅ Plan job {job.id} finished: plan {plan.id}")
+        except asyncio.CancelledError:
+            raise
+        except _Superseded:
+            self.superseded += 1
+            print(f"⚠️ Plan job {job.id} attempt {job.attempts} was superseded; result discarded")
+        except Exception as e:
+            self.failed += 1
+            print(f"❌ Plan job {job.id} failed: {type(e).__name__}: {e}")
+            async with self._session_factory() as db:
+                await crud_plan_job.finish_job(db, job.id, job.attempts, error=f"{type(e).__name__}: {e}")
+                await db.commit()
+        finally:
+            self.running -= 1
+            self.duration.observe((time.perf_counter() - started) * 1000)
+            event = self._finished.pop(job.id, None)
+            if event is not None:
+                event.set()
+
+    async def _recover_stale_loop(self) -> None:
+        # In-process, nothing pending at start can be running or queued
+        # locally: recover all of it on the first pass
+        stale_after = 0.0 if self.backend == "inprocess" else self.stale_after
+        while True:
+            try:
+                await self._recover_stale(timedelta(seconds=stale_after))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Stale plan job recovery failed: {type(e).__name__}: {e}")
+            stale_after = self.stale_after
+            await asyncio.sleep(self.stale_after / 2)
+
+    async def _recover_stale(self, stale_after: timedelta) -> None:
+        """Requeue or fail stale running jobs; in-process, also enqueue orphaned queued jobs"""
+        cutoff = datetime.utcnow() - stale_after
+        async with self._session_factory() as db:
+            recovered = await crud_plan_job.recover_stale_jobs(db, stale_after, self.max_attempts)
+            orphaned: List[str] = []
+            if self.backend == "inprocess":
+                # Includes the jobs just requeued; workers skip any already started
+                orphaned = await crud_plan_job.get_queued_job_ids(db, created_before=cutoff)
+            await db.commit()
+
+        if recovered:
+            print(f"⚠️ Recovered {recovered} stale plan jobs")
+        if orphaned:
+            print(f"⚠️ Requeued {len(orphaned)} orphaned plan jobs locally")
+        for job_id in orphaned:
+            self._queue.put_nowait(job_id)
+        if recovered:
+            self._wake.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "workers": self.workers,
+            "local_queue": self._queue.qsize(),
+            "running": self.running,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "superseded": self.superseded,
+            "duration_ms": self.duration.snapshot(),
+        }
+
+
+plan_job_runner = PlanJobRunner(
+    backend=settings.PLAN_JOB_BACKEND,
+    workers=settings.PLAN_JOB_WORKERS,
+    poll_interval=settings.PLAN_JOB_POLL_INTERVAL_SECONDS,
+    stale_after=settings.PLAN_JOB_STALE_AFTER_SECONDS,
+    max_attempts=settings.PLAN_JOB_MAX_ATTEMPTS,
+)
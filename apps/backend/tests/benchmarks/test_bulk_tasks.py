@@ -0,0 +1,69 @@
+"""
+Saving a generated 12-week plan: one create_task per row vs create_tasks
+
+    pytest -m benchmark -s tests/benchmarks/test_bulk_tasks.py
+"""
+
+import time
+from datetime import date, timedelta
+from typing import List
+
+import pytest
+
+from app.crud import plan as crud_plan
+from app.crud import task as crud_task
+from app.schemas.plan import PlanCreate
+from app.schemas.task import TaskCreate
+
+pytestmark = pytest.mark.benchmark
+
+WEEKS = 12
+TASKS_PER_WEEK = 28
+ROUNDS = 5
+
+
+def _twelve_week_tasks() -> List[TaskCreate]:
+    start = date(2026, 1, 5)
+    return [
+        TaskCreate(
+            title=f"Week {week + 1} task {i + 1}",
+            description="Generated task",
+            scheduled_date=start + timedelta(days=week * 7 + i // 4),
+            duration_minutes=30,
+        )
+        for week in range(WEEKS)
+        for i in range(TASKS_PER_WEEK)
+    ]
+
+
+async def test_bulk_vs_per_row_insert(session_factory, user, statements):
+    tasks_in = _twelve_week_tasks()
+
+    async def per_row(db, plan_id):
+        for task_in in tasks_in:
+            await crud_task.create_task(db, plan_id, task_in)
+
+    async def bulk(db, plan_id):
+        await crud_task.create_tasks(db, plan_id, tasks_in)
+
+    results = {}
+    for name, save in [("create_task per row", per_row), ("create_tasks", bulk)]:
+        timings = []
+        for _ in range(ROUNDS):
+            async with session_factory() as db:
+                await crud_plan.deactivate_user_plans(db, user.id)
+                plan = await crud_plan.create_plan(db, user.id, PlanCreate(title="Plan"))
+                statements.clear()
+                start = time.perf_counter()
+                await save(db, plan.id)
+                await db.commit()
+                timings.append((time.perf_counter() - start) * 1000)
+                round_trips = len(statements)
+        results[name] = (min(timings), sorted(timings)[len(timings) // 2], round_trips)
+
+    print(f"\nSaving {len(tasks_in)} tasks ({WEEKS} weeks), best/median of {ROUNDS}:")
+    for name, (best, median, round_trips) in results.items():
+        print(f"  {name:22s} {best:8.1f} ms {median:8.1f} ms {round_trips:5d} statements")
+
+    assert results["create_tasks"][2] == 1
+    assert results["create_tasks"][1] < results["create_task per row"][1]
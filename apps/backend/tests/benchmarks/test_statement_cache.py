@@ -0,0 +1,89 @@
+"""
+Per-request statement overhead of the hot auth lookup
+
+get_user_by_id runs on every authenticated request. Compares, per call:
+- compiling the SELECT every time (SQLAlchemy compiled cache disabled)
+- select() with the compiled cache (cache key rebuilt on each call)
+- lambda_stmt, as in app.crud.user (statement built and keyed once)
+and the asyncpg prepared-statement cache on and off (PgBouncer
+transaction mode).
+
+    pytest -m benchmark -s tests/benchmarks/test_statement_cache.py
+"""
+
+import time
+from typing import Awaitable, Callable
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.crud import user as crud_user
+from app.models.user import User
+from tests.conftest import TEST_DATABASE_URL
+
+pytestmark = pytest.mark.benchmark
+
+CALLS = 2000
+
+
+async def _per_call_us(db: AsyncSession, lookup: Callable[[AsyncSession], Awaitable[object]]) -> float:
+    for _ in range(50):
+        await lookup(db)
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        await lookup(db)
+    return (time.perf_counter() - start) / CALLS * 1e6
+
+
+async def test_compiled_statement_cache(db_engine, user):
+    user_id = user.id
+
+    async def plain_select(db):
+        return (await db.execute(select(User).where(User.id == user_id))).scalar_one()
+
+    async def lambda_lookup(db):
+        return await crud_user.get_user_by_id(db, user_id)
+
+    # query_cache_size=0: every execution compiles the statement again
+    uncached_engine = create_async_engine(TEST_DATABASE_URL, query_cache_size=0)
+    try:
+        async with AsyncSession(uncached_engine) as db:
+            uncached_us = await _per_call_us(db, plain_select)
+    finally:
+        await uncached_engine.dispose()
+
+    async with AsyncSession(db_engine) as db:
+        results = {
+            "compiled every call": uncached_us,
+            "select() + compiled cache": await _per_call_us(db, plain_select),
+            "lambda_stmt": await _per_call_us(db, lambda_lookup),
+        }
+
+    print(f"\nget_user_by_id, {CALLS} calls on one connection (us/call incl. round trip):")
+    for name, us in results.items():
+        print(f"  {name:28s} {us:8.1f}")
+
+    assert results["lambda_stmt"] < results["compiled every call"]
+
+
+async def test_prepared_statement_cache(user):
+    user_id = user.id
+    results = {}
+    for name, connect_args in [
+        ("asyncpg cache off (PgBouncer)", {"statement_cache_size": 0, "prepared_statement_cache_size": 0}),
+        ("asyncpg cache on", {"prepared_statement_cache_size": 100}),
+    ]:
+        engine = create_async_engine(TEST_DATABASE_URL, poolclass=AsyncAdaptedQueuePool, connect_args=connect_args)
+        try:
+            async with AsyncSession(engine) as db:
+                results[name] = await _per_call_us(db, lambda db: crud_user.get_user_by_id(db, user_id))
+        finally:
+            await engine.dispose()
+
+    print(f"\nget_user_by_id, {CALLS} calls (us/call incl. round trip):")
+    for name, us in results.items():
+        print(f"  {name:30s} {us:8.1f}")
+
+    assert results["asyncpg cache on"] < results["asyncpg cache off (PgBouncer)"]
@@ -0,0 +1,154 @@
+"""
+Shared test fixtures
+
+Settings are read at import time, so the environment is prepared before
+anything from `app` is imported. Database tests run against a real
+PostgreSQL database (the CRUD layer relies on ON CONFLICT, RETURNING,
+partial indexes and advisory locks) given by TEST_DATABASE_URL, e.g.
+
+    TEST_DATABASE_URL=postgresql+asyncpg://postgres@localhost/healthlife_test pytest
+
+and are skipped when it is not set. The schema is created from the
+models and all tables are truncated after each test.
+"""
+
+import os
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("OPENAI_API_KEY", "test-openai-key")
+os.environ.setdefault(
+    "DATABASE_URL",
+    os.environ.get("TEST_DATABASE_URL", "postgresql+asyncpg://postgres@localhost/healthlife_test"),
+)
+# Background loops are started explicitly by the tests that need them
+os.environ.setdefault("INSIGHT_PRECOMPUTE_ENABLED", "false")
+
+from typing import Any, AsyncIterator, List, Tuple
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.models import Base
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+@pytest.fixture
+async def db_engine() -> AsyncIterator[AsyncEngine]:
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        yield engine
+    finally:
+        tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+        async with engine.begin() as conn:
+            await conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+        await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(db_engine: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
+
+@pytest.fixture
+async def db(session_factory: async_sessionmaker) -> AsyncIterator[AsyncSession]:
+    async with session_factory() as session:
+        yield session
+
+
+@pytest.fixture
+async def user(session_factory: async_sessionmaker):
+    """A committed active user"""
+    from app.models.user import User
+
+    async with session_factory() as session:
+        db_user = User(email="test@example.com", hashed_password="not-a-real-hash", goals='["lose weight"]')
+        session.add(db_user)
+        await session.commit()
+        return db_user
+
+
+@pytest.fixture
+def statements(db_engine: AsyncEngine) -> List[Tuple[str, Any]]:
+    """(statement, parameters) of every query sent to the database during the test"""
+    recorded: List[Tuple[str, Any]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append((statement, parameters))
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield recorded
+    finally:
+        event.remove(db_engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+async def client(session_factory: async_sessionmaker) -> AsyncIterator[Any]:
+    """HTTP client for the app, with its sessions on the test database"""
+    import httpx
+
+    from app.db.session import get_db, get_read_db
+    from app.main import app
+
+    async def test_get_db() -> AsyncIterator[AsyncSession]:
+        # Same single commit point as app.db.session.get_db
+        async with session_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    async def test_get_read_db() -> AsyncIterator[AsyncSession]:
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = test_get_db
+    app.dependency_overrides[get_read_db] = test_get_read_db
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            yield http
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def auth_headers(user) -> dict:
+    from app.core.security import create_access_token
+
+    return {"Authorization": f"Bearer {create_access_token(user.id)}"}
+
+
+@pytest.fixture
+async def fake_llm(monkeypatch) -> AsyncIterator[Any]:
+    """Shared OpenAI client backed by the fake LLM transport (fixed latency, no errors)"""
+    import httpx
+    from openai import AsyncOpenAI
+
+    from app.services import openai_client
+    from app.services.fake_llm import FakeLLMTransport
+
+    transport = FakeLLMTransport(
+        latency_ms=200.0,
+        distribution="fixed",
+        spread=0.0,
+        token_delay_ms=1.0,
+        error_rate=0.0,
+        error_status_codes=[500],
+        seed=0,
+    )
+    client = AsyncOpenAI(api_key="fake", http_client=httpx.AsyncClient(transport=transport), max_retries=0)
+    monkeypatch.setattr(openai_client, "_client", client)
+    try:
+        yield transport
+    finally:
+        await client.close()
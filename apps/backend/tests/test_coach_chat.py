@@ -0,0 +1,44 @@
+"""Concurrent coach chats wait on the LLM together instead of one after another"""
+
+import asyncio
+import time
+
+from app.services.openai_service import COACH_FALLBACK
+
+CHATS = 8
+
+
+async def test_concurrent_chats_overlap(client, auth_headers, fake_llm):
+    # Long enough that request overhead (auth, sessions) is small next to it
+    fake_llm.latency_ms = 1000.0
+    latency = fake_llm.latency_ms / 1000
+    in_flight = peak = 0
+    handle = fake_llm.handle_async_request
+
+    async def counting_handle(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            return await handle(request)
+        finally:
+            in_flight -= 1
+
+    fake_llm.handle_async_request = counting_handle
+
+    async def chat(i: int):
+        # Distinct messages, so the gateway does not coalesce them
+        return await client.post(
+            "/api/v1/coach/chat", headers=auth_headers, json={"message": f"How do I stay motivated? ({i})"}
+        )
+
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(chat(i) for i in range(CHATS)))
+    elapsed = time.perf_counter() - start
+
+    assert [r.status_code for r in responses] == [200] * CHATS
+    assert all(r.json()["response"] != COACH_FALLBACK["response"] for r in responses)
+    assert fake_llm.requests == CHATS
+    # A blocking client would keep one call upstream at a time
+    assert peak == CHATS
+    assert elapsed < latency * CHATS / 2, f"{CHATS} chats took {elapsed:.2f}s at {latency:.2f}s each"
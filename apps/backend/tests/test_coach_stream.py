@@ -0,0 +1,139 @@
+"""SSE coach chat: delta and done frames, fallback, upstream cancellation"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Tuple
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services import openai_service
+from app.services.llm_gateway import LLMGateway, _route
+from app.services.openai_service import COACH_FALLBACK
+
+STREAM_PATH = "/api/v1/coach/chat/stream"
+
+
+@pytest.fixture(autouse=True)
+def gateway(monkeypatch) -> LLMGateway:
+    """Fresh gateway, so failures here do not open the shared chat breaker"""
+    gateway = LLMGateway(routes=[_route("chat", None, 5.0)], max_concurrency=8)
+    monkeypatch.setattr(openai_service, "llm_gateway", gateway)
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 0)
+    return gateway
+
+
+def _events(body: str) -> List[Tuple[str, Dict[str, Any]]]:
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+async def test_delta_frames_then_done(client, auth_headers, fake_llm):
+    response = await client.post(STREAM_PATH, headers=auth_headers, json={"message": "How do I stay motivated?"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    names = [name for name, _ in events]
+    assert names[-1] == "done" and set(names[:-1]) == {"delta"} and len(names) > 3
+
+    done = events[-1][1]
+    assert done["response"] == "".join(data["content"] for _, data in events[:-1])
+    assert done["suggestions"] and done["timestamp"]
+
+
+async def test_fallback_when_provider_fails_midstream(client, auth_headers, fake_llm):
+    stream = fake_llm._stream
+
+    async def broken_stream(*args):
+        sent = 0
+        async for chunk in stream(*args):
+            if sent == 3:
+                raise httpx.ReadError("upstream connection reset")
+            sent += 1
+            yield chunk
+
+    fake_llm._stream = broken_stream
+    response = await client.post(STREAM_PATH, headers=auth_headers, json={"message": "How do I stay motivated?"})
+
+    events = _events(response.text)
+    assert [name for name, _ in events][-1] == "fallback"
+    assert any(name == "delta" for name, _ in events)
+    assert events[-1][1]["response"] == COACH_FALLBACK["response"]
+
+
+async def test_fallback_when_provider_rejects(client, auth_headers, fake_llm, gateway):
+    fake_llm.error_rate = 1.0
+    fake_llm.error_status_codes = [503]
+
+    response = await client.post(STREAM_PATH, headers=auth_headers, json={"message": "How do I stay motivated?"})
+
+    assert [name for name, _ in _events(response.text)] == ["fallback"]
+    assert gateway.stats()["routes"]["chat"]["failures"] == 1
+
+
+async def test_client_disconnect_cancels_upstream(client, auth_headers, fake_llm):
+    from app.main import app
+
+    # Slow tokens: the reply would take seconds to stream in full
+    fake_llm.token_delay_ms = 200.0
+    upstream = {"chunks": 0, "closed": False}
+    stream = fake_llm._stream
+
+    async def tracked_stream(*args):
+        try:
+            async for chunk in stream(*args):
+                upstream["chunks"] += 1
+                yield chunk
+        finally:
+            upstream["closed"] = True
+
+    fake_llm._stream = tracked_stream
+
+    body = json.dumps({"message": "How do I stay motivated?"}).encode()
+    requests = [{"type": "http.request", "body": body, "more_body": False}]
+    disconnected = asyncio.Event()
+    frames: List[bytes] = []
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            frames.append(message["body"])
+            # Leave after the first two deltas
+            if len(frames) == 2:
+                disconnected.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": STREAM_PATH,
+        "raw_path": STREAM_PATH.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"test"),
+            (b"content-type", b"application/json"),
+            *[(key.lower().encode(), value.encode()) for key, value in auth_headers.items()],
+        ],
+        "client": ("127.0.0.1", 1234),
+        "server": ("test", 80),
+    }
+    await asyncio.wait_for(app(scope, receive, send), timeout=2)
+    await asyncio.sleep(0.3)
+
+    assert upstream["closed"]
+    assert len(frames) <= 3
+    # Upstream stopped within a token of the disconnect, far from the whole reply
+    assert upstream["chunks"] <= 5
@@ -0,0 +1,91 @@
+"""Single-flight insight generation and the precompute batch lock"""
+
+import asyncio
+
+from sqlalchemy import func, select, text
+
+from app.crud import coach_insight as crud_insight
+from app.services import daily_insights as daily_insights_module
+from app.services.daily_insights import DailyInsightService
+
+MESSAGE = "Small wins compound."
+
+
+def _service(session_factory) -> DailyInsightService:
+    service = DailyInsightService(
+        timezone="UTC",
+        precompute_enabled=False,
+        concurrency=4,
+        batch_size=10,
+        interval=60,
+        active_days=7,
+        retention_days=30,
+    )
+    service.start(session_factory)
+    return service
+
+
+async def test_concurrent_misses_share_one_generation(session_factory, user, monkeypatch):
+    calls = []
+    release = asyncio.Event()
+
+    async def generate(user_data):
+        calls.append(user_data)
+        await release.wait()
+        return MESSAGE
+
+    monkeypatch.setattr(daily_insights_module, "generate_daily_insight", generate)
+    service = _service(session_factory)
+    day = service.today()
+
+    waiters = [asyncio.create_task(service.get_or_generate(user.id, {}, day)) for _ in range(5)]
+    await asyncio.sleep(0.01)
+    # A caller going away does not cancel the generation the others wait on
+    waiters[0].cancel()
+    release.set()
+    results = await asyncio.gather(*waiters[1:])
+
+    assert results == [MESSAGE] * 4
+    assert len(calls) == 1
+    assert service.stats()["coalesced"] == 4
+    assert service.stats()["in_flight"] == 0
+    async with session_factory() as db:
+        assert await crud_insight.get_insight(db, user.id, day) == MESSAGE
+
+
+async def test_precompute_skipped_while_locked(session_factory, db_engine):
+    service = _service(session_factory)
+
+    async with db_engine.connect() as other:
+        assert (await other.execute(select(func.pg_try_advisory_lock(crud_insight.PRECOMPUTE_LOCK_KEY)))).scalar_one()
+        try:
+            assert await service.precompute() == 0
+        finally:
+            await other.execute(select(func.pg_advisory_unlock(crud_insight.PRECOMPUTE_LOCK_KEY)))
+
+
+async def test_precompute_lock_holds_no_transaction(session_factory, db_engine, monkeypatch):
+    service = _service(session_factory)
+    holder_states = []
+    get_users = crud_insight.get_users_missing_insight
+
+    async def observe_lock_holder(db, *args, **kwargs):
+        result = await db.execute(
+            text(
+                "SELECT a.state FROM pg_locks l JOIN pg_stat_activity a ON a.pid = l.pid "
+                "WHERE l.locktype = 'advisory' AND l.objid = :key AND l.granted"
+            ),
+            {"key": crud_insight.PRECOMPUTE_LOCK_KEY},
+        )
+        holder_states.extend(result.scalars().all())
+        return await get_users(db, *args, **kwargs)
+
+    monkeypatch.setattr(crud_insight, "get_users_missing_insight", observe_lock_holder)
+    assert await service.precompute() == 0
+
+    # Held by exactly one idle connection, not an open transaction
+    assert holder_states == ["idle"]
+    # Released once the batch is done
+    async with db_engine.connect() as other:
+        assert (await other.execute(select(func.pg_try_advisory_lock(crud_insight.PRECOMPUTE_LOCK_KEY)))).scalar_one()
+        await other.execute(select(func.pg_advisory_unlock(crud_insight.PRECOMPUTE_LOCK_KEY)))
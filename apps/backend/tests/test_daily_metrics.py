@@ -0,0 +1,92 @@
+"""Concurrent upserts of daily metrics, the completion counter and the streak"""
+
+import asyncio
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+
+from app.crud import daily_metric as crud_metric
+from app.models.daily_metric import DailyMetric
+from app.models.user_streak import UserStreak
+from app.schemas.daily_metric import DailyMetricCreate
+
+COMPLETIONS = 300
+# Below max_connections: every completion runs in its own transaction
+CONCURRENCY = 40
+
+
+async def _concurrently(session_factory, count: int, write) -> None:
+    """Run write(db, i) count times, each in its own committed transaction"""
+    gate = asyncio.Semaphore(CONCURRENCY)
+
+    async def one(i: int) -> None:
+        async with gate, session_factory() as db:
+            await write(db, i)
+            await db.commit()
+
+    await asyncio.gather(*(one(i) for i in range(count)))
+
+
+async def test_parallel_completions_are_counted_exactly(session_factory, user):
+    today = date.today()
+
+    async def complete(db, i):
+        await crud_metric.increment_tasks_completed(db, user.id, today, exercise_minutes=10 if i % 2 else 0)
+
+    await _concurrently(session_factory, COMPLETIONS, complete)
+
+    async with session_factory() as db:
+        rows = (await db.execute(select(DailyMetric).where(DailyMetric.user_id == user.id))).scalars().all()
+        assert len(rows) == 1
+        assert rows[0].tasks_completed == COMPLETIONS
+        assert rows[0].exercise_minutes == 10 * (COMPLETIONS // 2)
+
+
+async def test_parallel_metric_upserts_keep_one_row(session_factory, user):
+    today = date.today()
+
+    async def log(db, i):
+        # Half the requests log energy, half log sleep; nothing else is sent
+        if i % 2:
+            metric = DailyMetricCreate(date=today, energy_level=i % 100)
+        else:
+            metric = DailyMetricCreate(date=today, hours_slept=7.5)
+        await crud_metric.create_or_update_metric(db, user.id, metric)
+
+    async def complete(db, i):
+        await crud_metric.increment_tasks_completed(db, user.id, today)
+
+    await asyncio.gather(
+        _concurrently(session_factory, 100, log),
+        _concurrently(session_factory, 100, complete),
+    )
+
+    async with session_factory() as db:
+        rows = (await db.execute(select(DailyMetric).where(DailyMetric.user_id == user.id))).scalars().all()
+        assert len(rows) == 1
+        assert rows[0].hours_slept == 7.5
+        assert rows[0].energy_level is not None
+        assert rows[0].tasks_completed == 100
+
+
+async def test_streak_matches_recomputation_under_concurrency(session_factory, user):
+    today = date.today()
+    # Five consecutive active days ending today, plus an older, separate run
+    days = [today - timedelta(days=offset) for offset in range(5)] + [today - timedelta(days=9)]
+
+    async def complete(db, i):
+        await crud_metric.increment_tasks_completed(db, user.id, days[i % len(days)])
+
+    await _concurrently(session_factory, len(days) * 20, complete)
+
+    async with session_factory() as db:
+        state = await db.get(UserStreak, user.id)
+        assert state.current_streak == 5
+        assert state.streak_anchor_date == today
+        assert state.longest_streak == 5
+        assert await crud_metric.get_streak(db, user.id) == 5
+        assert await crud_metric._calculate_streak(db, user.id, today) == 5
+        total = (await db.execute(
+            select(func.sum(DailyMetric.tasks_completed)).where(DailyMetric.user_id == user.id)
+        )).scalar_one()
+        assert total == len(days) * 20
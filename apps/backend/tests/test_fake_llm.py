@@ -0,0 +1,72 @@
+"""The fake LLM backend speaks the chat-completions API the SDK expects"""
+
+import json
+
+import openai
+import pytest
+
+from app.core.config import Settings
+from app.services.openai_client import get_openai_client
+
+MESSAGES = [
+    {"role": "system", "content": "You are a supportive health coach."},
+    {"role": "user", "content": "How do I stay motivated?"},
+]
+
+
+def test_error_status_codes_from_env(monkeypatch):
+    monkeypatch.setenv("FAKE_LLM_ERROR_STATUS_CODES", "429, 503")
+    assert Settings().fake_llm_error_status_codes == [429, 503]
+
+
+async def test_completion_round_trip(fake_llm):
+    client = get_openai_client()
+
+    first = await client.chat.completions.create(model="gpt-4o-mini", messages=MESSAGES)
+    second = await client.chat.completions.create(model="gpt-4o-mini", messages=MESSAGES)
+
+    assert first.choices[0].message.content
+    assert first.choices[0].finish_reason == "stop"
+    assert first.usage.total_tokens == first.usage.prompt_tokens + first.usage.completion_tokens
+    # Deterministic for a given request
+    assert second.choices[0].message.content == first.choices[0].message.content
+    assert fake_llm.requests == 2
+
+
+async def test_json_replies_parse(fake_llm):
+    messages = [{"role": "user", "content": "Create a weekly task plan for week 1 as JSON"}]
+    response = await get_openai_client().chat.completions.create(
+        model="gpt-4o-mini", messages=messages, response_format={"type": "json_object"}
+    )
+
+    tasks = json.loads(response.choices[0].message.content)["tasks"]
+    assert len(tasks) == 7
+    assert {"title", "priority", "time_of_day", "duration_minutes"} <= set(tasks[0])
+
+
+async def test_streaming_round_trip(fake_llm):
+    client = get_openai_client()
+
+    async def streamed() -> tuple:
+        stream = await client.chat.completions.create(model="gpt-4o-mini", messages=MESSAGES, stream=True)
+        deltas, finish_reasons = [], []
+        async for chunk in stream:
+            deltas.append(chunk.choices[0].delta.content or "")
+            finish_reasons.append(chunk.choices[0].finish_reason)
+        return "".join(deltas), finish_reasons, len(deltas)
+
+    content, finish_reasons, chunks = await streamed()
+
+    assert content
+    assert chunks > 3
+    assert finish_reasons[-1] == "stop" and set(finish_reasons[:-1]) == {None}
+    assert (await streamed())[0] == content
+
+
+async def test_injected_errors_raise_sdk_errors(fake_llm):
+    fake_llm.error_rate = 1.0
+    fake_llm.error_status_codes = [429]
+
+    with pytest.raises(openai.RateLimitError):
+        await get_openai_client().chat.completions.create(model="gpt-4o-mini", messages=MESSAGES)
+    assert fake_llm.injected_errors == 1
@@ -0,0 +1,132 @@
+"""
+Hot queries use the composite indexes declared on the models
+
+Each query is run through the CRUD function that issues it, captured,
+and re-run under EXPLAIN with sequential scans disabled. The tables hold
+enough rows (and are analyzed) for the planner to prefer the composite
+index over the single-column ones.
+"""
+
+import json
+from datetime import date, datetime, timedelta
+from typing import Any, Iterator, List, Set, Tuple
+
+from sqlalchemy import insert, select, text
+
+from app.crud import daily_metric as crud_daily_metric
+from app.crud import plan as crud_plan
+from app.crud import task as crud_task
+from app.models.biometric import Biometric, BiometricType
+from app.models.daily_metric import DailyMetric
+from app.models.plan import Plan
+from app.models.task import Task, TaskPriority, TaskStatus
+from app.models.user import User
+
+START = date(2026, 1, 1)
+DAYS = 120
+USERS = 20
+
+
+def _index_names(plan: Any) -> Iterator[str]:
+    if isinstance(plan, dict):
+        if "Index Name" in plan:
+            yield plan["Index Name"]
+        for value in plan.values():
+            yield from _index_names(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _index_names(item)
+
+
+async def _explain(db, statements: List[Tuple[str, Any]]) -> Set[str]:
+    """Index names used by the last captured query"""
+    statement, parameters = statements[-1]
+    await db.execute(text("SET LOCAL enable_seqscan = off"))
+    result = await db.connection()
+    rows = await result.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    plan = rows.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return set(_index_names(plan))
+
+
+async def _seed(db) -> Tuple[int, int]:
+    """Users with plans, tasks, metrics and biometrics; returns one (user_id, plan_id)"""
+    now = datetime.utcnow()
+    user_ids = (await db.execute(
+        insert(User).returning(User.id),
+        [{"email": f"user{i}@example.com", "hashed_password": "x"} for i in range(USERS)],
+    )).scalars().all()
+
+    plan_rows = []
+    for user_id in user_ids:
+        plan_rows += [
+            {"user_id": user_id, "title": "Old plan", "is_active": False},
+            {"user_id": user_id, "title": "Plan", "is_active": True},
+        ]
+    plans = (await db.execute(insert(Plan).returning(Plan.id, Plan.user_id, Plan.is_active), plan_rows)).all()
+    active_plans = [plan_id for plan_id, _, is_active in plans if is_active]
+
+    # Plans' rows interleave on disk, as weeks are generated for everyone;
+    # a plan's history is the few days behind it, most tasks are upcoming
+    finished = [TaskStatus.COMPLETED, TaskStatus.COMPLETED, TaskStatus.SKIPPED, TaskStatus.CANCELLED]
+    task_rows = []
+    for day in range(DAYS):
+        for plan_id in active_plans:
+            status = finished[day % len(finished)] if day < DAYS // 10 else TaskStatus.PENDING
+            task_rows.append({
+                "plan_id": plan_id,
+                "title": f"Task {day}",
+                "status": status,
+                "priority": TaskPriority.MEDIUM,
+                "scheduled_date": START + timedelta(days=day),
+                "completed_at": START + timedelta(days=day) if status == TaskStatus.COMPLETED else None,
+            })
+    await db.execute(insert(Task), task_rows)
+
+    await db.execute(insert(DailyMetric), [
+        {"user_id": user_id, "date": START + timedelta(days=day), "energy_level": 5, "created_at": now}
+        for user_id in user_ids
+        for day in range(DAYS)
+    ])
+    await db.execute(insert(Biometric), [
+        {
+            "user_id": user_id,
+            "metric_type": metric_type,
+            "value": 70.0,
+            "measurement_date": START + timedelta(days=day),
+        }
+        for user_id in user_ids
+        for metric_type in (BiometricType.WEIGHT, BiometricType.STEPS, BiometricType.SLEEP_HOURS)
+        for day in range(0, DAYS, 3)
+    ])
+    await db.commit()
+
+    for table in ("users", "plans", "tasks", "daily_metrics", "biometrics"):
+        await db.execute(text(f"ANALYZE {table}"))
+    return user_ids[0], active_plans[0]
+
+
+async def test_hot_queries_use_composite_indexes(db, statements):
+    user_id, plan_id = await _seed(db)
+
+    await crud_task.get_tasks_by_date(db, plan_id, START + timedelta(days=10))
+    assert "ix_tasks_plan_scheduled_date" in await _explain(db, statements)
+
+    await crud_task.get_task_history(db, plan_id)
+    assert "ix_tasks_plan_status_completed_at" in await _explain(db, statements)
+
+    await crud_plan.get_active_plan(db, user_id)
+    assert await _explain(db, statements) & {"ix_plans_user_id_is_active", "uq_plans_one_active_per_user"}
+
+    await crud_daily_metric.get_metric_by_date(db, user_id, START + timedelta(days=10))
+    assert "uq_daily_metrics_user_date" in await _explain(db, statements)
+
+    # Latest measurement per type (users endpoint)
+    await db.execute(
+        select(Biometric)
+        .where(Biometric.user_id == user_id, Biometric.metric_type == BiometricType.WEIGHT)
+        .order_by(Biometric.measurement_date.desc())
+        .limit(1)
+    )
+    assert "ix_biometrics_user_type_date" in await _explain(db, statements)
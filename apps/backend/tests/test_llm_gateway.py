@@ -0,0 +1,202 @@
+"""
+LLM gateway: coalescing of identical completions, retries and the
+circuit breaker
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services import llm_gateway as llm_gateway_module
+from app.services.llm_gateway import LLMGateway, LLMUnavailable, _route
+
+MESSAGES = [{"role": "user", "content": "How do I stay motivated?"}]
+
+
+def _gateway(max_concurrency: int = 8) -> LLMGateway:
+    return LLMGateway(routes=[_route("chat", None, 5.0)], max_concurrency=max_concurrency)
+
+
+def _fail_first(fake_llm, failures: int, status_code: int = 500) -> None:
+    """Make the fake transport answer the first requests with an error"""
+    handle = fake_llm.handle_async_request
+
+    async def failing_handle(request):
+        if fake_llm.requests < failures:
+            fake_llm.requests += 1
+            return httpx.Response(status_code, json={"error": {"message": "boom", "type": "server_error"}})
+        return await handle(request)
+
+    fake_llm.handle_async_request = failing_handle
+
+
+def _messages(i: int):
+    return [{"role": "user", "content": f"Question {i}"}]
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 2)
+    monkeypatch.setattr(settings, "LLM_RETRY_BASE_DELAY_SECONDS", 0.01)
+
+
+async def test_identical_requests_share_one_call(fake_llm):
+    gateway = _gateway()
+
+    results = await asyncio.gather(*(gateway.complete("chat", MESSAGES, temperature=0.8) for _ in range(5)))
+
+    assert len(set(results)) == 1
+    assert fake_llm.requests == 1
+    assert gateway.stats()["routes"]["chat"]["coalesced"] == 4
+    assert gateway.stats()["in_flight_requests"] == 0
+
+
+async def test_different_params_not_coalesced(fake_llm):
+    gateway = _gateway()
+
+    await asyncio.gather(
+        gateway.complete("chat", MESSAGES, temperature=0.8),
+        gateway.complete("chat", MESSAGES, temperature=0.2),
+    )
+
+    assert fake_llm.requests == 2
+
+
+async def test_completed_call_not_reused(fake_llm):
+    gateway = _gateway()
+
+    await gateway.complete("chat", MESSAGES)
+    await gateway.complete("chat", MESSAGES)
+
+    assert fake_llm.requests == 2
+
+
+async def test_cancelled_waiter_leaves_shared_call_running(fake_llm):
+    gateway = _gateway()
+
+    waiters = [asyncio.create_task(gateway.complete("chat", MESSAGES)) for _ in range(3)]
+    await asyncio.sleep(0.05)
+    waiters[0].cancel()
+
+    results = await asyncio.gather(*waiters[1:])
+    with pytest.raises(asyncio.CancelledError):
+        await waiters[0]
+
+    assert results[0] == results[1]
+    assert fake_llm.requests == 1
+
+
+async def test_call_cancelled_once_every_waiter_is_gone(fake_llm):
+    gateway = _gateway()
+
+    waiters = [asyncio.create_task(gateway.complete("chat", MESSAGES)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+    (shared, _), = gateway._inflight.values()
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert shared.cancelled()
+    assert gateway.stats()["in_flight_requests"] == 0
+    # The breaker gets no verdict from a cancelled call
+    assert gateway.stats()["routes"]["chat"]["failures"] == 0
+
+    # A later identical request starts a new call instead of joining the cancelled one
+    assert await gateway.complete("chat", MESSAGES)
+    assert fake_llm.requests == 2
+
+
+async def test_transient_errors_retried(fake_llm, fast_retries):
+    gateway = _gateway()
+    _fail_first(fake_llm, 2)
+
+    assert await gateway.complete("chat", MESSAGES)
+
+    route = gateway.stats()["routes"]["chat"]
+    assert (route["retries"], route["successes"], route["failures"]) == (2, 1, 0)
+    assert fake_llm.requests == 3
+
+
+async def test_gives_up_after_max_retries(fake_llm, fast_retries):
+    gateway = _gateway()
+    _fail_first(fake_llm, 10)
+
+    with pytest.raises(LLMUnavailable):
+        await gateway.complete("chat", MESSAGES)
+
+    assert fake_llm.requests == settings.LLM_MAX_RETRIES + 1
+    assert gateway.stats()["routes"]["chat"]["failures"] == 1
+
+
+async def test_bad_requests_not_retried_and_do_not_open_breaker(fake_llm, fast_retries):
+    gateway = _gateway()
+    _fail_first(fake_llm, 100, status_code=400)
+
+    for i in range(settings.LLM_BREAKER_FAILURE_THRESHOLD + 2):
+        with pytest.raises(LLMUnavailable):
+            await gateway.complete("chat", _messages(i))
+
+    route = gateway.stats()["routes"]["chat"]
+    assert route["circuit"] == "closed"
+    assert route["retries"] == 0
+    assert fake_llm.requests == settings.LLM_BREAKER_FAILURE_THRESHOLD + 2
+
+
+@pytest.mark.parametrize("status_code", [429, 503])
+async def test_provider_failures_open_breaker(fake_llm, monkeypatch, status_code):
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 0)
+    gateway = _gateway()
+    _fail_first(fake_llm, 100, status_code=status_code)
+
+    for i in range(settings.LLM_BREAKER_FAILURE_THRESHOLD):
+        with pytest.raises(LLMUnavailable):
+            await gateway.complete("chat", _messages(i))
+    assert gateway.stats()["routes"]["chat"]["circuit"] == "open"
+
+    # Open: refused without calling the provider
+    with pytest.raises(LLMUnavailable):
+        await gateway.complete("chat", _messages(-1))
+    assert fake_llm.requests == settings.LLM_BREAKER_FAILURE_THRESHOLD
+    assert gateway.stats()["routes"]["chat"]["short_circuited"] == 1
+
+
+async def test_half_open_probe_closes_breaker(fake_llm, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 0)
+    monkeypatch.setattr(settings, "LLM_BREAKER_RESET_SECONDS", 0.05)
+    gateway = _gateway()
+    _fail_first(fake_llm, settings.LLM_BREAKER_FAILURE_THRESHOLD)
+
+    for i in range(settings.LLM_BREAKER_FAILURE_THRESHOLD):
+        with pytest.raises(LLMUnavailable):
+            await gateway.complete("chat", _messages(i))
+    await asyncio.sleep(0.06)
+
+    assert gateway.stats()["routes"]["chat"]["circuit"] == "half_open"
+    assert await gateway.complete("chat", MESSAGES)
+    assert gateway.stats()["routes"]["chat"]["circuit"] == "closed"
+
+
+async def test_backoff_releases_concurrency_slot(fake_llm, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 1)
+    monkeypatch.setattr(settings, "LLM_RETRY_BASE_DELAY_SECONDS", 0.5)
+    # Always back off for the full delay (2 * base)
+    monkeypatch.setattr(llm_gateway_module.random, "uniform", lambda low, high: high)
+    fake_llm.latency_ms = 10.0
+    gateway = _gateway(max_concurrency=1)
+    _fail_first(fake_llm, 1)
+    finished = []
+
+    async def complete(i: int):
+        await gateway.complete("chat", _messages(i))
+        finished.append(i)
+
+    retrying = asyncio.create_task(complete(0))
+    await asyncio.sleep(0.1)
+    # The only slot is free while the first call backs off
+    await asyncio.wait_for(complete(1), timeout=0.5)
+    await retrying
+
+    assert finished == [1, 0]
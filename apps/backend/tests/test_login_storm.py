@@ -0,0 +1,92 @@
+"""
+Login storm: bcrypt runs on the password hash pool, so requests that do
+not hash stay fast while many logins are verified at once
+"""
+
+import asyncio
+import gc
+import time
+from typing import List
+
+import pytest
+from sqlalchemy import update
+
+from app.core.rate_limit import auth_rate_limiter
+from app.core.security import get_password_hash, password_hash_pool
+from app.models.user import User
+
+PASSWORD = "correct horse battery"
+LOGINS = 12
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+@pytest.fixture
+async def login_user(session_factory, user):
+    async with session_factory() as db:
+        await db.execute(
+            update(User).where(User.id == user.id).values(hashed_password=get_password_hash(PASSWORD))
+        )
+        await db.commit()
+    return user
+
+
+async def test_unrelated_requests_stay_fast_during_login_storm(client, auth_headers, login_user, monkeypatch):
+    async def admit(request, email):
+        return None
+
+    # The storm comes from one client; shedding is not what is tested here
+    monkeypatch.setattr(auth_rate_limiter, "check", admit)
+
+    start = time.perf_counter()
+    assert get_password_hash(PASSWORD)
+    bcrypt_ms = (time.perf_counter() - start) * 1000
+
+    async def probe(latencies: List[float], stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            started = time.perf_counter()
+            response = await client.get("/api/v1/users/me", headers=auth_headers)
+            assert response.status_code == 200
+            latencies.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(0.005)
+
+    async def login() -> int:
+        response = await client.post(
+            "/api/v1/auth/login", json={"email": login_user.email, "password": PASSWORD}
+        )
+        return response.status_code
+
+    # Warm up the probed route, then keep garbage collection out of the
+    # measurement: on one core a collection competes with the hash threads
+    # and its pause stretches several times over
+    assert (await client.get("/api/v1/users/me", headers=auth_headers)).status_code == 200
+    gc.collect()
+    gc.disable()
+
+    latencies: List[float] = []
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe(latencies, stop))
+    try:
+        statuses = await asyncio.gather(*(login() for _ in range(LOGINS)))
+    finally:
+        stop.set()
+        await prober
+        gc.enable()
+
+    assert statuses == [200] * LOGINS
+    assert password_hash_pool.hash_time.snapshot()["count"] >= LOGINS
+    assert len(latencies) >= 10
+    p50, p99 = _percentile(latencies, 0.5), _percentile(latencies, 0.99)
+    print(
+        f"\nbcrypt {bcrypt_ms:.0f} ms/hash, {LOGINS} logins, unrelated p50 {p50:.1f} ms, "
+        f"p99 {p99:.1f} ms over {len(latencies)} requests"
+    )
+    # With verification on the event loop every request would queue behind
+    # the hash in progress: p50 around half a hash, p99 a whole one or more.
+    # Pool threads still share the CPU with the loop (one core in CI), so
+    # some slowdown is expected, but not hash-sized waits
+    assert p50 < bcrypt_ms / 4
+    assert p99 < bcrypt_ms * 1.5
@@ -0,0 +1,121 @@
+"""
+Alembic revision chain
+
+Runs the migrations against a scratch database created next to
+TEST_DATABASE_URL (alembic/env.py uses psycopg2, so it is required too).
+"""
+
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from sqlalchemy import create_engine, make_url, text
+from sqlalchemy.engine import URL
+from sqlalchemy.pool import NullPool
+
+pytest.importorskip("psycopg2")
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+from tests.conftest import TEST_DATABASE_URL
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BASE_REVISION = "1d0f7c3a9b82"
+
+
+def _alembic_config() -> Config:
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    return config
+
+
+def test_single_root_and_head():
+    script = ScriptDirectory.from_config(_alembic_config())
+    assert script.get_bases() == [BASE_REVISION]
+    assert len(script.get_heads()) == 1
+
+
+@pytest.fixture
+def migration_url(monkeypatch) -> Iterator[URL]:
+    """Empty scratch database, dropped afterwards"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    test_url = make_url(TEST_DATABASE_URL).set(drivername="postgresql+psycopg2")
+    url = test_url.set(database=f"{test_url.database}_migrations")
+    admin = create_engine(test_url, poolclass=NullPool, isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.execute(text(f'DROP DATABASE IF EXISTS "{url.database}"'))
+        conn.execute(text(f'CREATE DATABASE "{url.database}"'))
+
+    monkeypatch.setenv("ALEMBIC_DATABASE_URL", url.render_as_string(hide_password=False))
+    try:
+        yield url
+    finally:
+        with admin.connect() as conn:
+            conn.execute(text(f'DROP DATABASE IF EXISTS "{url.database}" WITH (FORCE)'))
+        admin.dispose()
+
+
+def test_fresh_database_upgrades_to_head(migration_url: URL):
+    config = _alembic_config()
+    command.upgrade(config, "head")
+
+    engine = create_engine(migration_url, poolclass=NullPool)
+    try:
+        with engine.connect() as conn:
+            version = conn.execute(text("SELECT version_num FROM alembic_version")).scalar_one()
+            tables = set(conn.execute(text(
+                "SELECT tablename FROM pg_tables WHERE schemaname = 'public'"
+            )).scalars())
+    finally:
+        engine.dispose()
+
+    assert version == ScriptDirectory.from_config(config).get_current_head()
+    assert {"users", "plans", "tasks", "biometrics", "daily_metrics", "user_streaks",
+            "revoked_tokens", "plan_jobs", "coach_insights"} <= tables
+
+    command.downgrade(config, "base")
+
+
+def test_index_revision_merges_duplicate_metrics(migration_url: URL):
+    config = _alembic_config()
+    command.upgrade(config, BASE_REVISION)
+
+    now = datetime(2026, 10, 1, 12, 0)
+    engine = create_engine(migration_url, poolclass=NullPool)
+    try:
+        with engine.begin() as conn:
+            user_id = conn.execute(text(
+                "INSERT INTO users (email, hashed_password, is_active, is_verified, created_at, updated_at) "
+                "VALUES ('dup@example.com', 'x', true, false, :now, :now) RETURNING id"
+            ), {"now": now}).scalar_one()
+            day = date(2026, 10, 1)
+            rows = [
+                # (energy_level, tasks_completed, exercise_minutes, updated_at)
+                (3, 2, 20, datetime(2026, 10, 1, 8, 0)),
+                (7, 1, 15, datetime(2026, 10, 1, 21, 0)),
+                (5, None, 30, None),
+            ]
+            for energy, tasks_completed, exercise_minutes, updated_at in rows:
+                conn.execute(text(
+                    "INSERT INTO daily_metrics (user_id, date, energy_level, tasks_completed, "
+                    "exercise_minutes, updated_at) VALUES (:user_id, :day, :energy, :tasks, :minutes, :updated_at)"
+                ), {"user_id": user_id, "day": day, "energy": energy, "tasks": tasks_completed,
+                    "minutes": exercise_minutes, "updated_at": updated_at})
+
+        command.upgrade(config, "head")
+
+        with engine.connect() as conn:
+            merged = conn.execute(text(
+                "SELECT energy_level, tasks_completed, exercise_minutes FROM daily_metrics "
+                "WHERE user_id = :user_id"
+            ), {"user_id": user_id}).all()
+    finally:
+        engine.dispose()
+
+    # The most recently updated row survives, carrying every row's counters
+    assert merged == [(7, 3, 65)]
@@ -0,0 +1,86 @@
+"""bcrypt work factor calibration and rehashing outdated hashes on login"""
+
+from passlib.context import CryptContext
+import pytest
+from sqlalchemy import select, update
+
+from app.core import security
+from app.core.config import settings
+from app.core.security import calibrate_password_hashing, password_hash_params, pwd_context
+from app.crud import user as crud_user
+from app.models.user import User
+
+PASSWORD = "correct horse battery"
+
+
+@pytest.fixture(autouse=True)
+def restore_hashing_params():
+    context, params = pwd_context.to_dict(), dict(password_hash_params)
+    yield
+    pwd_context.load(context)
+    password_hash_params.clear()
+    password_hash_params.update(params)
+
+
+def test_calibration_picks_highest_rounds_within_target(monkeypatch):
+    # 64 ms at 10 rounds, doubling per round
+    monkeypatch.setattr(security, "_time_bcrypt_hash", lambda rounds: 64.0 * 2 ** (rounds - 10))
+    monkeypatch.setattr(settings, "PASSWORD_HASH_TARGET_MS", 250.0)
+
+    params = calibrate_password_hashing()
+
+    assert (params["rounds"], params["source"], params["measured_ms"]) == (11, "calibrated", 128.0)
+    assert pwd_context.hash(PASSWORD).startswith("$2b$11$")
+
+
+def test_calibration_stays_within_bounds(monkeypatch):
+    monkeypatch.setattr(security, "_time_bcrypt_hash", lambda rounds: 0.001 * 2 ** rounds)
+    assert calibrate_password_hashing()["rounds"] == settings.PASSWORD_BCRYPT_MAX_ROUNDS
+
+    monkeypatch.setattr(security, "_time_bcrypt_hash", lambda rounds: 1000.0 * 2 ** rounds)
+    assert calibrate_password_hashing()["rounds"] == settings.PASSWORD_BCRYPT_MIN_ROUNDS
+
+
+def test_calibration_on_this_machine(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_BCRYPT_MIN_ROUNDS", 4)
+    monkeypatch.setattr(settings, "PASSWORD_BCRYPT_MAX_ROUNDS", 12)
+    monkeypatch.setattr(settings, "PASSWORD_HASH_TARGET_MS", 50.0)
+
+    params = calibrate_password_hashing()
+
+    assert 4 <= params["rounds"] <= 12
+    # One more round would double the cost, so the chosen one is well under
+    # twice the target (allowing for timing noise on a busy machine)
+    assert params["measured_ms"] < 2 * settings.PASSWORD_HASH_TARGET_MS
+
+
+def test_configured_rounds_skip_calibration(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_BCRYPT_ROUNDS", 5)
+    monkeypatch.setattr(security, "_time_bcrypt_hash", lambda rounds: 1.0)
+
+    assert calibrate_password_hashing()["source"] == "configured"
+    assert pwd_context.hash(PASSWORD).startswith("$2b$05$")
+
+
+async def test_outdated_hash_rehashed_on_login(session_factory, user, monkeypatch):
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=4).hash(PASSWORD)
+    async with session_factory() as db:
+        await db.execute(update(User).where(User.id == user.id).values(hashed_password=old_hash))
+        await db.commit()
+
+    monkeypatch.setattr(settings, "PASSWORD_BCRYPT_ROUNDS", 5)
+    calibrate_password_hashing()
+    rehashed_before = password_hash_params["rehashed_on_login"]
+
+    for _ in range(2):
+        async with session_factory() as db:
+            assert await crud_user.authenticate_user(db, user.email, PASSWORD) is not None
+            await db.commit()
+
+        async with session_factory() as db:
+            stored = await db.scalar(select(User.hashed_password).where(User.id == user.id))
+        assert stored.startswith("$2b$05$")
+        assert pwd_context.verify(PASSWORD, stored)
+
+    # Upgraded once; the second login found the current work factor
+    assert password_hash_params["rehashed_on_login"] == rehashed_before + 1
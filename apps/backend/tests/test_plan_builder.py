@@ -0,0 +1,87 @@
+"""Speculative first-week tasks: phase matching and the roadmap cache"""
+
+import asyncio
+
+from app.services import plan_builder
+from app.services.ai_engine import plan_generator
+from app.services.ai_engine.roadmap_cache import RoadmapCache, profile_fingerprint
+from app.services.plan_builder import SPECULATIVE_FIRST_PHASE, _phase_compatible
+
+USER_DATA = {
+    "age": 30,
+    "gender": "male",
+    "current_weight": 90.0,
+    "goal_weight": 80.0,
+    "height": 180.0,
+    "activity_level": "light",
+    "goals": '["lose weight"]',
+}
+
+ROADMAP = {
+    "phases": [{"name": "Foundation", "duration": "4 weeks", "goals": ["Walk 20 minutes a day"], "milestones": []}],
+    "timeline": {"total_duration": "12 weeks", "estimated_completion": "soon"},
+}
+
+
+def test_reworded_foundation_goals_are_compatible():
+    for name, goals in [
+        ("Foundation", ["Establish baseline habits"]),
+        ("Phase 1: Foundation", ["Walk 20 minutes a day", "Eat more vegetables", "Sleep 7 hours"]),
+        ("Building Foundations", ["Build a sustainable exercise routine", "Improve eating habits"]),
+    ]:
+        assert _phase_compatible(SPECULATIVE_FIRST_PHASE, {"name": name, "goals": goals}), goals
+
+
+def test_other_phases_are_not_compatible():
+    assert not _phase_compatible(SPECULATIVE_FIRST_PHASE, {"name": "Progress", "goals": SPECULATIVE_FIRST_PHASE["goals"]})
+    assert not _phase_compatible(
+        SPECULATIVE_FIRST_PHASE, {"name": "Foundation", "goals": ["Increase water intake", "Lift weights"]}
+    )
+
+
+async def test_cached_roadmap_skips_speculation(monkeypatch):
+    cache = RoadmapCache(ttl_seconds=60, max_variants=1, max_buckets=10)
+    fingerprint = profile_fingerprint(USER_DATA, USER_DATA["goals"], plan_generator._apply_safety_rules(USER_DATA))
+    cache.add(fingerprint, ROADMAP)
+    monkeypatch.setattr(plan_generator, "roadmap_cache", cache)
+
+    phases = []
+
+    async def fake_weekly_tasks(user_data, phase, week_number, start_date):
+        phases.append(phase)
+        return [{"title": "Walk"}]
+
+    async def no_roadmap(*args, **kwargs):
+        raise AssertionError("roadmap should come from the cache")
+
+    monkeypatch.setattr(plan_builder, "generate_weekly_tasks", fake_weekly_tasks)
+    monkeypatch.setattr(plan_builder, "generate_roadmap", no_roadmap)
+
+    roadmap, tasks = await plan_builder.generate_plan_content(USER_DATA, USER_DATA["goals"])
+
+    assert roadmap == ROADMAP
+    assert phases == [ROADMAP["phases"][0]]
+    assert [task.title for task in tasks] == ["Walk"]
+
+
+async def test_uncached_roadmap_reuses_compatible_speculation(monkeypatch):
+    monkeypatch.setattr(plan_generator, "roadmap_cache", RoadmapCache(ttl_seconds=60, max_variants=1, max_buckets=10))
+
+    phases = []
+
+    async def fake_weekly_tasks(user_data, phase, week_number, start_date):
+        phases.append(phase)
+        return [{"title": phase["name"]}]
+
+    async def slow_roadmap(user_data, goal=None, check_cache=True):
+        assert check_cache is False
+        await asyncio.sleep(0.01)
+        return ROADMAP
+
+    monkeypatch.setattr(plan_builder, "generate_weekly_tasks", fake_weekly_tasks)
+    monkeypatch.setattr(plan_builder, "generate_roadmap", slow_roadmap)
+
+    _, tasks = await plan_builder.generate_plan_content(USER_DATA, USER_DATA["goals"])
+
+    assert phases == [SPECULATIVE_FIRST_PHASE]
+    assert len(tasks) == 1
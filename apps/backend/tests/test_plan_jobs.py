@@ -0,0 +1,144 @@
+import asyncio
+from datetime import timedelta
+
+from sqlalchemy import func, select
+
+from app.crud import plan_job as crud_plan_job
+from app.models.plan_job import PlanJob, PlanJobKind, PlanJobStatus
+from app.services import plan_jobs
+from app.services.plan_jobs import PlanJobRunner
+
+
+def _runner() -> PlanJobRunner:
+    return PlanJobRunner(backend="inprocess", workers=1, poll_interval=0.1, stale_after=60, max_attempts=3)
+
+
+async def test_concurrent_submits_share_one_pending_job(session_factory, user):
+    runner = _runner()
+
+    async def submit():
+        async with session_factory() as db:
+            job = await runner.submit(db, user.id, PlanJobKind.GENERATE)
+            # Keep the transaction open so the submits really overlap
+            await asyncio.sleep(0.1)
+            await db.commit()
+            return job.id
+
+    job_ids = await asyncio.gather(*(submit() for _ in range(5)))
+
+    assert len(set(job_ids)) == 1
+    async with session_factory() as db:
+        count = await db.scalar(select(func.count()).select_from(PlanJob))
+    assert count == 1
+
+
+async def test_new_job_allowed_once_previous_finished(session_factory, user):
+    runner = _runner()
+    async with session_factory() as db:
+        first = await runner.submit(db, user.id, PlanJobKind.GENERATE)
+        started = await crud_plan_job.start_job(db, first.id)
+        assert await crud_plan_job.finish_job(db, first.id, started.attempts, plan_id=None)
+        second = await runner.submit(db, user.id, PlanJobKind.REGENERATE)
+        await db.commit()
+
+    assert second.id != first.id
+    assert second.status == PlanJobStatus.QUEUED
+
+
+async def test_finish_job_ignores_superseded_attempt(session_factory, user):
+    async with session_factory() as db:
+        job = await crud_plan_job.create_job(db, user.id, PlanJobKind.GENERATE)
+        first_attempt = await crud_plan_job.start_job(db, job.id)
+        await db.commit()
+
+    # Stale recovery requeues the job and another worker claims it
+    async with session_factory() as db:
+        assert await crud_plan_job.recover_stale_jobs(db, timedelta(seconds=-1), max_attempts=3) == 1
+        second_attempt = await crud_plan_job.claim_next_job(db)
+        await db.commit()
+    assert (first_attempt.attempts, second_attempt.attempts) == (1, 2)
+
+    async with session_factory() as db:
+        # The slow first attempt finishing late must not touch the job
+        assert not await crud_plan_job.finish_job(db, job.id, first_attempt.attempts, error="late")
+        assert await crud_plan_job.finish_job(db, job.id, second_attempt.attempts, plan_id=None)
+        await db.commit()
+
+        finished = await crud_plan_job.get_job(db, job.id, user.id)
+    assert finished.status == PlanJobStatus.SUCCEEDED
+    assert finished.error is None
+
+
+async def _pending_rows(session_factory, user):
+    """A queued job for user and a running one for a second user, as a crash leaves them"""
+    from app.models.user import User
+
+    async with session_factory() as db:
+        other = User(email="other@example.com", hashed_password="not-a-real-hash")
+        db.add(other)
+        await db.flush()
+        queued = await crud_plan_job.create_job(db, user.id, PlanJobKind.GENERATE)
+        running = await crud_plan_job.create_job(db, other.id, PlanJobKind.GENERATE)
+        await crud_plan_job.start_job(db, running.id)
+        await db.commit()
+    return (user.id, queued.id), (other.id, running.id)
+
+
+async def test_inprocess_restart_recovers_pending_jobs(session_factory, user, monkeypatch):
+    async def generate_plan_content(user_data, goals):
+        return {"phases": []}, []
+
+    monkeypatch.setattr(plan_jobs, "generate_plan_content", generate_plan_content)
+    jobs = await _pending_rows(session_factory, user)
+
+    # A fresh process: nothing in its local queue knows about these rows
+    runner = _runner()
+    runner.start(session_factory)
+    try:
+        finished = [await runner.get_job(user_id, job_id, wait=5) for user_id, job_id in jobs]
+    finally:
+        await runner.stop()
+
+    assert [job.status for job in finished] == [PlanJobStatus.SUCCEEDED] * 2
+    assert [job.attempts for job in finished] == [1, 2]
+
+    # The users can submit again instead of getting the dead job back
+    async with session_factory() as db:
+        again = await runner.submit(db, user.id, PlanJobKind.REGENERATE)
+        assert again.id != jobs[0][1]
+        assert again.status == PlanJobStatus.QUEUED
+
+
+async def test_inprocess_restart_fails_job_out_of_attempts(session_factory, user):
+    _, (other_id, running_id) = await _pending_rows(session_factory, user)
+
+    runner = PlanJobRunner(backend="inprocess", workers=0, poll_interval=0.1, stale_after=60, max_attempts=1)
+    runner.start(session_factory)
+    try:
+        job = await runner.get_job(other_id, running_id, wait=5)
+    finally:
+        await runner.stop()
+
+    assert job.status == PlanJobStatus.FAILED
+    assert job.error == "Plan generation did not finish"
+
+
+async def test_abandoned_wait_drops_finished_event(session_factory, user):
+    runner = _runner()
+    runner.start(session_factory)
+    await runner.stop()
+    async with session_factory() as db:
+        job = await runner.submit(db, user.id, PlanJobKind.GENERATE)
+        await db.commit()
+
+    # Timed out while still queued
+    assert (await runner.get_job(user.id, job.id, wait=0.15)).status == PlanJobStatus.QUEUED
+    assert runner._finished == {} and runner._pollers == {}
+
+    # Cancelled while waiting
+    waiter = asyncio.create_task(runner.get_job(user.id, job.id, wait=5))
+    await asyncio.sleep(0.05)
+    assert job.id in runner._finished
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    assert runner._finished == {} and runner._pollers == {}
@@ -0,0 +1,62 @@
+"""Plan progress: task counts and the current streak"""
+
+from datetime import date, timedelta
+
+from sqlalchemy import insert
+
+from app.crud import daily_metric as crud_metric
+from app.crud import plan as crud_plan
+from app.crud import task as crud_task
+from app.models.daily_metric import DailyMetric
+from app.models.task import TaskStatus
+from app.schemas.plan import PlanCreate
+from app.schemas.task import TaskCreate, TaskUpdate
+
+
+async def _plan_with_tasks(db, user_id: int, completed: int, total: int) -> int:
+    plan = await crud_plan.create_plan(db, user_id, PlanCreate(title="Plan"))
+    tasks = await crud_task.create_tasks(db, plan.id, [TaskCreate(title=f"Task {i}") for i in range(total)])
+    for task in tasks[:completed]:
+        await crud_task.update_task(db, task, TaskUpdate(status=TaskStatus.COMPLETED))
+    return plan.id
+
+
+async def test_streak_from_maintained_row(db, user):
+    today = date.today()
+    plan_id = await _plan_with_tasks(db, user.id, completed=2, total=5)
+    for offset in (1, 0):
+        # One completion per request, each committed by get_db
+        await crud_metric.increment_tasks_completed(db, user.id, today - timedelta(days=offset))
+        await db.commit()
+
+    assert await crud_plan.get_plan_progress(db, plan_id, user.id, today) == (2, 5, 2)
+    # The run does not reach tomorrow
+    assert await crud_plan.get_plan_progress(db, plan_id, user.id, today + timedelta(days=2)) == (2, 5, 0)
+
+
+async def test_streak_without_maintained_row(db, user):
+    """Activity recorded before user_streaks existed is still counted"""
+    today = date.today()
+    plan_id = await _plan_with_tasks(db, user.id, completed=1, total=3)
+    await db.execute(insert(DailyMetric), [
+        {"user_id": user.id, "date": today - timedelta(days=offset), "tasks_completed": 1}
+        for offset in (0, 1, 2, 4)
+    ])
+
+    assert await crud_plan.get_plan_progress(db, plan_id, user.id, today) == (1, 3, 3)
+    assert await crud_metric.get_streak(db, user.id) == 3
+
+
+async def test_streak_with_task_completed_ahead(db, user):
+    """Completing tomorrow's task early moves the anchor past today"""
+    today = date.today()
+    plan_id = await _plan_with_tasks(db, user.id, completed=2, total=2)
+    for offset in (-1, 0, 1):
+        await crud_metric.increment_tasks_completed(db, user.id, today + timedelta(days=offset))
+        await db.commit()
+
+    # Yesterday and today; tomorrow's completion does not count yet
+    assert await crud_plan.get_plan_progress(db, plan_id, user.id, today) == (2, 2, 2)
+    assert await crud_metric.get_streak(db, user.id) == 2
+    # Once tomorrow comes, the maintained row applies again
+    assert await crud_plan.get_plan_progress(db, plan_id, user.id, today + timedelta(days=1)) == (2, 2, 3)
@@ -0,0 +1,35 @@
+"""Pool telemetry counts checkouts and checkout waits"""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.pool_stats import InstrumentedAsyncQueuePool, register_pool
+from tests.conftest import TEST_DATABASE_URL
+
+
+async def test_checkouts_and_waits_are_recorded():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    engine = create_async_engine(
+        TEST_DATABASE_URL,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=2,
+        max_overflow=0,
+        pool_logging_name="test-pool",
+    )
+    stats = register_pool(engine, "test-pool", capacity=2)
+    try:
+        for _ in range(3):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+    finally:
+        await engine.dispose()
+
+    snapshot = stats.snapshot()
+    assert snapshot["checkouts"] == 3
+    assert snapshot["checkins"] == 3
+    assert snapshot["connections_opened"] == 1
+    assert snapshot["wait_ms"]["count"] == 3
+    assert snapshot["wait_ms"]["histogram"]["le_inf"] == 3
@@ -0,0 +1,31 @@
+"""update_user drops the cached principal only once the update commits"""
+
+from app.core.principal_cache import Principal, principal_cache
+from app.crud import user as crud_user
+from app.schemas.user import UserUpdate
+
+
+async def test_invalidated_after_commit(session_factory, user):
+    principal_cache.put(Principal.from_user(user))
+
+    async with session_factory() as db:
+        await crud_user.update_user(db, user.id, UserUpdate(full_name="Renamed"))
+        # Not committed yet: other requests still see the old row
+        assert principal_cache.get(user.id) is not None
+
+        await db.commit()
+        assert principal_cache.get(user.id) is None
+
+
+async def test_rollback_keeps_cached_principal(session_factory, user):
+    principal_cache.put(Principal.from_user(user))
+
+    async with session_factory() as db:
+        await crud_user.update_user(db, user.id, UserUpdate(full_name="Renamed"))
+        await db.rollback()
+        assert principal_cache.get(user.id) is not None
+
+        # The discarded hook does not fire on a later commit of the session
+        await db.commit()
+        assert principal_cache.get(user.id) is not None
+    principal_cache.invalidate(user.id)
@@ -0,0 +1,132 @@
+"""
+Auth rate limiting: buckets, client IP behind proxies, 429 responses
+
+The Redis backend test runs against TEST_REDIS_URL and is skipped when
+it is not set.
+"""
+
+import os
+from typing import Optional
+from uuid import uuid4
+
+import pytest
+from starlette.requests import Request
+
+from app.api.v1.endpoints import auth as auth_endpoints
+from app.core.config import settings
+from app.core.rate_limit import (
+    AuthRateLimiter,
+    MemoryTokenBucket,
+    RateLimitExceeded,
+    RedisTokenBucket,
+    client_ip,
+)
+from app.crud import user as crud_user
+
+TEST_REDIS_URL = os.environ.get("TEST_REDIS_URL")
+
+
+def _request(peer: str, forwarded_for: Optional[str] = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": headers, "client": (peer, 1234)})
+
+
+@pytest.fixture
+def tight_limits(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_RATE_LIMIT_IP_PER_MINUTE", 1.0)
+    monkeypatch.setattr(settings, "AUTH_RATE_LIMIT_IP_BURST", 3)
+    monkeypatch.setattr(settings, "AUTH_RATE_LIMIT_EMAIL_PER_MINUTE", 1.0)
+    monkeypatch.setattr(settings, "AUTH_RATE_LIMIT_EMAIL_BURST", 2)
+
+
+def _limiter(**kwargs) -> AuthRateLimiter:
+    return AuthRateLimiter(MemoryTokenBucket(max_keys=100), **kwargs)
+
+
+def test_forwarded_for_ignored_from_untrusted_peer():
+    request = _request("203.0.113.7", forwarded_for="1.2.3.4")
+    assert client_ip(request, []) == "203.0.113.7"
+
+
+def test_client_ip_behind_trusted_proxies():
+    limiter = _limiter(trusted_proxies=["10.0.0.0/8"])
+    # 1.2.3.4 was written by the client itself; 10.0.0.5 is an inner proxy
+    request = _request("10.0.0.2", forwarded_for="1.2.3.4, 203.0.113.7, 10.0.0.5")
+    assert client_ip(request, limiter.trusted_proxies) == "203.0.113.7"
+    assert client_ip(_request("10.0.0.2"), limiter.trusted_proxies) == "10.0.0.2"
+
+
+async def test_clients_behind_proxy_get_separate_buckets(tight_limits):
+    limiter = _limiter(trusted_proxies=["10.0.0.2"])
+    for _ in range(3):
+        await limiter.check(_request("10.0.0.2", forwarded_for="203.0.113.7"), None)
+    with pytest.raises(RateLimitExceeded):
+        await limiter.check(_request("10.0.0.2", forwarded_for="203.0.113.7"), None)
+
+    # Same proxy, another client
+    await limiter.check(_request("10.0.0.2", forwarded_for="198.51.100.1"), None)
+
+
+async def test_ip_and_email_buckets(tight_limits):
+    limiter = _limiter()
+    attacker = _request("203.0.113.7")
+
+    await limiter.check(attacker, "Victim@example.com")
+    await limiter.check(attacker, "victim@example.com")
+    with pytest.raises(RateLimitExceeded) as exc:
+        await limiter.check(attacker, "victim@example.com")
+    assert exc.value.scope == "email"
+    assert exc.value.retry_after > 0
+
+    # The victim, from their own IP, is not locked out
+    await limiter.check(_request("198.51.100.1"), "victim@example.com")
+
+    # The attacker's IP still runs out on other emails
+    with pytest.raises(RateLimitExceeded) as exc:
+        await limiter.check(attacker, "other@example.com")
+    assert exc.value.scope == "ip"
+    assert limiter.stats()["rejected"] == {"ip": 1, "email": 1}
+
+
+async def test_login_rejected_with_retry_after_before_bcrypt(client, tight_limits, monkeypatch):
+    monkeypatch.setattr(auth_endpoints, "auth_rate_limiter", _limiter())
+    authenticated = []
+    authenticate_user = crud_user.authenticate_user
+
+    async def spy(db, email, password):
+        authenticated.append(email)
+        return await authenticate_user(db, email, password)
+
+    monkeypatch.setattr(crud_user, "authenticate_user", spy)
+
+    statuses = []
+    for _ in range(3):
+        response = await client.post("/api/v1/auth/login", json={"email": "nobody@example.com", "password": "wrong-password"})
+        statuses.append(response.status_code)
+
+    assert statuses == [401, 401, 429]
+    assert int(response.headers["Retry-After"]) >= 1
+    # The rejected attempt never reached the password check
+    assert len(authenticated) == 2
+
+
+async def test_redis_backend_fails_open():
+    pytest.importorskip("redis")
+    bucket = RedisTokenBucket("redis://127.0.0.1:1/0")
+
+    assert await bucket.acquire(f"test:{uuid4()}", rate=1.0, burst=1) == 0.0
+    assert bucket.errors == 1
+
+
+@pytest.mark.skipif(TEST_REDIS_URL is None, reason="TEST_REDIS_URL not set")
+async def test_redis_token_bucket():
+    bucket = RedisTokenBucket(TEST_REDIS_URL)
+    key = f"test:{uuid4()}"
+
+    assert await bucket.acquire(key, rate=1 / 60, burst=2) == 0.0
+    assert await bucket.acquire(key, rate=1 / 60, burst=2) == 0.0
+    retry_after = await bucket.acquire(key, rate=1 / 60, burst=2)
+    assert 0 < retry_after <= 60
+    # Other keys have their own bucket
+    assert await bucket.acquire(f"{key}:other", rate=1 / 60, burst=2) == 0.0
+    assert bucket.errors == 0
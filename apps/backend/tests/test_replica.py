@@ -0,0 +1,85 @@
+"""Read routing: lag bound, stale samples and fallback to the primary"""
+
+import time
+from typing import Optional
+
+from app.db.replica import STALE_SAMPLE_INTERVALS, ReadRouter, Replica
+
+PRIMARY = object()
+MAX_LAG = 5.0
+INTERVAL = 10.0
+
+
+def _replica(name: str, lag: Optional[float] = None, age: float = 0.0) -> Replica:
+    replica = Replica(name, engine=None, session_factory=f"{name}-factory")
+    replica.lag_seconds = lag
+    replica.checked_at = time.monotonic() - age
+    return replica
+
+
+def _router(*replicas: Replica) -> ReadRouter:
+    return ReadRouter(PRIMARY, list(replicas), max_lag_seconds=MAX_LAG, check_interval=INTERVAL)
+
+
+def test_no_replica_configured_uses_primary():
+    router = _router()
+
+    assert router.choose() is PRIMARY
+    # Not a fallback: there is nothing to fall back from
+    assert (router.replica_reads, router.primary_fallbacks) == (0, 0)
+
+
+def test_round_robin_over_replicas_within_lag_bound():
+    router = _router(_replica("a", lag=0.0), _replica("b", lag=MAX_LAG))
+
+    assert [router.choose() for _ in range(4)] == ["a-factory", "b-factory"] * 2
+    assert router.replica_reads == 4
+
+
+def test_lagging_replica_skipped():
+    router = _router(_replica("a", lag=MAX_LAG + 0.1), _replica("b", lag=1.0))
+
+    assert {router.choose() for _ in range(4)} == {"b-factory"}
+
+
+def test_primary_when_every_replica_lags():
+    router = _router(_replica("a", lag=30.0), _replica("b", lag=MAX_LAG + 0.1))
+
+    assert router.choose() is PRIMARY
+    assert router.primary_fallbacks == 1
+
+
+def test_stale_or_missing_sample_not_trusted():
+    stale_age = INTERVAL * STALE_SAMPLE_INTERVALS + 1
+    router = _router(_replica("stale", lag=0.0, age=stale_age), _replica("unsampled"))
+
+    assert router.choose() is PRIMARY
+    assert [r["usable"] for r in router.status()["replicas"]] == [False, False]
+
+    # A fresh sample makes the replica usable again
+    router.replicas[0].checked_at = time.monotonic()
+    assert router.choose() == "stale-factory"
+
+
+async def test_failed_lag_check_drops_replica(monkeypatch):
+    replica = _replica("a", lag=0.0)
+    router = _router(replica)
+    assert router.choose() == "a-factory"
+
+    async def unreachable():
+        raise ConnectionRefusedError("replica down")
+
+    monkeypatch.setattr(replica, "_query_lag", unreachable)
+    await router.refresh()
+
+    assert router.choose() is PRIMARY
+    assert router.status()["replicas"][0]["last_error"].startswith("ConnectionRefusedError")
+
+
+async def test_lag_query_on_primary_reports_zero(db_engine, session_factory):
+    """Against a server that is not a standby the lag query returns 0"""
+    replica = Replica("self", db_engine, session_factory)
+    await replica.refresh_lag(timeout=5)
+
+    assert replica.lag_seconds == 0
+    assert replica.is_usable(MAX_LAG, INTERVAL)
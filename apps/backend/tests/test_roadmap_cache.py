@@ -0,0 +1,28 @@
+"""Profile fingerprints separate users whose roadmaps would differ"""
+
+from app.services.ai_engine.roadmap_cache import profile_fingerprint
+
+PROFILE = {
+    "age": 34,
+    "gender": "female",
+    "height": 168.0,
+    "current_weight": 80.0,
+    "goal_weight": 70.0,
+    "activity_level": "light",
+    "goals": '["lose weight"]',
+}
+
+
+def _fingerprint(**changes) -> str:
+    return profile_fingerprint({**PROFILE, **changes}, None, [])
+
+
+def test_same_bucket_for_close_profiles():
+    assert _fingerprint() == _fingerprint(age=36, current_weight=81.0, goal_weight=71.0)
+
+
+def test_goal_weight_direction_and_distance():
+    assert _fingerprint() != _fingerprint(goal_weight=85.0)
+    assert _fingerprint() != _fingerprint(goal_weight=80.0)
+    assert _fingerprint() != _fingerprint(goal_weight=55.0)
+    assert _fingerprint() != _fingerprint(goal_weight=None)
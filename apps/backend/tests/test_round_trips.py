@@ -0,0 +1,103 @@
+"""
+Database round trips per request
+
+Writes use INSERT/UPDATE ... RETURNING and get_db is the only commit
+point, so these counts only go up if a flush/refresh/commit sneaks back
+into the write path.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Iterator, List
+
+import pytest
+from sqlalchemy import event
+
+from app.core.principal_cache import principal_cache
+from app.crud import plan as crud_plan
+from app.crud import task as crud_task
+from app.schemas.plan import PlanCreate
+from app.schemas.task import TaskCreate
+
+
+@pytest.fixture
+def round_trips(db_engine) -> Iterator[List[str]]:
+    """Statements, BEGINs and COMMITs sent during the test"""
+    sent: List[str] = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        sent.append(statement.split(None, 1)[0].upper())
+
+    def on_begin(conn):
+        sent.append("BEGIN")
+
+    def on_commit(conn):
+        sent.append("COMMIT")
+
+    listeners: List[Any] = [("before_cursor_execute", on_execute), ("begin", on_begin), ("commit", on_commit)]
+    for name, fn in listeners:
+        event.listen(db_engine.sync_engine, name, fn)
+    try:
+        yield sent
+    finally:
+        for name, fn in listeners:
+            event.remove(db_engine.sync_engine, name, fn)
+
+
+@pytest.fixture
+async def task_ids(session_factory, user) -> List[int]:
+    """Walks scheduled yesterday, today and today"""
+    today = datetime.now().date()
+    async with session_factory() as db:
+        plan = await crud_plan.create_plan(db, user.id, PlanCreate(title="Plan"))
+        tasks = await crud_task.create_tasks(db, plan.id, [
+            TaskCreate(title="Morning walk", scheduled_date=day, duration_minutes=30)
+            for day in (today - timedelta(days=1), today, today)
+        ])
+        await db.commit()
+        return [task.id for task in tasks]
+
+
+async def test_read_round_trips(client, auth_headers, user, task_ids, round_trips):
+    principal_cache.invalidate(user.id)
+
+    response = await client.get("/api/v1/tasks/today", headers=auth_headers)
+    assert response.status_code == 200
+    # Principal lookup, active plan, today's tasks
+    assert round_trips == ["BEGIN", "SELECT", "SELECT", "SELECT", "COMMIT"]
+
+    round_trips.clear()
+    response = await client.get("/api/v1/tasks/today", headers=auth_headers)
+    assert response.status_code == 200
+    # Principal served from the cache
+    assert round_trips == ["BEGIN", "SELECT", "SELECT", "COMMIT"]
+
+
+async def test_complete_task_round_trips(client, auth_headers, user, task_ids, round_trips):
+    yesterday_task, today_task, second_today_task = task_ids
+    # First completion ever: the streak is computed from daily_metrics once
+    response = await client.post(f"/api/v1/tasks/{yesterday_task}/complete", headers=auth_headers)
+    assert response.status_code == 200
+
+    round_trips.clear()
+    response = await client.post(f"/api/v1/tasks/{today_task}/complete", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+    # Owned task lookup, task UPDATE ... RETURNING, daily metric upsert,
+    # streak row upsert + lock, streak extended in place, one commit
+    assert round_trips == ["BEGIN", "SELECT", "UPDATE", "INSERT", "INSERT", "SELECT", "UPDATE", "COMMIT"]
+
+    round_trips.clear()
+    response = await client.post(f"/api/v1/tasks/{second_today_task}/complete", headers=auth_headers)
+    assert response.status_code == 200
+    # Day already active: the streak is untouched
+    assert round_trips == ["BEGIN", "SELECT", "UPDATE", "INSERT", "COMMIT"]
+
+
+async def test_update_profile_round_trips(client, auth_headers, user, round_trips):
+    principal_cache.invalidate(user.id)
+
+    response = await client.patch("/api/v1/users/me", headers=auth_headers, json={"full_name": "New Name"})
+    assert response.status_code == 200
+    assert response.json()["full_name"] == "New Name"
+    # Current user lookup, UPDATE ... RETURNING, one commit
+    assert round_trips == ["BEGIN", "SELECT", "UPDATE", "COMMIT"]
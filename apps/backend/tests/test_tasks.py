@@ -0,0 +1,40 @@
+"""Bulk task creation"""
+
+from datetime import date, timedelta
+
+from app.crud import plan as crud_plan
+from app.crud import task as crud_task
+from app.models.task import TaskPriority, TaskStatus
+from app.schemas.plan import PlanCreate
+from app.schemas.task import TaskCreate
+
+
+async def test_create_tasks_returns_rows_in_input_order(db, user, statements):
+    plan = await crud_plan.create_plan(db, user.id, PlanCreate(title="Plan"))
+    start = date(2026, 1, 5)
+    tasks_in = [
+        TaskCreate(
+            title=f"Task {i}",
+            priority=TaskPriority.HIGH if i % 3 == 0 else TaskPriority.LOW,
+            scheduled_date=start + timedelta(days=i // 4),
+            duration_minutes=5 + i,
+        )
+        for i in range(28)
+    ]
+
+    statements.clear()
+    tasks = await crud_task.create_tasks(db, plan.id, tasks_in)
+    await db.commit()
+
+    assert len(statements) == 1
+    assert [task.title for task in tasks] == [task_in.title for task_in in tasks_in]
+    assert [task.duration_minutes for task in tasks] == [task_in.duration_minutes for task_in in tasks_in]
+    assert all(task.id is not None and task.status == TaskStatus.PENDING for task in tasks)
+    assert [task.id for task in await crud_task.get_plan_tasks(db, plan.id)] == [task.id for task in tasks]
+
+
+async def test_create_tasks_with_no_tasks(db, user, statements):
+    plan = await crud_plan.create_plan(db, user.id, PlanCreate(title="Plan"))
+    statements.clear()
+    assert await crud_task.create_tasks(db, plan.id, []) == []
+    assert statements == []
@@ -0,0 +1,47 @@
+"""Verified token claims are memoized, but never served past the token's exp"""
+
+import time
+from datetime import timedelta
+
+from app.core import security, token_cache as token_cache_module
+from app.core.security import create_access_token, decode_token, token_cache
+from app.core.token_cache import VerifiedTokenCache
+
+
+def test_entry_dropped_at_exp(monkeypatch):
+    cache = VerifiedTokenCache(max_entries=10)
+    now = time.time()
+    cache.put("token", {"sub": "1", "type": "access", "exp": now + 60})
+    assert cache.get("token") is not None
+
+    monkeypatch.setattr(token_cache_module.time, "time", lambda: now + 60)
+    assert cache.get("token") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_expired_token_not_served_from_cache(monkeypatch):
+    token = create_access_token("1", expires_delta=timedelta(seconds=1))
+    assert decode_token(token) is not None
+    assert token_cache.get(token) is not None
+
+    # Without the exp check the cached claims would be returned here
+    decodes = []
+    real_decode = security.jwt.decode
+    monkeypatch.setattr(security.jwt, "decode", lambda *a, **kw: decodes.append(1) or real_decode(*a, **kw))
+
+    # jose accepts a token during its exp second, so wait until it rejects it
+    exp = token_cache.get(token)["exp"]
+    time.sleep(max(0.0, exp + 1 - time.time()) + 0.05)
+
+    assert decode_token(token) is None
+    assert decodes == [1]
+
+
+def test_lru_bound():
+    cache = VerifiedTokenCache(max_entries=2)
+    exp = time.time() + 60
+    for token in ("a", "b", "c"):
+        cache.put(token, {"exp": exp})
+
+    assert cache.get("a") is None
+    assert cache.get("b") is not None and cache.get("c") is not None
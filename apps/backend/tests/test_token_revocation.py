@@ -0,0 +1,113 @@
+"""
+Local revocations reach the filter on commit and survive rebuilds;
+logout and refresh rotation revoke the tokens they retire
+"""
+
+import asyncio
+import time
+from uuid import uuid4
+
+from app.core.security import create_access_token, create_refresh_token
+from app.core.token_revocation import TokenRevocationList
+from app.crud import revoked_token as crud_revoked
+
+
+def _claims() -> dict:
+    return {"jti": str(uuid4()), "type": "access", "exp": int(time.time()) + 3600}
+
+
+def _revocation_list() -> TokenRevocationList:
+    return TokenRevocationList(capacity=1000, fp_rate=0.001, rebuild_interval=60)
+
+
+async def test_revocation_enters_filter_on_commit(session_factory, user):
+    revocations = _revocation_list()
+    claims = _claims()
+
+    async with session_factory() as db:
+        assert await revocations.revoke(db, claims, user_id=user.id)
+        assert claims["jti"] not in revocations._filter
+        # Already revoked by this transaction
+        assert not await revocations.revoke(db, claims, user_id=user.id)
+        await db.commit()
+
+    assert claims["jti"] in revocations._filter
+    async with session_factory() as db:
+        assert await revocations.is_revoked(db, claims["jti"])
+
+
+async def test_rolled_back_revocation_is_not_added(session_factory, user):
+    revocations = _revocation_list()
+    claims = _claims()
+
+    async with session_factory() as db:
+        await revocations.revoke(db, claims, user_id=user.id)
+        await db.rollback()
+
+    assert claims["jti"] not in revocations._filter
+
+
+async def test_rebuild_keeps_revocations_missing_from_snapshot(session_factory, user, monkeypatch):
+    revocations = _revocation_list()
+    claims = _claims()
+    async with session_factory() as db:
+        await revocations.revoke(db, claims, user_id=user.id)
+        await db.commit()
+
+    # Snapshot read before the revocation committed
+    real_get_active = crud_revoked.get_active_revoked_jtis
+
+    async def stale_snapshot(db):
+        return []
+
+    monkeypatch.setattr(crud_revoked, "get_active_revoked_jtis", stale_snapshot)
+    await revocations.rebuild(session_factory)
+    assert claims["jti"] in revocations._filter
+    assert revocations.stats()["local_pending_rebuild"] == 1
+
+    # Once the store has it, the local copy is no longer needed
+    monkeypatch.setattr(crud_revoked, "get_active_revoked_jtis", real_get_active)
+    await revocations.rebuild(session_factory)
+    assert claims["jti"] in revocations._filter
+    assert revocations.stats()["local_pending_rebuild"] == 0
+
+
+async def test_logout_without_body_revokes_access_token(client, user):
+    headers = {"Authorization": f"Bearer {create_access_token(user.id)}"}
+
+    assert (await client.post("/api/v1/auth/logout", headers=headers)).status_code == 204
+    assert (await client.get("/api/v1/users/me", headers=headers)).status_code == 401
+
+
+async def test_logout_revokes_refresh_token(client, user):
+    headers = {"Authorization": f"Bearer {create_access_token(user.id)}"}
+    refresh_token = create_refresh_token(user.id)
+
+    response = await client.post("/api/v1/auth/logout", headers=headers, json={"refresh_token": refresh_token})
+    assert response.status_code == 204
+
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 401
+
+
+async def test_refresh_token_is_single_use(client, user):
+    refresh_token = create_refresh_token(user.id)
+
+    rotated = await client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+    assert rotated.status_code == 200
+
+    # Replaying the old token fails; the new one works
+    replayed = await client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+    assert replayed.status_code == 401
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": rotated.json()["refresh_token"]})
+    assert response.status_code == 200
+
+
+async def test_concurrent_refreshes_rotate_once(client, user):
+    refresh_token = create_refresh_token(user.id)
+
+    responses = await asyncio.gather(*(
+        client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token}) for _ in range(4)
+    ))
+
+    assert sorted(r.status_code for r in responses) == [200, 401, 401, 401]
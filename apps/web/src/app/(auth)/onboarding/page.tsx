@@ -68,7 +68,7 @@ export default function OnboardingPage() {
     setStep('generating');
 
     try {
-      // Generate plan with user preferences
+      // Resolves only once the background job has created the plan
       await generatePlan({
         primary_goal: data.primaryGoal,
         fitness_level: data.fitnessLevel,
@@ -77,12 +77,11 @@ export default function OnboardingPage() {
       });
 
       // Redirect to dashboard
-      setTimeout(() => {
-        router.push('/focus');
-      }, 2000);
+      router.push('/focus');
     } catch (error) {
       console.error('Failed to generate plan:', error);
-      // Handle error - maybe show error message and allow retry
+      // Let the user retry from the last step
+      setStep('preferences');
     }
   };
 
@@ -32,6 +32,24 @@ export interface RegisterRequest {
   full_name?: string;
 }
 
+export type PlanJobStatus = 'queued' | 'running' | 'succeeded' | 'failed';
+
+export interface PlanJob {
+  id: string;
+  kind: 'generate' | 'regenerate';
+  status: PlanJobStatus;
+  plan_id: number | null;
+  error: string | null;
+  attempts: number;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
+// Plan generation runs as a background job; the status endpoint is long-polled
+const PLAN_JOB_WAIT_SECONDS = 20;
+const PLAN_JOB_MAX_DURATION_MS = 5 * 60 * 1000;
+
 // Configure base URL - use environment variable or default to localhost
 const BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://127.0.0.1:8000/api/v1';
 
@@ -120,6 +138,35 @@ apiClient.interceptors.response.use(
   }
 );
 
+/**
+ * Long-poll a plan job until it succeeds (resolves with the finished job)
+ * or fails (rejects with an ApiError)
+ */
+async function waitForPlanJob(job: PlanJob): Promise<PlanJob> {
+  const deadline = Date.now() + PLAN_JOB_MAX_DURATION_MS;
+
+  while (job.status === 'queued' || job.status === 'running') {
+    if (Date.now() > deadline) {
+      const timeoutError: ApiError = { detail: 'Plan generation is taking longer than expected' };
+      throw timeoutError;
+    }
+
+    const response = await apiClient.get<PlanJob>(`/plans/jobs/${job.id}`, {
+      params: { wait: PLAN_JOB_WAIT_SECONDS },
+      // The request may legitimately take as long as the long-poll wait
+      timeout: (PLAN_JOB_WAIT_SECONDS + 10) * 1000,
+    });
+    job = response.data;
+  }
+
+  if (job.status === 'failed') {
+    const jobError: ApiError = { detail: job.error || 'Plan generation failed' };
+    throw jobError;
+  }
+
+  return job;
+}
+
 // API methods
 export const api = {
   // Authentication
@@ -171,8 +218,22 @@ export const api = {
 
   // Plans
   plans: {
-    generate: async (preferences: any): Promise<any> => {
-      const response = await apiClient.post('/plans/generate', { preferences });
+    // Resolves once the plan exists (job succeeded); `plan_id` identifies it
+    generate: async (preferences: any): Promise<PlanJob> => {
+      const response = await apiClient.post<PlanJob>('/plans/generate', { preferences });
+      return waitForPlanJob(response.data);
+    },
+
+    regenerate: async (): Promise<PlanJob> => {
+      const response = await apiClient.post<PlanJob>('/plans/regenerate');
+      return waitForPlanJob(response.data);
+    },
+
+    getJob: async (jobId: string, wait: number = 0): Promise<PlanJob> => {
+      const response = await apiClient.get<PlanJob>(`/plans/jobs/${jobId}`, {
+        params: { wait },
+        timeout: (wait + 10) * 1000,
+      });
       return response.data;
     },
 